@@ -0,0 +1,279 @@
+"""
+Library entry point for scraping a state-year in-process.
+
+    from api import scrape_state
+    result = scrape_state("TX", 2026, session=my_session)
+    if result.ok:
+        print(len(result.races), result.stats.total_races)
+
+main.py is a command-line wrapper around scrape_state. Callers making many
+scrapes should pass one requests session (or a fetch function) so connections
+are reused across calls.
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import changes
+import fetch_log
+import parts
+import roster
+import validate
+from data import (
+    STATE_NAMES,
+    StateResult,
+    deduplicate,
+    merge_offices,
+    office_stats,
+    state_filename,
+)
+
+MIN_EXPECTED_RACES = 10
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+
+
+def scrape_state(
+    state: str,
+    year: int | None = None,
+    *,
+    session=None,
+    fetch=None,
+    fetch_mode: str = "page",
+    data_dir: Path = ELECTION_DATA_DIR,
+    validate_history: bool = True,
+    allow_anomalies: bool = False,
+    use_parts: bool = False,
+    offices: list[str] | None = None,
+    record_changes: bool = False,
+    record_roster: bool = False,
+    archive: Path | None = None,
+    base_url: str | None = None,
+    low_memory: bool = False,
+    memory_report: bool = False,
+    profile: Path | None = None,
+) -> StateResult:
+    """Scrape, validate and deduplicate one state-year.
+
+    session is a requests session to reuse; fetch, if given, replaces the HTTP
+    client entirely (a function from URL to HTML or None). A rejected scrape is
+    returned with error set rather than raised. Raises ValueError for an
+    unknown state code.
+    """
+    state = state.upper()
+    if state not in STATE_NAMES:
+        raise ValueError(f"Unknown state code: {state}")
+    if offices and not use_parts:
+        raise ValueError("offices requires use_parts")
+    year = year or datetime.now().year
+    # (office, parsed) for every page requested, re-fetches included
+    attempts = []
+    # Contests per office, collected only when a roster is wanted
+    contests = {} if record_roster else None
+    scrape = _scraper(
+        state,
+        year,
+        session,
+        fetch,
+        fetch_mode,
+        archive,
+        profile,
+        attempts,
+        contests,
+        low_memory=low_memory,
+        memory_report=memory_report,
+        base=base_url,
+    )
+
+    print(f"Checking {STATE_NAMES[state]} ({year})...", file=sys.stderr)
+
+    parts_dir = data_dir / parts.PARTS_DIRNAME
+    stored = parts.load_parts(parts_dir, state, year) if use_parts else {}
+    fresh = scrape(offices)
+    anomalies = []
+    if validate_history and fresh and data_dir.exists():
+        fresh, anomalies = _validate(
+            fresh, stored, state, year, data_dir, offices, scrape
+        )
+    if stored and not allow_anomalies:
+        fresh, anomalies = validate.keep_good_parts(fresh, stored, anomalies)
+
+    by_office = parts.assemble(stored, fresh)
+    results, stats = merge_offices(by_office)
+    result = StateResult(state, year, results, stats, office_stats(by_office))
+    if record_roster:
+        # Offices not taken fresh (e.g. kept for anomalies) use their stored contests
+        stored_contests = (
+            parts.load_contests(parts_dir, state, year) if use_parts else {}
+        )
+        contests = {
+            **stored_contests,
+            **{office: contests[office] for office in fresh if office in contests},
+        }
+
+    if stats.total_races < MIN_EXPECTED_RACES:
+        print(
+            f"ERROR: Only found {stats.total_races} races for {state}, expected at least {MIN_EXPECTED_RACES}",
+            file=sys.stderr,
+        )
+        result.error = f"Scraping failed: only found {stats.total_races} races"
+        if use_parts:
+            _record_fetches(attempts, {}, state, year, data_dir)
+        return result
+
+    if anomalies and not allow_anomalies:
+        print(
+            f"ERROR: {len(anomalies)} anomalies against historical data for {state}",
+            file=sys.stderr,
+        )
+        result.error = "Scraping rejected: results deviate from historical data"
+        result.anomalies = [a.message for a in anomalies]
+        if use_parts:
+            _record_fetches(attempts, {}, state, year, data_dir)
+        return result
+
+    if use_parts:
+        for office, part in fresh.items():
+            office_contests = contests.get(office) if record_roster else None
+            parts.save_part(
+                parts_dir, state, year, office, part, contests=office_contests
+            )
+        _record_fetches(attempts, fresh, state, year, data_dir)
+
+    result.races = deduplicate(results)
+    if record_changes:
+        _record_changes(result.races, state, year, data_dir)
+    if record_roster:
+        roster.save_assembled(
+            data_dir / roster.ROSTER_DIRNAME, state, year, by_office, contests
+        )
+    return result
+
+
+async def scrape_state_async(state: str, year: int | None = None, **options):
+    """scrape_state on a worker thread, for use from asyncio code.
+
+    Sessions are not thread-safe, so concurrent calls should each pass their
+    own session (or none).
+    """
+    # Imported here: asyncio alone would blow the CLI's startup budget
+    import asyncio
+
+    return await asyncio.to_thread(scrape_state, state, year, **options)
+
+
+def _scraper(
+    state,
+    year,
+    session,
+    fetch,
+    fetch_mode,
+    archive,
+    profile,
+    attempts,
+    contests,
+    **options,
+):
+    """A function scraping the given offices (all when None), keyed by office.
+
+    The fetch function is built once, so re-fetches reuse its session. Each
+    office requested is appended to attempts with whether its page parsed, and
+    if contests is a dict, each parsed office's contests are stored in it.
+    """
+    # Imported here so --help and bad arguments never load the HTTP/parser stack
+    from sources import ballotpedia
+
+    if fetch is None:
+        if fetch_mode == "api":
+            fetch = ballotpedia.api_fetcher(session)
+        else:
+            fetch = ballotpedia.session_fetcher(session)
+    if archive:
+        import archive as page_archive
+
+        fetch = page_archive.archiving_fetcher(
+            fetch, archive, ballotpedia.PARSER_VERSION
+        )
+    profiler = None
+    if profile:
+        import profiling
+
+        label = f"{state_filename(state)}_{year}"
+        profiler = profiling.Profiler(profile, label).office
+
+    def scrape(offices):
+        by_office = ballotpedia.scrape_offices(
+            state,
+            year,
+            offices,
+            fetch=fetch,
+            profiler=profiler,
+            contests=contests,
+            **options,
+        )
+        attempts.extend(
+            (o, o in by_office)
+            for o in ballotpedia.office_names(state, year)
+            if offices is None or o in offices
+        )
+        if profile:
+            report = profiling.write_report(profile)
+            print(f"  Profile report: {report}", file=sys.stderr)
+        return by_office
+
+    return scrape
+
+
+def _validate(fresh, stored, state, year, data_dir, offices, scrape):
+    """Check against history, re-fetching only the anomalous offices once."""
+    history = validate.load_history(data_dir, state)
+    anomalies = validate.check_fresh(fresh, stored, history, year)
+    if not anomalies:
+        return fresh, anomalies
+
+    for a in anomalies:
+        print(f"  Anomaly: {a.message}", file=sys.stderr)
+    offices = validate.offices_to_refetch(anomalies) or offices
+    print(
+        f"  Re-fetching {', '.join(offices) if offices else 'all offices'}...",
+        file=sys.stderr,
+    )
+    fresh = {**fresh, **scrape(offices)}
+    anomalies = validate.check_fresh(fresh, stored, history, year)
+    for a in anomalies:
+        print(f"  Anomaly persists: {a.message}", file=sys.stderr)
+    return fresh, anomalies
+
+
+def _record_fetches(attempts, saved, state, year, data_dir):
+    """Log each attempt as ok (its part was saved), rejected or missing."""
+    last = {office: i for i, (office, _) in enumerate(attempts)}
+    entries = []
+    for i, (office, parsed) in enumerate(attempts):
+        if not parsed:
+            status = fetch_log.MISSING
+        elif office in saved and last[office] == i:
+            status = fetch_log.OK
+        else:
+            # Parsed, but a re-fetch replaced it or its results were not kept
+            status = fetch_log.REJECTED
+        entries.append((office, status))
+    fetch_log.record(
+        data_dir / fetch_log.FETCH_LOG_DIRNAME,
+        year,
+        state,
+        entries,
+        datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def _record_changes(results, state, year, data_dir):
+    previous = changes.load_previous(data_dir, state, year)
+    events = changes.diff(previous, results)
+    changes.append_changes(
+        data_dir / changes.CHANGES_DIRNAME,
+        year,
+        events,
+        datetime.now(timezone.utc).isoformat(),
+    )
+    print(f"  {len(events)} changes since previous scrape", file=sys.stderr)
@@ -0,0 +1,87 @@
+"""
+Raw page archive.
+Every fetched page is stored gzip-compressed under objects/, named by the
+SHA-256 of its content so unchanged pages are stored once, and each fetch is
+logged to index.jsonl with its URL, fetch time and the parser version in use.
+reparse.py rebuilds election_data/ from the archive without the network.
+"""
+
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+ARCHIVE_DIR = Path(__file__).parent.parent / "page_archive"
+INDEX_FILENAME = "index.jsonl"
+OBJECTS_DIRNAME = "objects"
+
+
+def object_path(archive_dir: Path, sha256: str) -> Path:
+    return archive_dir / OBJECTS_DIRNAME / sha256[:2] / f"{sha256}.html.gz"
+
+
+def store_page(
+    archive_dir: Path, url: str, html: str, parser_version: int, fetched_at=None
+) -> str:
+    """Archive one fetched page and log the fetch; returns the content hash."""
+    raw = html.encode()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    path = object_path(archive_dir, sha256)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        # mtime=0 keeps identical pages byte-identical on disk
+        tmp.write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+        tmp.replace(path)
+    entry = {
+        "url": url,
+        "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+        "sha256": sha256,
+        "bytes": len(raw),
+        "parser_version": parser_version,
+    }
+    with open(archive_dir / INDEX_FILENAME, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return sha256
+
+
+def read_page(archive_dir: Path, sha256: str) -> str:
+    return gzip.decompress(object_path(archive_dir, sha256).read_bytes()).decode()
+
+
+def load_index(archive_dir: Path) -> list[dict]:
+    """Every logged fetch, in fetch order; unreadable lines are skipped."""
+    entries = []
+    try:
+        with open(archive_dir / INDEX_FILENAME) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except IOError:
+        pass
+    return entries
+
+
+def latest_pages(archive_dir: Path) -> dict[str, dict]:
+    """The most recent fetch of each URL."""
+    latest = {}
+    for entry in load_index(archive_dir):
+        current = latest.get(entry["url"])
+        if current is None or entry["fetched_at"] >= current["fetched_at"]:
+            latest[entry["url"]] = entry
+    return latest
+
+
+def archiving_fetcher(fetch, archive_dir: Path, parser_version: int):
+    """Wrap fetch, archiving every page it returns."""
+
+    def archiving(url):
+        html = fetch(url)
+        if html:
+            store_page(archive_dir, url, html, parser_version)
+        return html
+
+    return archiving
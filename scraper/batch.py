@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Sharded scraping with a deterministic merge.
+The (year, state, office) work list is sorted and dealt round-robin into n
+shards, so any runner can compute its own slice. Each shard writes per-office
+parts to its own output directory; merge combines those parts into
+election_data/, validates each state-year against history, writes the state
+files and rebuilds the manifest once.
+
+    python batch.py run --shard 1/4 --years 2024 2026 --out shards/1
+    python batch.py merge shards/* [--data-dir DIR] [--allow-anomalies]
+
+--replay DIR serves pages from saved HTML instead of the network, and --record
+DIR saves every fetched page there, so shard runs can be reproduced offline.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import changes
+import nationwide_stats
+import parts
+import profiling
+import roster
+import validate
+from api import ELECTION_DATA_DIR, MIN_EXPECTED_RACES
+from data import STATE_NAMES, deduplicate, merge_offices, office_stats, state_filename
+from output import state_data
+from sources.ballotpedia import office_names
+
+SHARD_FILENAME = "shard.json"
+
+
+def parse_shard(text: str) -> tuple[int, int]:
+    """'i/n' with 1 <= i <= n."""
+    index, _, count = text.partition("/")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {text!r}")
+    if not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f"shard {i} out of range 1..{n}")
+    return i, n
+
+
+def work_list(states: list[str], years: list[int]) -> list[tuple[int, str, str]]:
+    """Every (year, state, office) page, in a stable order."""
+    return sorted(
+        (year, state, office)
+        for year in years
+        for state in states
+        for office in office_names(state, year)
+    )
+
+
+def shard_items(items: list, index: int, count: int) -> list:
+    """Shard index of count (1-based), dealt round-robin so shards stay balanced."""
+    return items[index - 1 :: count]
+
+
+def replay_fetcher(directory: Path):
+    """Serve pages saved by record_fetcher; missing pages behave like a 404."""
+
+    def fetch(url):
+        path = directory / _fixture_name(url)
+        if not path.exists():
+            print(f"    No replay fixture {path.name}", file=sys.stderr)
+            return None
+        return path.read_text()
+
+    return fetch
+
+
+def record_fetcher(fetch, directory: Path):
+    """Wrap fetch, saving every page it returns under directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def recording(url):
+        html = fetch(url)
+        if html:
+            (directory / _fixture_name(url)).write_text(html)
+        return html
+
+    return recording
+
+
+def _fixture_name(url: str) -> str:
+    return url.rstrip("/").rsplit("/", 1)[-1] + ".html"
+
+
+def run_shard(
+    items,
+    out_dir: Path,
+    fetch=None,
+    delay=0.0,
+    low_memory=False,
+    base=None,
+    profile_dir=None,
+):
+    """Scrape a shard's pages into out_dir/parts; returns the pages that failed."""
+    from sources import ballotpedia
+
+    parts_dir = out_dir / parts.PARTS_DIRNAME
+    by_state_year = {}
+    for year, state, office in items:
+        by_state_year.setdefault((year, state), []).append(office)
+
+    missing = []
+    for n, ((year, state), offices) in enumerate(by_state_year.items()):
+        if n and delay:
+            time.sleep(delay)
+        print(f"{state} {year}: {', '.join(offices)}", file=sys.stderr)
+        profiler = None
+        if profile_dir:
+            label = f"{state_filename(state)}_{year}"
+            profiler = profiling.Profiler(profile_dir, label).office
+        # merge always writes rosters, so shard parts carry their contests
+        contests = {}
+        scraped = ballotpedia.scrape_offices(
+            state,
+            year,
+            offices,
+            low_memory=low_memory,
+            fetch=fetch,
+            base=base,
+            profiler=profiler,
+            contests=contests,
+        )
+        for office in offices:
+            if office in scraped:
+                parts.save_part(
+                    parts_dir,
+                    state,
+                    year,
+                    office,
+                    scraped[office],
+                    contests=contests[office],
+                )
+            else:
+                missing.append([year, state, office])
+    if profile_dir:
+        profiling.write_report(profile_dir)
+    return missing
+
+
+def merge(
+    shard_dirs: list[Path],
+    data_dir: Path,
+    allow_anomalies=False,
+    record_changes=False,
+) -> dict[str, list]:
+    """Combine shard parts into data_dir; returns written and rejected state-years."""
+    fresh_by_key = {}
+    contests_by_key = {}
+    scraped_at = {}
+    # Sorted, so a page present in two shards resolves the same way every time
+    for shard_dir in sorted(shard_dirs):
+        shard_parts = shard_dir / parts.PARTS_DIRNAME
+        for state, year in parts.stored_state_years(shard_parts):
+            loaded = parts.load_parts(shard_parts, state, year)
+            fresh_by_key.setdefault((year, state), {}).update(loaded)
+            contests_by_key.setdefault((year, state), {}).update(
+                parts.load_contests(shard_parts, state, year)
+            )
+            scraped_at.setdefault((year, state), {}).update(
+                parts.scraped_times(shard_parts, state, year)
+            )
+
+    parts_dir = data_dir / parts.PARTS_DIRNAME
+    at = datetime.now(timezone.utc).isoformat()
+    report = {"written": [], "rejected": []}
+    for (year, state), fresh in sorted(fresh_by_key.items()):
+        label = f"{state} {year}"
+        stored = parts.load_parts(parts_dir, state, year)
+        history = validate.load_history(data_dir, state)
+        anomalies = validate.check_fresh(fresh, stored, history, year)
+        if stored and not allow_anomalies:
+            fresh, anomalies = validate.keep_good_parts(fresh, stored, anomalies)
+        by_office = parts.assemble(stored, fresh)
+        results, stats = merge_offices(by_office)
+
+        problems = [a.message for a in anomalies]
+        if stats.total_races < MIN_EXPECTED_RACES:
+            problems.append(f"only found {stats.total_races} races")
+        for message in problems:
+            print(f"  {label}: {message}", file=sys.stderr)
+        if problems and (not allow_anomalies or stats.total_races < MIN_EXPECTED_RACES):
+            report["rejected"].append(label)
+            continue
+
+        times = scraped_at[(year, state)]
+        shard_contests = contests_by_key[(year, state)]
+        contests = {
+            **parts.load_contests(parts_dir, state, year),
+            **{o: shard_contests[o] for o in fresh if o in shard_contests},
+        }
+        for office, part in fresh.items():
+            parts.save_part(
+                parts_dir,
+                state,
+                year,
+                office,
+                part,
+                times.get(office),
+                contests.get(office),
+            )
+        roster.save_assembled(
+            data_dir / roster.ROSTER_DIRNAME, state, year, by_office, contests
+        )
+        results = deduplicate(results)
+        if record_changes:
+            previous = changes.load_previous(data_dir, state, year)
+            changes.append_changes(
+                data_dir / changes.CHANGES_DIRNAME,
+                year,
+                changes.diff(previous, results),
+                at,
+            )
+        path = data_dir / f"{state_filename(state)}_{year}.json"
+        data = state_data(results, stats, state, year, office_stats(by_office))
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        tmp.replace(path)
+        report["written"].append(label)
+
+    if report["written"]:
+        nationwide_stats.update(data_dir)
+    return report
+
+
+def _run(args):
+    states = args.states or list(STATE_NAMES)
+    unknown = [s for s in states if s not in STATE_NAMES]
+    if unknown:
+        sys.exit(f"Unknown state codes: {', '.join(unknown)}")
+    index, count = args.shard
+    items = shard_items(work_list(states, args.years), index, count)
+    print(f"Shard {index}/{count}: {len(items)} pages", file=sys.stderr)
+
+    fetch = _fetcher(args)
+    args.out.mkdir(parents=True, exist_ok=True)
+    missing = run_shard(
+        items,
+        args.out,
+        fetch,
+        args.delay,
+        args.low_memory,
+        args.base_url,
+        args.profile,
+    )
+    with open(args.out / SHARD_FILENAME, "w") as f:
+        json.dump(
+            {"shard": f"{index}/{count}", "pages": len(items), "missing": missing},
+            f,
+            indent=2,
+        )
+    print(f"Shard {index}/{count}: {len(missing)} pages failed", file=sys.stderr)
+    return 0
+
+
+def _fetcher(args):
+    if args.replay:
+        return replay_fetcher(args.replay)
+    if not (args.record or args.archive or args.fetch == "api"):
+        return None
+    from sources import ballotpedia
+
+    if args.fetch == "api":
+        fetch = ballotpedia.api_fetcher()
+    else:
+        fetch = ballotpedia.session_fetcher()
+    if args.record:
+        fetch = record_fetcher(fetch, args.record)
+    if args.archive:
+        import archive
+
+        fetch = archive.archiving_fetcher(
+            fetch, args.archive, ballotpedia.PARSER_VERSION
+        )
+    return fetch
+
+
+def _merge(args):
+    report = merge(args.shard_dirs, args.data_dir, args.allow_anomalies, args.changes)
+    print(
+        f"Merged {len(report['written'])} state-years, "
+        f"rejected {len(report['rejected'])}",
+        file=sys.stderr,
+    )
+    for label in report["rejected"]:
+        print(f"  Rejected {label}", file=sys.stderr)
+    return 1 if report["rejected"] else 0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Sharded scraping and merge")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Scrape one shard of the work list")
+    run.add_argument("--shard", type=parse_shard, default=(1, 1), help="i/n")
+    run.add_argument("--years", type=int, nargs="+", default=[datetime.now().year])
+    run.add_argument(
+        "--states",
+        type=lambda s: [c.strip().upper() for c in s.split(",") if c.strip()],
+        help="Comma-separated state codes (default: all)",
+    )
+    run.add_argument("--out", type=Path, required=True)
+    source = run.add_mutually_exclusive_group()
+    source.add_argument("--replay", type=Path, help="Serve pages from saved HTML")
+    source.add_argument("--record", type=Path, help="Save fetched pages here")
+    run.add_argument("--fetch", choices=("page", "api"), default="page")
+    run.add_argument("--archive", type=Path, help="Archive every fetched page here")
+    run.add_argument("--base-url", help="Fetch pages from this server instead")
+    run.add_argument("--delay", type=float, default=10.0, help="Seconds between states")
+    run.add_argument("--low-memory", action="store_true")
+    run.add_argument(
+        "--profile", type=Path, metavar="DIR", help="Write per-page profiles here"
+    )
+    run.set_defaults(handler=_run)
+
+    merge_cmd = sub.add_parser("merge", help="Combine shard outputs into DATA_DIR")
+    merge_cmd.add_argument("shard_dirs", type=Path, nargs="+")
+    merge_cmd.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    merge_cmd.add_argument("--allow-anomalies", action="store_true")
+    merge_cmd.add_argument("--changes", action="store_true")
+    merge_cmd.set_defaults(handler=_merge)
+
+    args = p.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
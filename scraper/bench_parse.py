@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Parser scaling benchmark.
+Parses synthetic pages of growing size in both layouts, reports parse time and
+peak memory against the number of districts, and fails if either grows faster
+than the configured complexity bound (the fitted log-log slope).
+"""
+
+import argparse
+import csv
+import gc
+import math
+import sys
+import time
+import tracemalloc
+
+import synthetic
+from sources.ballotpedia import _parse
+
+LAYOUTS = {
+    "table": (synthetic.table_page, "State House"),
+    "sections": (synthetic.section_page, "US House"),
+}
+DEFAULT_SIZES = (50, 100, 200, 400, 800)
+# Slope of log(cost) against log(N); 1.0 is linear, 2.0 quadratic
+DEFAULT_MAX_EXPONENT = 1.3
+
+
+def measure(layout, districts, parties, candidates, repeat):
+    """Best-of-repeat parse seconds and peak traced bytes for one page size."""
+    make_page, office = LAYOUTS[layout]
+    html = make_page(districts, parties, candidates)
+    best = math.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        _parse(html, office, "TX")
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _parse(html, office, "TX")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def growth_exponent(sizes, costs):
+    """Least-squares slope of log(cost) against log(size)."""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(c) for c in costs]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    num = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    den = sum((x - mean_x) ** 2 for x in xs)
+    return num / den
+
+
+def run(layouts, sizes, parties, candidates, repeat, max_exponent, csv_path=None):
+    rows = []
+    failures = []
+    for layout in layouts:
+        times, peaks = [], []
+        print(f"\n{layout} layout ({parties} parties, {candidates} per cell)")
+        print(f"  {'districts':>9}  {'parse ms':>9}  {'peak MiB':>9}")
+        for n in sizes:
+            seconds, peak = measure(layout, n, parties, candidates, repeat)
+            times.append(seconds)
+            peaks.append(peak)
+            rows.append([layout, n, parties, candidates, seconds, peak])
+        for n, seconds, peak in zip(sizes, times, peaks):
+            bar = "#" * max(1, round(seconds / max(times) * 40))
+            print(f"  {n:>9}  {seconds * 1000:>9.1f}  {peak / 2**20:>9.2f}  {bar}")
+        for label, costs in (("time", times), ("memory", peaks)):
+            exponent = growth_exponent(sizes, costs)
+            print(f"  {label} grows as N^{exponent:.2f}")
+            if exponent > max_exponent:
+                failures.append(
+                    f"{layout} {label} grows as N^{exponent:.2f}, "
+                    f"bound is N^{max_exponent:.2f}"
+                )
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["layout", "districts", "parties", "candidates", "seconds", "peak"]
+            )
+            writer.writerows(rows)
+    return failures
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="Benchmark parser scaling on synthetic pages"
+    )
+    p.add_argument("--layout", choices=sorted(LAYOUTS), action="append")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    p.add_argument("--parties", type=int, default=2)
+    p.add_argument("--candidates", type=int, default=2)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT)
+    p.add_argument("--csv", help="Also write measurements to this CSV file")
+    args = p.parse_args()
+
+    failures = run(
+        args.layout or sorted(LAYOUTS),
+        args.sizes,
+        args.parties,
+        args.candidates,
+        args.repeat,
+        args.max_exponent,
+        args.csv,
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Output and aggregation benchmark over the checked-in corpus.
+Runs deduplicate, _compute_separated_stats, _json_output and generate_manifest
+over every state file in election_data/ and over synthetic multiples of it (the
+corpus repeated under shifted years), and reports time, peak memory and
+candidates/sec per stage. Results are compared against a stored baseline: a
+stage fails if its throughput drops, or its peak memory grows, by more than the
+tolerance.
+
+    python bench_pipeline.py [--scales 1 10 100] [--tolerance 0.5] [--update-baseline]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from data import Race, RaceStats, deduplicate
+from nationwide_stats import generate_manifest
+from output import _compute_separated_stats, _json_output
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+BASELINE_PATH = Path(__file__).parent / "bench_pipeline_baseline.json"
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_TOLERANCE = 0.5
+STAGES = ("deduplicate", "separated_stats", "json_output", "manifest")
+# Copies of the corpus are filed under year + YEAR_STRIDE * copy; the corpus
+# spans fewer years than this, so copies never collide
+YEAR_STRIDE = 10
+_FILENAME_RE = re.compile(r"^(.+)_(\d{4})\.json$")
+
+
+def load_corpus(data_dir: Path) -> list[dict]:
+    """Every state file that is not an error file."""
+    corpus = []
+    for path in sorted(data_dir.glob("*.json")):
+        if not _FILENAME_RE.match(path.name):
+            continue
+        data = json.loads(path.read_text())
+        if "error" not in data and "state" in data:
+            corpus.append(data)
+    return corpus
+
+
+def scraped_races(state_data: dict) -> list[Race]:
+    """The races as the scraper emits them, before deduplication.
+
+    Candidates unopposed in both stages come out of the primary and general
+    tables separately, so they are split back into two races.
+    """
+    races = []
+    for c in state_data["unopposed_candidates"]:
+        for stage in c["unopposed_in"].split(" & "):
+            races.append(Race(**{**c, "unopposed_in": stage}))
+    return races
+
+
+def race_stats(state_data: dict) -> RaceStats:
+    return RaceStats(
+        total_races=state_data.get("total_races", 0),
+        races_by_party=dict(state_data.get("total_races_by_party", {})),
+        general_total_races=state_data.get("general", {}).get("total_races", 0),
+        primary_races_by_party=dict(
+            state_data.get("primary", {}).get("total_races_by_party", {})
+        ),
+    )
+
+
+def run_stage(stage: str, corpus: list[dict], scale: int, data_dir: Path) -> float:
+    """Seconds spent in the stage itself, excluding building its inputs."""
+    if stage == "manifest":
+        with scaled_copy(data_dir, scale) as scaled_dir:
+            start = time.perf_counter()
+            generate_manifest(scaled_dir)
+            return time.perf_counter() - start
+    elapsed = 0.0
+    for _ in range(scale):
+        for state_data in corpus:
+            races = scraped_races(state_data)
+            if stage != "deduplicate":
+                races = deduplicate(races)
+            stats = race_stats(state_data)
+            start = time.perf_counter()
+            if stage == "deduplicate":
+                deduplicate(races)
+            elif stage == "separated_stats":
+                _compute_separated_stats(races)
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _json_output(
+                        races,
+                        stats,
+                        state_data["state"],
+                        state_data["year"],
+                        state_data.get("office_stats"),
+                    )
+            elapsed += time.perf_counter() - start
+    return elapsed
+
+
+@contextlib.contextmanager
+def scaled_copy(data_dir: Path, scale: int):
+    """A temporary directory holding `scale` copies of the corpus files."""
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp:
+        tmp_dir = Path(tmp)
+        for path in data_dir.glob("*.json"):
+            match = _FILENAME_RE.match(path.name)
+            if not match:
+                continue
+            for copy in range(scale):
+                year = int(match.group(2)) + YEAR_STRIDE * copy
+                shutil.copyfile(path, tmp_dir / f"{match.group(1)}_{year}.json")
+        yield tmp_dir
+
+
+def measure(stage, corpus, scale, data_dir, repeat) -> tuple[float, int]:
+    """Best-of-repeat seconds and peak traced bytes for one stage and scale.
+
+    Scaled runs are long enough to time once. The in-memory stages handle one
+    state file at a time, so their peak is traced over a single copy.
+    """
+    best = math.inf
+    for _ in range(repeat if scale == 1 else 1):
+        gc.collect()
+        best = min(best, run_stage(stage, corpus, scale, data_dir))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_stage(stage, corpus, scale if stage == "manifest" else 1, data_dir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of results against baseline, both keyed by scale then stage."""
+    failures = []
+    for scale, stages in results.items():
+        for stage, now in stages.items():
+            then = baseline.get(scale, {}).get(stage)
+            if not then:
+                continue
+            floor = then["candidates_per_sec"] * (1 - tolerance)
+            if now["candidates_per_sec"] < floor:
+                failures.append(
+                    f"x{scale} {stage}: {now['candidates_per_sec']:,.0f} candidates/s, "
+                    f"baseline {then['candidates_per_sec']:,.0f}"
+                )
+            ceiling = then["peak_bytes"] * (1 + tolerance)
+            if now["peak_bytes"] > ceiling:
+                failures.append(
+                    f"x{scale} {stage}: peak {now['peak_bytes'] / 2**20:.1f} MiB, "
+                    f"baseline {then['peak_bytes'] / 2**20:.1f} MiB"
+                )
+    return failures
+
+
+def run(data_dir: Path, scales, stages, repeat) -> dict:
+    corpus = load_corpus(data_dir)
+    candidates = sum(len(d["unopposed_candidates"]) for d in corpus)
+    print(f"Corpus: {len(corpus)} state files, {candidates:,} candidates")
+    results = {}
+    for scale in scales:
+        print(f"\nx{scale} ({candidates * scale:,} candidates)")
+        print(f"  {'stage':<16} {'seconds':>9} {'peak MiB':>9} {'candidates/s':>14}")
+        results[str(scale)] = {}
+        for stage in stages:
+            seconds, peak = measure(stage, corpus, scale, data_dir, repeat)
+            rate = candidates * scale / seconds if seconds else math.inf
+            results[str(scale)][stage] = {
+                "seconds": round(seconds, 4),
+                "peak_bytes": peak,
+                "candidates_per_sec": round(rate),
+            }
+            print(f"  {stage:<16} {seconds:>9.3f} {peak / 2**20:>9.2f} {rate:>14,.0f}")
+    return results
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="Benchmark the output and aggregation stages on the corpus"
+    )
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    p.add_argument("--stage", choices=STAGES, action="append")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    p.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed fractional drop in throughput or growth in peak memory",
+    )
+    p.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the baseline instead of comparing",
+    )
+    args = p.parse_args()
+
+    results = run(args.data_dir, args.scales, args.stage or STAGES, args.repeat)
+    if args.update_baseline:
+        baseline = {}
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        for scale, stages in results.items():
+            baseline.setdefault(scale, {}).update(stages)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; nothing to compare", file=sys.stderr)
+        return 0
+    failures = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
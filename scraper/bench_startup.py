@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for main.py.
+Runs main.py under `python -X importtime` for paths that should never touch the
+network (--help, an unknown state code) and fails if heavy dependencies get
+imported or the import time of our own modules exceeds the budget.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRAPER_DIR = Path(__file__).parent
+
+# Milliseconds of imports attributable to main.py, beyond bare interpreter startup
+DEFAULT_BUDGET_MS = 60.0
+FORBIDDEN_MODULES = ("requests", "bs4", "lxml", "urllib3")
+SCENARIOS = {
+    "help": ["--help"],
+    "unknown state": ["ZZ"],
+}
+
+
+def importtime(args: list[str]) -> list[tuple[str, int]]:
+    """(module, cumulative microseconds) for every import, nested ones indented."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=SCRAPER_DIR,
+        capture_output=True,
+        text=True,
+    )
+    lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            lines.append((name[1:].rstrip(), int(cumulative)))
+    return lines
+
+
+def import_times(args: list[str]) -> dict[str, int]:
+    """Cumulative import time in microseconds for each top-level import."""
+    return _top_level(importtime(args))
+
+
+def imported_modules(args: list[str]) -> set[str]:
+    """Every module imported, however deeply nested."""
+    return {name.strip() for name, _ in importtime(args)}
+
+
+def forbidden(modules) -> list[str]:
+    return sorted(m for m in modules if m.split(".")[0] in FORBIDDEN_MODULES)
+
+
+def measure(args: list[str], runs: int) -> tuple[float, dict[str, int], set[str]]:
+    """Median milliseconds of main.py-specific imports, plus the last breakdown
+    and every module the last run imported."""
+    interpreter = set(import_times(["-c", "pass"]))
+    totals = []
+    own = {}
+    modules = set()
+    for _ in range(runs):
+        lines = importtime(["main.py", *args])
+        own = {m: t for m, t in _top_level(lines).items() if m not in interpreter}
+        modules = {name.strip() for name, _ in lines}
+        totals.append(sum(own.values()) / 1000)
+    return statistics.median(totals), own, modules
+
+
+def _top_level(lines: list[tuple[str, int]]) -> dict[str, int]:
+    # Nested imports are indented; their time is already in the parent's total
+    return {name: us for name, us in lines if not name.startswith(" ")}
+
+
+def check(budget_ms: float, runs: int) -> list[str]:
+    failures = []
+    for label, args in SCENARIOS.items():
+        total_ms, own, modules = measure(args, runs)
+        heaviest = sorted(own.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        print(f"{label}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+        for module, us in heaviest:
+            print(f"  {us / 1000:7.1f} ms  {module}")
+        # Scan nested imports too: a helper importing requests is just as bad
+        loaded = forbidden(modules)
+        if loaded:
+            failures.append(f"{label}: imported {', '.join(loaded)}")
+        if total_ms > budget_ms:
+            failures.append(f"{label}: {total_ms:.1f} ms exceeds {budget_ms:.0f} ms")
+    return failures
+
+
+def main():
+    p = argparse.ArgumentParser(description="Check main.py startup import time")
+    p.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    p.add_argument("--runs", type=int, default=5)
+    args = p.parse_args()
+
+    failures = check(args.budget_ms, args.runs)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
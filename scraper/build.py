@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Make-style build of the derived files in election_data/.
+Each target (nationwide_{year}.json, summary/{year}.json, search/{year}/, the
+aggregate cube and manifest.json) lists the state-year files it is built from
+and the targets it hashes. A target is rebuilt only when the content hash of
+those inputs, or of its own outputs, differs from the stamp of its last build,
+so a single-state rescrape rebuilds just that year's files, the cube and the
+manifest. Independent stale targets are built in parallel; stamps are written
+only after a target succeeds, so an interrupted build is finished next run.
+
+    python build.py [--data-dir DIR] [--jobs N] [--force] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import nationwide_stats
+from search_index import SEARCH_DIRNAME, write_search_index
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+STAMPS_FILENAME = ".build_stamps.json"
+# Bump whenever a builder's output changes for the same inputs
+BUILD_VERSION = 2
+# Below this many stale targets, starting a pool costs more than it saves
+MIN_PARALLEL = 4
+_STATE_FILE_RE = re.compile(r"^([a-z_]+)_(\d{4})\.json$")
+
+
+@dataclass
+class Target:
+    name: str
+    kind: str
+    inputs: list[Path]
+    # A directory output stands for every JSON file in it
+    outputs: list[Path]
+    year: str | None = None
+    deps: list[str] = field(default_factory=list)
+
+
+def state_files(data_dir: Path) -> dict[str, list[Path]]:
+    """State-year files (error files included) grouped by year."""
+    by_year: dict[str, list[Path]] = {}
+    for path in sorted(data_dir.glob("*.json")):
+        match = _STATE_FILE_RE.match(path.name)
+        if match and match.group(1) != "nationwide":
+            by_year.setdefault(match.group(2), []).append(path)
+    return by_year
+
+
+def graph(data_dir: Path) -> dict[str, Target]:
+    """Every derived target, keyed by name, each after the targets it depends on."""
+    by_year = state_files(data_dir)
+    targets = {}
+    for year, paths in sorted(by_year.items()):
+        for kind, output in (
+            ("nationwide", data_dir / f"nationwide_{year}.json"),
+            ("summary", data_dir / nationwide_stats.SUMMARY_DIRNAME / f"{year}.json"),
+            ("search", data_dir / SEARCH_DIRNAME / year),
+        ):
+            targets[f"{kind}/{year}"] = Target(
+                f"{kind}/{year}", kind, paths, [output], year
+            )
+    everything = [p for paths in by_year.values() for p in paths]
+    targets["cube"] = Target(
+        "cube", "cube", everything, [data_dir / nationwide_stats.CUBE_PATH]
+    )
+    # The manifest records the content hash of every other derived file
+    targets["manifest"] = Target(
+        "manifest",
+        "manifest",
+        everything,
+        [data_dir / "manifest.json"],
+        deps=list(targets),
+    )
+    return targets
+
+
+def fingerprint(paths: list[Path], cache: dict | None = None) -> str:
+    """Hash of the names and contents of paths; missing files hash as missing."""
+    h = hashlib.sha256()
+    for path in paths:
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            digest = cache.get(file) if cache is not None else None
+            if digest is None:
+                try:
+                    digest = hashlib.sha256(file.read_bytes()).hexdigest()
+                except OSError:
+                    digest = "missing"
+                if cache is not None:
+                    cache[file] = digest
+            h.update(f"{file.name}\0{digest}\0".encode())
+    return h.hexdigest()
+
+
+def load_stamps(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            stamps = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if stamps.get("version") != BUILD_VERSION:
+        return {}
+    return stamps.get("targets", {})
+
+
+def save_stamps(path: Path, stamps: dict):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(
+            {"version": BUILD_VERSION, "targets": stamps}, f, indent=2, sort_keys=True
+        )
+        f.write("\n")
+    tmp.replace(path)
+
+
+def build(
+    data_dir: Path, jobs: int | None = None, force=False, dry_run=False
+) -> dict[str, list[str]]:
+    """Rebuild the stale targets; returns the built (or, dry, stale) and fresh names."""
+    targets = graph(data_dir)
+    stamps_path = data_dir / STAMPS_FILENAME
+    stamps = load_stamps(stamps_path)
+    # State files are inputs to several targets; hash each once
+    input_hashes: dict[Path, str] = {}
+    report = {"built": [], "fresh": []}
+
+    for level in _levels(targets):
+        stale = []
+        for target in level:
+            key = _input_key(target, targets, input_hashes)
+            stamp = stamps.get(target.name, {})
+            if (
+                force
+                or stamp.get("inputs") != key
+                or stamp.get("outputs") != fingerprint(target.outputs)
+                or any(dep in report["built"] for dep in target.deps)
+            ):
+                stale.append((target, key))
+            else:
+                report["fresh"].append(target.name)
+        if dry_run:
+            report["built"] += [t.name for t, _ in stale]
+            continue
+        for target, key in _run(stale, data_dir, jobs):
+            stamps[target.name] = {
+                "inputs": key,
+                "outputs": fingerprint(target.outputs),
+            }
+            report["built"].append(target.name)
+            print(f"  Built {target.name}", file=sys.stderr)
+        if stale:
+            save_stamps(stamps_path, stamps)
+
+    gone = set(stamps) - set(targets)
+    if gone and not dry_run:
+        for name in gone:
+            del stamps[name]
+        save_stamps(stamps_path, stamps)
+    return report
+
+
+def _levels(targets: dict[str, Target]) -> list[list[Target]]:
+    """Targets grouped so that each only depends on those in earlier groups."""
+    depth: dict[str, int] = {}
+    for name, target in targets.items():
+        depth[name] = 1 + max((depth[d] for d in target.deps), default=-1)
+    levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name, target in targets.items():
+        levels[depth[name]].append(target)
+    return levels
+
+
+def _input_key(target: Target, targets: dict, input_hashes: dict) -> str:
+    # Dependencies are already built, so their outputs are hashed as they are now
+    deps = [p for d in target.deps for p in targets[d].outputs]
+    return hashlib.sha256(
+        f"{BUILD_VERSION}\0{target.kind}\0{fingerprint(target.inputs, input_hashes)}"
+        f"\0{fingerprint(deps)}".encode()
+    ).hexdigest()
+
+
+def _run(stale, data_dir, jobs):
+    """Build each (target, key), yielding them as they succeed."""
+    work = [(t.kind, data_dir, t.year, t.inputs) for t, _ in stale]
+    if len(stale) < MIN_PARALLEL or (jobs or os.cpu_count() or 1) < 2:
+        for (target, key), args in zip(stale, work):
+            _build_target(*args)
+            yield target, key
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_build_target, *args) for args in work]
+        for (target, key), future in zip(stale, futures):
+            future.result()
+            yield target, key
+
+
+def _build_target(kind: str, data_dir: Path, year: str | None, inputs: list[Path]):
+    if kind == "manifest":
+        nationwide_stats.write_manifest(data_dir)
+        return
+    data_by_year = nationwide_stats.load_state_files(inputs)
+    if kind == "cube":
+        nationwide_stats.write_cube(data_dir, data_by_year)
+        return
+    # Years with only error files still get (empty) per-year files
+    states = data_by_year.get(year, [])
+    if kind == "nationwide":
+        nationwide_stats.write_nationwide(data_dir, year, states)
+    elif kind == "summary":
+        nationwide_stats.write_summary_indexes(data_dir, {year: states})
+    else:
+        write_search_index(data_dir, {year: states})
+
+
+def main():
+    p = argparse.ArgumentParser(description="Rebuild stale derived files")
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.add_argument("--force", action="store_true", help="Rebuild every target")
+    p.add_argument(
+        "--dry-run", action="store_true", help="List stale targets without building"
+    )
+    args = p.parse_args()
+
+    start = time.perf_counter()
+    report = build(args.data_dir, args.jobs, args.force, args.dry_run)
+    if args.dry_run:
+        for name in report["built"]:
+            print(name)
+    print(
+        f"{len(report['built']) + len(report['fresh'])} targets, "
+        f"{len(report['built'])} {'stale' if args.dry_run else 'rebuilt'}, "
+        f"{time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
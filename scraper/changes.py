@@ -0,0 +1,67 @@
+"""
+Change feed between scrapes.
+Diffs a state's new unopposed candidates against its previous state file and
+appends the added, removed and changed events to election_data/changes/{year}.jsonl.
+"""
+
+import json
+from pathlib import Path
+
+from data import Race, state_filename
+
+CHANGES_DIRNAME = "changes"
+
+
+def load_previous(election_data_dir: Path, state_code: str, year: int) -> list[Race]:
+    """Unopposed candidates from the current state file, or [] if unavailable."""
+    path = election_data_dir / f"{state_filename(state_code)}_{year}.json"
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return []
+    if "error" in data:
+        return []
+    return [Race(**c) for c in data.get("unopposed_candidates", [])]
+
+
+def diff(previous: list[Race], current: list[Race]) -> list[dict]:
+    """Keyed diff of two candidate lists using Race.key()."""
+    before = {r.key(): r for r in previous}
+    after = {r.key(): r for r in current}
+    events = []
+    for key, race in after.items():
+        old = before.get(key)
+        if old is None:
+            events.append(_event("added", race))
+        elif old.unopposed_in != race.unopposed_in:
+            events.append(
+                _event("changed", race, previous_unopposed_in=old.unopposed_in)
+            )
+    for key, race in before.items():
+        if key not in after:
+            events.append(_event("removed", race))
+    return events
+
+
+def append_changes(changes_dir: Path, year: int, events: list[dict], at: str):
+    """Append events to the per-year change log, one JSON object per line."""
+    if not events:
+        return
+    changes_dir.mkdir(parents=True, exist_ok=True)
+    with open(changes_dir / f"{year}.jsonl", "a") as f:
+        for event in events:
+            f.write(json.dumps({"at": at, **event}) + "\n")
+
+
+def _event(change, race, **extra):
+    return {
+        "change": change,
+        "state": race.state,
+        "office": race.office,
+        "district": race.district,
+        "candidate": race.candidate,
+        "party": race.party,
+        "unopposed_in": race.unopposed_in,
+        **extra,
+    }
@@ -54,6 +54,12 @@ STATE_NAMES = {
     "DC": "District of Columbia",
 }
 
+
+def state_filename(state_code):
+    """Base name used for a state's files in election_data/ (e.g. new_york)."""
+    return STATE_NAMES[state_code].lower().replace(" ", "_")
+
+
 UPPER_CHAMBERS = {"NE"}
 
 LOWER_CHAMBERS = {
@@ -136,6 +142,26 @@ class RaceStats:
                 self.primary_unopposed_by_party.get(party, 0) + count
             )
 
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class StateResult:
+    """One scraped state-year; error is set when the scrape was rejected."""
+
+    state: str
+    year: int
+    races: list[Race] = field(default_factory=list)
+    stats: RaceStats = field(default_factory=RaceStats)
+    office_stats: dict = field(default_factory=dict)
+    error: str | None = None
+    anomalies: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return self.error is None
+
 
 _PARTY_MAP = {
     "democratic": "Democrat",
@@ -175,3 +201,26 @@ def deduplicate(results):
             seen[k] = r
             out.append(r)
     return out
+
+
+def merge_offices(by_office):
+    """Flatten per-office (results, stats) pairs into one state-wide pair."""
+    results = []
+    stats = RaceStats()
+    for office_results, office_stats in by_office.values():
+        results.extend(office_results)
+        stats.merge(office_stats)
+    return results, stats
+
+
+def office_stats(by_office):
+    """Per-office race counts, as written to the state file's office_stats."""
+    return {
+        office: {
+            "total_races": stats.total_races,
+            "races_by_party": stats.races_by_party,
+            "general_total_races": stats.general_total_races,
+            "primary_races_by_party": stats.primary_races_by_party,
+        }
+        for office, (_, stats) in by_office.items()
+    }
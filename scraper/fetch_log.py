@@ -0,0 +1,59 @@
+"""
+Log of page fetch attempts.
+Every office page requested by a --parts scrape is recorded in
+election_data/fetches/{year}.jsonl with its outcome, whether or not it left a
+part behind, so the scheduler can count real fetches against its daily budget
+and back off pages that keep failing.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+FETCH_LOG_DIRNAME = "fetches"
+# A part was written from the page
+OK = "ok"
+# The page could not be fetched (e.g. it does not exist for this year)
+MISSING = "missing"
+# The page was parsed but its results were rejected or kept out of the parts
+REJECTED = "rejected"
+# Older entries are dropped on write; longer than any backoff in schedule.py
+RETENTION = timedelta(days=30)
+
+
+def record(log_dir: Path, year: int, state: str, attempts: list[tuple], at: str):
+    """Append an entry per (office, status) attempt, pruning entries past RETENTION."""
+    if not attempts:
+        return
+    path = log_dir / f"{year}.jsonl"
+    now = datetime.fromisoformat(at)
+    kept = [e for e in load(log_dir, year) if now - _at(e) <= RETENTION]
+    kept += [
+        {"at": at, "state": state, "office": office, "status": status}
+        for office, status in attempts
+    ]
+    log_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        for entry in kept:
+            f.write(json.dumps(entry) + "\n")
+    tmp.replace(path)
+
+
+def load(log_dir: Path, year: int) -> list[dict]:
+    """Every logged attempt for a year, in the order they were made."""
+    entries = []
+    try:
+        with open(log_dir / f"{year}.jsonl") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except IOError:
+        pass
+    return entries
+
+
+def _at(entry: dict) -> datetime:
+    return datetime.fromisoformat(entry["at"])
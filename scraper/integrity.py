@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Full-corpus integrity validator for election_data/.
+Checks every state-year and nationwide file against the schema and the count
+invariants, fanning uncached files out over a process pool. Verdicts are cached
+by filename and content hash, so unchanged files are not parsed again.
+
+    python integrity.py [--data-dir DIR] [--jobs N] [--cache FILE | --no-cache]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from data import STATE_NAMES, state_filename
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+CACHE_PATH = Path(__file__).parent / ".integrity_cache.json"
+# Bump whenever the checks change so cached verdicts are discarded
+CHECKS_VERSION = 1
+# Below this many uncached files, starting a pool costs more than it saves
+MIN_PARALLEL = 16
+STAGES = ("Primary", "General", "Primary & General")
+CANDIDATE_FIELDS = (
+    "state",
+    "office",
+    "district",
+    "candidate",
+    "party",
+    "unopposed_in",
+    "source",
+)
+_FILENAME_RE = re.compile(r"^([a-z_]+)_(\d{4})\.json$")
+
+
+def corpus_files(data_dir: Path) -> list[Path]:
+    """Every state-year and nationwide file in data_dir."""
+    return sorted(
+        path for path in data_dir.glob("*.json") if _FILENAME_RE.match(path.name)
+    )
+
+
+def check_file(path: Path) -> list[str]:
+    """Problems found in one file; empty when it is valid."""
+    try:
+        data = json.loads(Path(path).read_bytes())
+    except (OSError, ValueError) as e:
+        return [f"unreadable: {e}"]
+    return check_data(data, Path(path).name)
+
+
+def check_data(data, filename: str) -> list[str]:
+    if not isinstance(data, dict):
+        return ["top level is not an object"]
+    match = _FILENAME_RE.match(filename)
+    if match and match.group(1) == "nationwide":
+        return _check_stages(data, required=True)
+    problems = []
+    state = data.get("state")
+    if state not in STATE_NAMES:
+        return [f"unknown state {state!r}"]
+    year = data.get("year")
+    if not isinstance(year, int) or isinstance(year, bool):
+        problems.append(f"year {year!r} is not an integer")
+    elif f"{state_filename(state)}_{year}.json" != filename:
+        problems.append(f"state {state} and year {year} do not match the filename")
+    if data.get("state_name") != STATE_NAMES[state]:
+        problems.append(
+            f"state_name {data.get('state_name')!r} is not {STATE_NAMES[state]!r}"
+        )
+    if not isinstance(data.get("scraped_at"), str):
+        problems.append("scraped_at is missing")
+    if "error" in data:
+        if not isinstance(data.get("message"), str):
+            problems.append("error file has no message")
+        return problems
+
+    for key in ("total", "total_races"):
+        problems += _count(data, key, key)
+    problems += _party_counts(data.get("total_races_by_party"), "total_races_by_party")
+    candidates = data.get("unopposed_candidates")
+    if not isinstance(candidates, list):
+        return problems + ["unopposed_candidates is not a list"]
+    if data.get("total") != len(candidates):
+        problems.append(
+            f"total ({data.get('total')}) != candidate count ({len(candidates)})"
+        )
+    for i, c in enumerate(candidates):
+        if not isinstance(c, dict):
+            problems.append(f"candidate {i} is not an object")
+            continue
+        missing = [k for k in CANDIDATE_FIELDS if not isinstance(c.get(k), str)]
+        if missing:
+            problems.append(f"candidate {i} lacks {', '.join(missing)}")
+        elif c["state"] != state:
+            problems.append(f"candidate {i} is in {c['state']}, not {state}")
+        elif c["unopposed_in"] not in STAGES:
+            problems.append(f"candidate {i} has unknown stage {c['unopposed_in']!r}")
+    return problems + _check_stages(data, required=False)
+
+
+def _check_stages(data, required):
+    """Schema and bounds of the general and primary breakdowns."""
+    if not required and "general" not in data and "primary" not in data:
+        return []
+    general = data.get("general")
+    primary = data.get("primary")
+    if not isinstance(general, dict) or not isinstance(primary, dict):
+        return ["general and primary must both be objects"]
+    problems = []
+    problems += _count(general, "total_races", "general.total_races")
+    problems += _count(general, "total_unopposed", "general.total_unopposed")
+    problems += _party_counts(
+        general.get("unopposed_by_party"), "general.unopposed_by_party"
+    )
+    problems += _count(primary, "total_unopposed", "primary.total_unopposed")
+    problems += _party_counts(
+        primary.get("unopposed_by_party"), "primary.unopposed_by_party"
+    )
+    problems += _party_counts(
+        primary.get("total_races_by_party"), "primary.total_races_by_party"
+    )
+    if problems:
+        return problems
+
+    if general["total_unopposed"] > general["total_races"]:
+        problems.append(
+            f"general.total_unopposed ({general['total_unopposed']}) "
+            f"exceeds general.total_races ({general['total_races']})"
+        )
+    total_by_party = primary["total_races_by_party"]
+    for party, unopposed in primary["unopposed_by_party"].items():
+        if unopposed > total_by_party.get(party, 0):
+            problems.append(
+                f"{party} primary has {unopposed} unopposed "
+                f"but only {total_by_party.get(party, 0)} total races"
+            )
+    return problems
+
+
+def _count(obj, key, label):
+    value = obj.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        return [f"{label} {value!r} is not a count"]
+    return []
+
+
+def _party_counts(value, label):
+    if not isinstance(value, dict):
+        return [f"{label} is not an object"]
+    return [
+        f"{label}[{party!r}] {n!r} is not a count"
+        for party, n in value.items()
+        if not isinstance(n, int) or isinstance(n, bool) or n < 0
+    ]
+
+
+def load_cache(cache_path: Path | None) -> dict[str, list[str]]:
+    """Content hash -> problems, or empty if the cache is absent or stale."""
+    if cache_path is None:
+        return {}
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if cached.get("version") != CHECKS_VERSION:
+        return {}
+    return cached.get("verdicts", {})
+
+
+def save_cache(cache_path: Path, verdicts: dict[str, list[str]]):
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({"version": CHECKS_VERSION, "verdicts": verdicts}, sort_keys=True)
+    )
+    tmp.replace(cache_path)
+
+
+def validate(
+    data_dir: Path = ELECTION_DATA_DIR,
+    cache_path: Path | None = CACHE_PATH,
+    jobs: int | None = None,
+) -> tuple[dict[str, list[str]], int, int]:
+    """Check every file in data_dir.
+
+    Returns (filename -> problems for invalid files, files checked, cache hits).
+    """
+    cache = load_cache(cache_path)
+    digests = {}
+    for path in corpus_files(data_dir):
+        # The filename is part of the key: it is checked against state and year
+        digest = hashlib.sha256(path.name.encode() + b"\0" + path.read_bytes())
+        digests[path] = digest.hexdigest()
+    todo = [path for path, digest in digests.items() if digest not in cache]
+    verdicts = {d: cache[d] for d in digests.values() if d in cache}
+    hits = len(digests) - len(todo)
+
+    if len(todo) < MIN_PARALLEL or jobs == 1:
+        results = [check_file(path) for path in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(check_file, todo, chunksize=8))
+    for path, problems in zip(todo, results):
+        verdicts[digests[path]] = problems
+
+    if cache_path is not None and todo:
+        save_cache(cache_path, verdicts)
+    failed = {
+        path.name: verdicts[digest]
+        for path, digest in digests.items()
+        if verdicts[digest]
+    }
+    return failed, len(digests), hits
+
+
+def main():
+    p = argparse.ArgumentParser(description="Validate every file in election_data/")
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.add_argument("--cache", type=Path, default=CACHE_PATH)
+    p.add_argument("--no-cache", action="store_true", help="Check every file again")
+    args = p.parse_args()
+
+    start = time.perf_counter()
+    failed, total, hits = validate(
+        args.data_dir, None if args.no_cache else args.cache, args.jobs
+    )
+    for name, problems in sorted(failed.items()):
+        for problem in problems:
+            print(f"{name}: {problem}")
+    print(
+        f"{total} files, {len(failed)} invalid, {hits} cached verdicts, "
+        f"{time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
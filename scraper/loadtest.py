@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Load test for the scraper's network behavior.
+Starts mock_server.py in-process (or uses --base-url), scrapes the given states
+through it from several worker threads with the real fetch and retry code, and
+reports throughput, per-page latency percentiles and how many injected faults
+were recovered from.
+
+    python loadtest.py --states TX,CA,NY --workers 4 --latency 0.1 --jitter 0.2 \
+        --burst-every 10 --burst-length 2 --drop-rate 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import mock_server
+from data import STATE_NAMES
+from sources import ballotpedia
+
+
+@dataclass
+class LoadResult:
+    pages: int = 0
+    failed: list[str] = field(default_factory=list)
+    latencies: list[float] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    server: dict = field(default_factory=dict)
+
+
+def run(base, states, years, workers) -> LoadResult:
+    result = LoadResult()
+    lock = threading.Lock()
+
+    def scrape(task):
+        state, year = task
+        fetch = ballotpedia.session_fetcher()
+
+        def timed(url):
+            start = time.perf_counter()
+            html = fetch(url)
+            with lock:
+                result.pages += 1
+                result.latencies.append(time.perf_counter() - start)
+                if html is None:
+                    result.failed.append(url)
+            return html
+
+        ballotpedia.scrape_offices(state, year, fetch=timed, base=base)
+
+    tasks = [(state, year) for year in years for state in states]
+    start = time.perf_counter()
+    # The scraper narrates every fetch; keep the report readable
+    with contextlib.redirect_stderr(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(scrape, tasks))
+    result.wall_seconds = time.perf_counter() - start
+    with urllib.request.urlopen(f"{base}/__stats") as r:
+        result.server = json.load(r)
+    return result
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def recovered(server: dict) -> int:
+    """Pages that eventually got a 200 after at least one injected fault."""
+    return sum(
+        1
+        for outcomes in server.get("by_path", {}).values()
+        if outcomes[-1] == "200" and any(o != "200" for o in outcomes)
+    )
+
+
+def report(result: LoadResult):
+    faults = sum(
+        n for outcome, n in result.server["by_outcome"].items() if outcome != "200"
+    )
+    print(f"pages        {result.pages} in {result.wall_seconds:.1f}s")
+    print(f"throughput   {result.pages / result.wall_seconds:.1f} pages/s")
+    for pct in (50, 95, 99):
+        print(f"p{pct:<11} {percentile(result.latencies, pct) * 1000:.0f} ms")
+    print(f"max          {max(result.latencies, default=0) * 1000:.0f} ms")
+    print(f"requests     {result.server['requests']}")
+    print(f"transferred  {result.server['bytes_sent'] / 2**20:.1f} MiB")
+    print(f"faults       {faults} {result.server['by_outcome']}")
+    print(f"recovered    {recovered(result.server)} pages")
+    print(f"failed       {len(result.failed)} pages")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Load-test the scraper against a mock")
+    p.add_argument(
+        "--states",
+        type=lambda s: [c.strip().upper() for c in s.split(",") if c.strip()],
+        default=list(STATE_NAMES)[:10],
+    )
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--base-url", help="Use a running mock_server.py instead")
+    p.add_argument(
+        "--max-failed", type=int, default=0, help="Fail if more pages than this fail"
+    )
+    mock_server.add_arguments(p)
+    args = p.parse_args()
+
+    server = None
+    base = args.base_url
+    if not base:
+        server = mock_server.make_server(mock_server.config_from_args(args))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = mock_server.base_url(server)
+    try:
+        result = run(base, args.states, args.years, args.workers)
+    finally:
+        if server:
+            server.shutdown()
+    report(result)
+    return 1 if len(result.failed) > args.max_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,47 @@
 import argparse
 import json
 import sys
-from datetime import datetime, timezone
+from datetime import datetime
+from pathlib import Path
 
-from data import STATE_NAMES, deduplicate
-from sources import ballotpedia
-from output import render
+import api
+from api import ELECTION_DATA_DIR
+from data import STATE_NAMES
+from output import render, result_data
 
-MIN_EXPECTED_RACES = 10
 
-
-def main():
-    args = _parse_args()
+def main(argv=None):
+    args = _parse_args(argv)
     state = args.state.upper()
     if state not in STATE_NAMES:
         sys.exit(f"Unknown state code: {state}")
 
-    print(f"Checking {STATE_NAMES[state]} ({args.year})...", file=sys.stderr)
-
-    results, stats = ballotpedia.scrape(state, args.year)
-
-    if stats.total_races < MIN_EXPECTED_RACES:
-        print(
-            f"ERROR: Only found {stats.total_races} races for {state}, expected at least {MIN_EXPECTED_RACES}",
-            file=sys.stderr,
-        )
+    result = api.scrape_state(
+        state,
+        args.year,
+        fetch_mode=args.fetch,
+        data_dir=args.data_dir,
+        validate_history=args.validate,
+        allow_anomalies=args.allow_anomalies,
+        use_parts=args.parts,
+        offices=args.offices,
+        record_changes=args.changes,
+        record_roster=args.roster,
+        archive=args.archive,
+        base_url=args.base_url,
+        low_memory=args.low_memory,
+        memory_report=args.memory_report,
+        profile=args.profile,
+    )
+    if not result.ok:
         if args.json:
-            error_data = {
-                "error": True,
-                "message": f"Scraping failed: only found {stats.total_races} races",
-                "state": state,
-                "state_name": STATE_NAMES.get(state, state),
-                "year": args.year,
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            }
-            json.dump(error_data, sys.stdout, indent=2)
+            json.dump(result_data(result), sys.stdout, indent=2)
             print()
         sys.exit(1)
+    render(result.races, result.stats, state, args.year, args.json, result.office_stats)
 
-    results = deduplicate(results)
-    render(results, stats, state, args.year, args.json)
 
-
-def _parse_args():
+def _parse_args(argv=None):
     p = argparse.ArgumentParser(description="Find unopposed candidates in US elections")
     p.add_argument("state", help="Two-letter state code (e.g. CA, TX, NY)")
     p.add_argument(
@@ -53,7 +52,79 @@ def _parse_args():
         help="Election year in YYYY format (default: current year)",
     )
     p.add_argument("--json", action="store_true", help="Output as JSON")
-    return p.parse_args()
+    p.add_argument(
+        "--data-dir",
+        type=Path,
+        default=ELECTION_DATA_DIR,
+        help="Directory of existing state files used as the historical baseline",
+    )
+    p.add_argument(
+        "--no-validate",
+        dest="validate",
+        action="store_false",
+        help="Skip comparison against historical data",
+    )
+    p.add_argument(
+        "--allow-anomalies",
+        action="store_true",
+        help="Warn about anomalies instead of rejecting the scrape",
+    )
+    p.add_argument(
+        "--parts",
+        action="store_true",
+        help="Store per-office parts under DATA_DIR/parts and fill failed offices from them",
+    )
+    p.add_argument(
+        "--offices",
+        type=lambda s: [o.strip() for o in s.split(",") if o.strip()],
+        help="Comma-separated offices to rescrape (e.g. 'State House'); requires --parts",
+    )
+    p.add_argument(
+        "--changes",
+        action="store_true",
+        help="Append changes since the previous state file to DATA_DIR/changes/YEAR.jsonl",
+    )
+    p.add_argument(
+        "--roster",
+        action="store_true",
+        help="Write every contest seen to DATA_DIR/roster/STATE_YEAR.json (see roster.py)",
+    )
+    p.add_argument(
+        "--fetch",
+        choices=("page", "api"),
+        default="page",
+        help="Download full pages, or only candidate sections via the MediaWiki parse API",
+    )
+    p.add_argument(
+        "--base-url",
+        help="Fetch pages from this server instead of Ballotpedia "
+        "(default: $BALLOTPEDIA_BASE_URL or https://ballotpedia.org)",
+    )
+    p.add_argument(
+        "--archive",
+        type=Path,
+        help="Archive every fetched page under this directory (see reparse.py)",
+    )
+    p.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Free each table and district section as soon as it is parsed",
+    )
+    p.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Report peak parse memory per page on stderr",
+    )
+    p.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Profile each office's fetch and parse into DIR and merge a hot-spot report",
+    )
+    args = p.parse_args(argv)
+    if args.offices and not args.parts:
+        p.error("--offices requires --parts")
+    return args
 
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Ballotpedia.
+Serves recorded pages (as saved by batch.py --record) or synthetic ones at the
+paths _urls produces, with configurable latency, bandwidth caps, 429/503 bursts
+with Retry-After and dropped connections. Point the scraper at it with
+--base-url or BALLOTPEDIA_BASE_URL.
+
+    python mock_server.py [--port 8001] [--pages DIR] [--latency 0.2] [--bandwidth 200000]
+        [--burst-every 20 --burst-length 3 --burst-status 429 --retry-after 1] [--drop-rate 0.05]
+
+GET /__stats returns the responses served so far.
+"""
+
+import argparse
+import json
+import random
+import socket
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import synthetic
+from data import STATE_NAMES
+from sources.ballotpedia import _urls
+
+CHUNK_BYTES = 16 * 1024
+
+
+@dataclass
+class MockConfig:
+    pages_dir: Path | None = None  # recorded pages, named like batch.py fixtures
+    years: tuple[int, ...] = (datetime.now().year,)
+    latency: float = 0.0  # seconds before each response
+    jitter: float = 0.0  # extra uniform random latency, in seconds
+    bandwidth: int = 0  # bytes per second per response; 0 is unlimited
+    burst_every: int = 0  # the last burst_length of every burst_every requests fail
+    burst_length: int = 0
+    burst_status: int = 429
+    retry_after: int = 1
+    drop_rate: float = 0.0  # fraction of connections closed without a response
+    seed: int = 0
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    bytes_sent: int = 0
+    by_outcome: dict[str, int] = field(default_factory=dict)
+    # Outcomes per path in arrival order, e.g. ["429", "200"]
+    by_path: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "by_outcome": self.by_outcome,
+            "by_path": self.by_path,
+        }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    config: MockConfig
+    stats: MockStats
+    pages: dict[str, tuple[str, int, str]]
+    lock: threading.Lock
+    rng: random.Random
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/__stats":
+            with self.lock:
+                body = json.dumps(self.stats.to_dict()).encode()
+            self._send(200, body, "application/json")
+            return
+
+        config = self.config
+        with self.lock:
+            self.stats.requests += 1
+            n = self.stats.requests
+            drop = self.rng.random() < config.drop_rate
+            delay = config.latency + self.rng.uniform(0, config.jitter)
+        in_burst = config.burst_every and (n - 1) % config.burst_every >= (
+            config.burst_every - config.burst_length
+        )
+
+        if drop:
+            self._record(path, "dropped", 0)
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if in_burst:
+            body = b"Too many requests"
+            self._record(path, str(config.burst_status), len(body))
+            headers = {"Retry-After": str(config.retry_after)}
+            self._send(config.burst_status, body, "text/plain", headers)
+            return
+        if delay:
+            time.sleep(delay)
+        html = self._page(unquote(path.lstrip("/")))
+        if html is None:
+            self._record(path, "404", 9)
+            self._send(404, b"Not Found", "text/plain")
+            return
+        body = html.encode()
+        self._record(path, "200", len(body))
+        self._send(200, body, "text/html; charset=utf-8")
+
+    def _page(self, title):
+        if self.config.pages_dir:
+            recorded = self.config.pages_dir / f"{title}.html"
+            if recorded.exists():
+                return recorded.read_text()
+        page = self.pages.get(title)
+        return synthetic_page(page[0], page[2]) if page else None
+
+    def _record(self, path, outcome, size):
+        with self.lock:
+            self.stats.bytes_sent += size
+            self.stats.by_outcome[outcome] = self.stats.by_outcome.get(outcome, 0) + 1
+            self.stats.by_path.setdefault(path, []).append(outcome)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        bandwidth = self.config.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), CHUNK_BYTES):
+            chunk = body[start : start + CHUNK_BYTES]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@lru_cache(maxsize=512)
+def synthetic_page(state: str, office: str) -> str:
+    """A stable synthetic page shaped like the real one for this office."""
+    seats = zlib.crc32(state.encode()) % 20 + 1
+    title = f"{STATE_NAMES[state]} {office}"
+    if office == "State House":
+        return synthetic.table_page(seats * 5, title=title)
+    if office == "State Senate":
+        return synthetic.table_page(seats * 2, title=title)
+    if office == "US House":
+        return synthetic.section_page(seats, title=title)
+    return synthetic.section_page(1, title=title)
+
+
+def page_titles(years) -> dict[str, tuple[str, int, str]]:
+    """Page title (URL path) -> (state, year, office) for every page _urls builds."""
+    titles = {}
+    for year in years:
+        for state, name in STATE_NAMES.items():
+            for office, url in _urls(name, state, year).items():
+                titles[url.rsplit("/", 1)[-1]] = (state, year, office)
+    return titles
+
+
+def make_server(config: MockConfig, host="127.0.0.1", port=0) -> ThreadingHTTPServer:
+    handler = type(
+        "BoundMockHandler",
+        (MockHandler,),
+        {
+            "config": config,
+            "stats": MockStats(),
+            "pages": page_titles(config.years),
+            "lock": threading.Lock(),
+            "rng": random.Random(config.seed),
+        },
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def add_arguments(p: argparse.ArgumentParser):
+    """Mock behavior options, shared with loadtest.py."""
+    p.add_argument("--pages", type=Path, help="Serve recorded pages from DIR first")
+    p.add_argument("--years", type=int, nargs="+", default=[datetime.now().year])
+    p.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    p.add_argument("--jitter", type=float, default=0.0, help="Extra random seconds")
+    p.add_argument("--bandwidth", type=int, default=0, help="Bytes/second cap")
+    p.add_argument("--burst-every", type=int, default=0)
+    p.add_argument("--burst-length", type=int, default=0)
+    p.add_argument("--burst-status", type=int, choices=(429, 503), default=429)
+    p.add_argument("--retry-after", type=int, default=1)
+    p.add_argument("--drop-rate", type=float, default=0.0)
+    p.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        pages_dir=args.pages,
+        years=tuple(args.years),
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        burst_status=args.burst_status,
+        retry_after=args.retry_after,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+
+
+def main():
+    p = argparse.ArgumentParser(description="Serve mock Ballotpedia pages")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8001)
+    add_arguments(p)
+    args = p.parse_args()
+
+    server = make_server(config_from_args(args), args.host, args.port)
+    print(f"Mock Ballotpedia on {base_url(server)}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
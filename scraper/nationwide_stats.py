@@ -4,17 +4,56 @@ Generate nationwide statistics from state election data files.
 Reads all state JSON files and computes aggregated statistics per year.
 """
 
+import hashlib
 import json
 import re
 from datetime import datetime, timezone
 from pathlib import Path
 
+from search_index import SEARCH_DIRNAME
+
+SUMMARY_DIRNAME = "summary"
+CUBE_PATH = "aggregates/cube.json"
+HASH_LENGTH = 16
+CUBE_DIMENSIONS = ("year", "state", "office", "party", "stage")
+# Written into cube.json so consumers need not read this module
+CUBE_NOTES = [
+    "Each cell is [year, state, office, party, stage, unopposed, races], "
+    "with dimensions as indexes into values.",
+    "Cells are additive, so any roll-up is a plain sum of the matching cells.",
+    "'*' marks a total over every value of its dimension, never a real "
+    "office or party.",
+    "General race totals have party '*': a race is not counted per party, "
+    "so no party-level general denominator exists.",
+    "State-years listed in coarse predate per-office stats. Their race "
+    "totals have office '*', so per-office denominators are unknown there, "
+    "though their unopposed cells still carry the real office.",
+]
+# Party value for general-election race counts, which are not split by party
+ALL_PARTIES = "*"
+# Office value for race counts from files written before office_stats existed
+ALL_OFFICES = "*"
+# Same matching order as getPartyInfo in src/lib/CandidateTable.svelte
+PARTY_ABBREVS = (
+    ("democrat", "D"),
+    ("republican", "R"),
+    ("libertarian", "L"),
+    ("green", "G"),
+    ("independent", "I"),
+    ("unknown", "U"),
+)
+
 
 def load_state_data(election_data_dir: Path) -> dict[str, list[dict]]:
     """Load all state JSON files grouped by year."""
+    return load_state_files(election_data_dir.glob("*.json"))
+
+
+def load_state_files(paths) -> dict[str, list[dict]]:
+    """Load the given state JSON files grouped by year, skipping all others."""
     data_by_year: dict[str, list[dict]] = {}
 
-    for filepath in election_data_dir.glob("*.json"):
+    for filepath in paths:
         if filepath.name == "manifest.json":
             continue
 
@@ -27,7 +66,8 @@ def load_state_data(election_data_dir: Path) -> dict[str, list[dict]]:
         try:
             with open(filepath) as f:
                 state_data = json.load(f)
-                if "error" in state_data:
+                # Skip error files and derived files such as nationwide_{year}.json
+                if "error" in state_data or "state" not in state_data:
                     continue
                 if year not in data_by_year:
                     data_by_year[year] = []
@@ -125,6 +165,228 @@ def compute_nationwide_stats(states_data: list[dict]) -> dict:
     return {"general": general, "primary": primary}
 
 
+def party_abbrev(party: str) -> str:
+    lower = party.lower()
+    for key, abbrev in PARTY_ABBREVS:
+        if key in lower:
+            return abbrev
+    return "O"
+
+
+def abbreviate_parties(counts: dict[str, int]) -> dict[str, int]:
+    by_abbrev: dict[str, int] = {}
+    for party, count in counts.items():
+        abbrev = party_abbrev(party)
+        by_abbrev[abbrev] = by_abbrev.get(abbrev, 0) + count
+    return by_abbrev
+
+
+def display_stats(stats: dict) -> dict:
+    """The numbers the site shows for a general/primary stats pair.
+
+    Parties are abbreviated and ranked by count, and primary races are summed
+    over parties, so the site renders them without aggregating anything.
+    """
+    general, primary = stats["general"], stats["primary"]
+    primary_totals = abbreviate_parties(primary["total_races_by_party"])
+    return {
+        "general": {
+            "total_unopposed": general["total_unopposed"],
+            "total_races": general["total_races"],
+            "by_party": _ranked(abbreviate_parties(general["unopposed_by_party"])),
+        },
+        "primary": {
+            "total_unopposed": primary["total_unopposed"],
+            "total_races": sum(primary_totals.values()),
+            "by_party": _ranked(abbreviate_parties(primary["unopposed_by_party"])),
+            "total_by_party": primary_totals,
+        },
+    }
+
+
+def _ranked(counts: dict[str, int]) -> list[list]:
+    return [[k, v] for k, v in sorted(counts.items(), key=lambda kv: -kv[1])]
+
+
+def build_summary_index(year: str, states_data: list[dict]) -> dict:
+    """Build the small per-year index the site needs for its first paint.
+
+    Holds per-state totals and per-party counts, plus their display form, but
+    no candidate lists, which are fetched from the full state file only when a
+    state is expanded.
+    """
+    states = {}
+    for state_data in sorted(states_data, key=lambda d: d["state"]):
+        state_stats = compute_state_stats(state_data)
+        states[state_data["state"]] = {
+            "state_name": state_data.get("state_name", state_data["state"]),
+            "total": state_data.get("total", 0),
+            "total_races": state_data.get("total_races", 0),
+            "scraped_at": state_data.get("scraped_at"),
+            **state_stats,
+            "display": display_stats(state_stats),
+        }
+    nationwide = compute_nationwide_stats(states_data)
+    return {
+        "year": int(year),
+        "nationwide": {**nationwide, "display": display_stats(nationwide)},
+        "states": states,
+    }
+
+
+def write_nationwide(election_data_dir: Path, year: str, states_data: list[dict]):
+    """Write election_data/nationwide_{year}.json."""
+    path = election_data_dir / f"nationwide_{year}.json"
+    with open(path, "w") as f:
+        json.dump(compute_nationwide_stats(states_data), f, indent=2)
+    return path
+
+
+def write_summary_indexes(election_data_dir: Path, data_by_year: dict) -> list[Path]:
+    """Write election_data/summary/{year}.json for every year with data."""
+    summary_dir = election_data_dir / SUMMARY_DIRNAME
+    summary_dir.mkdir(exist_ok=True)
+    paths = []
+    for year, states_data in data_by_year.items():
+        path = summary_dir / f"{year}.json"
+        with open(path, "w") as f:
+            json.dump(build_summary_index(year, states_data), f, separators=(",", ":"))
+        paths.append(path)
+    return paths
+
+
+def build_cube(data_by_year: dict[str, list[dict]]) -> dict:
+    """Pre-aggregate unopposed races and race totals over CUBE_DIMENSIONS."""
+    # Cells are additive: unopposed races sit on per-party cells and general race
+    # totals on each office's ALL_PARTIES cell, so any subset sums consistently.
+    cells: dict[tuple, list[int]] = {}
+    coarse = []
+
+    def add(key, unopposed=0, races=0):
+        cell = cells.setdefault(key, [0, 0])
+        cell[0] += unopposed
+        cell[1] += races
+
+    for year, states_data in data_by_year.items():
+        for state_data in states_data:
+            base = (int(year), state_data["state"])
+            _add_unopposed_cells(add, base, state_data)
+            if not _add_race_cells(add, base, state_data):
+                coarse.append(list(base))
+
+    values = {
+        dim: sorted({key[i] for key in cells}, key=str)
+        for i, dim in enumerate(CUBE_DIMENSIONS)
+    }
+    positions = {
+        dim: {v: i for i, v in enumerate(values[dim])} for dim in CUBE_DIMENSIONS
+    }
+    return {
+        "dimensions": list(CUBE_DIMENSIONS),
+        "measures": ["unopposed", "races"],
+        "notes": CUBE_NOTES,
+        "coarse": sorted(coarse),
+        "values": values,
+        "cells": [
+            [positions[dim][v] for dim, v in zip(CUBE_DIMENSIONS, key)] + measures
+            for key, measures in sorted(cells.items(), key=lambda kv: str(kv[0]))
+        ],
+    }
+
+
+def _add_unopposed_cells(add, base, state_data):
+    """One unopposed race per (office, district), per party and stage."""
+    seen = set()
+    for c in state_data.get("unopposed_candidates", []):
+        for stage in ("General", "Primary"):
+            if stage not in c.get("unopposed_in", ""):
+                continue
+            party = c.get("party", "Unknown")
+            race = (c.get("office"), c.get("district"), party, stage)
+            if race in seen:
+                continue
+            seen.add(race)
+            add((*base, c.get("office"), party, stage), unopposed=1)
+
+
+def _add_race_cells(add, base, state_data) -> bool:
+    """Add race denominators; False if the file only has state-wide totals."""
+    office_stats = state_data.get("office_stats")
+    if office_stats:
+        for office, stats in office_stats.items():
+            add(
+                (*base, office, ALL_PARTIES, "General"),
+                races=stats.get("general_total_races", 0),
+            )
+            for party, count in stats.get("primary_races_by_party", {}).items():
+                add((*base, office, party, "Primary"), races=count)
+        return True
+    # Older files only have state-wide totals; mirror compute_state_stats
+    add(
+        (*base, ALL_OFFICES, ALL_PARTIES, "General"),
+        races=state_data.get("total_races", 0),
+    )
+    for party, count in state_data.get("total_races_by_party", {}).items():
+        add((*base, ALL_OFFICES, party, "Primary"), races=count)
+    return False
+
+
+def rollup(cube: dict, by=(), **filters) -> dict[tuple, dict]:
+    """Sum cube cells grouped by the given dimensions, after filtering.
+
+    rollup(cube, by=("year", "party"), office="State House", stage="Primary")
+
+    races is None where the cube has no denominator for the group: a party's
+    share of general races, or an office in a state-year listed as coarse.
+    """
+    dims = cube["dimensions"]
+    values = cube["values"]
+    group_idx = [dims.index(d) for d in by]
+    allowed = {
+        dims.index(dim): {i for i, v in enumerate(values[dim]) if str(v) == str(wanted)}
+        for dim, wanted in filters.items()
+    }
+    totals: dict[tuple, dict] = {}
+    for cell in cube["cells"]:
+        if any(cell[i] not in ok for i, ok in allowed.items()):
+            continue
+        key = tuple(values[dims[i]][cell[i]] for i in group_idx)
+        total = totals.setdefault(key, {"unopposed": 0, "races": 0})
+        total["unopposed"] += cell[len(dims)]
+        total["races"] += cell[len(dims) + 1]
+    for key, total in totals.items():
+        group = {**filters, **dict(zip(by, key))}
+        if not _has_denominator(group, cube.get("coarse", [])):
+            total["races"] = None
+    return totals
+
+
+def _has_denominator(group: dict, coarse: list) -> bool:
+    """Whether the cube's race totals cover a group fixed to these values."""
+
+    def fixed(dim, wildcard):
+        return dim in group and str(group[dim]) != wildcard
+
+    # General races are counted per office, never per party
+    if fixed("party", ALL_PARTIES) and str(group.get("stage")) != "Primary":
+        return False
+    if fixed("office", ALL_OFFICES):
+        for year, state in coarse:
+            if str(group.get("year", year)) == str(year) and (
+                str(group.get("state", state)) == state
+            ):
+                return False
+    return True
+
+
+def write_cube(election_data_dir: Path, data_by_year: dict) -> Path:
+    path = election_data_dir / CUBE_PATH
+    path.parent.mkdir(exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(build_cube(data_by_year), f, separators=(",", ":"))
+    return path
+
+
 def generate_manifest(election_data_dir: Path) -> dict:
     """Generate the manifest with nationwide statistics."""
     data_by_year = load_state_data(election_data_dir)
@@ -139,9 +401,50 @@ def generate_manifest(election_data_dir: Path) -> dict:
         "years": [int(y) for y in years],
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "nationwide": nationwide,
+        # The site requests `path?v=hash`, so unchanged files stay cached
+        "files": file_hashes(election_data_dir),
+    }
+
+
+def file_hashes(election_data_dir: Path) -> dict[str, str]:
+    """Content hash of each file the site fetches, keyed by path in election_data/."""
+    paths = [
+        p
+        for p in election_data_dir.glob("*.json")
+        if re.search(r"_\d{4}\.json$", p.name)
+    ]
+    paths += election_data_dir.glob(f"{SUMMARY_DIRNAME}/*.json")
+    # Search shards are listed with their hashes in each year's index.json
+    paths += election_data_dir.glob(f"{SEARCH_DIRNAME}/*/index.json")
+    if (election_data_dir / CUBE_PATH).exists():
+        paths.append(election_data_dir / CUBE_PATH)
+    return {
+        p.relative_to(election_data_dir).as_posix(): content_hash(p)
+        for p in sorted(paths)
     }
 
 
+def content_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+
+
+def write_manifest(election_data_dir: Path) -> dict:
+    manifest = generate_manifest(election_data_dir)
+    with open(election_data_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def update(election_data_dir: Path) -> dict:
+    """Rebuild whichever derived files are stale (see build.py); returns the manifest."""
+    # Imported here: build.py is made of this module's writers
+    import build
+
+    build.build(election_data_dir)
+    with open(election_data_dir / "manifest.json") as f:
+        return json.load(f)
+
+
 def main():
     script_dir = Path(__file__).parent
     election_data_dir = script_dir.parent / "election_data"
@@ -150,13 +453,8 @@ def main():
         print(f"Error: election_data directory not found at {election_data_dir}")
         return 1
 
-    manifest = generate_manifest(election_data_dir)
-
-    manifest_path = election_data_dir / "manifest.json"
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-
-    print(f"Manifest written to {manifest_path}")
+    manifest = update(election_data_dir)
+    print(f"Derived files up to date in {election_data_dir}")
     print(f"Years: {manifest['years']}")
     return 0
 
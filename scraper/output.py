@@ -7,9 +7,9 @@ from data import STATE_NAMES
 OFFICES = ["US Senate", "US House", "Governor", "State Senate", "State House"]
 
 
-def render(results, stats, state, year, as_json):
+def render(results, stats, state, year, as_json, office_stats=None):
     if as_json:
-        _json_output(results, stats, state, year)
+        _json_output(results, stats, state, year, office_stats)
     else:
         _text_output(results, stats, state, year)
 
@@ -55,10 +55,17 @@ def _compute_separated_stats(results):
     }
 
 
-def _json_output(results, stats, state, year):
-    separated = _compute_separated_stats(results)
+def _json_output(results, stats, state, year, office_stats=None):
+    json.dump(
+        state_data(results, stats, state, year, office_stats), sys.stdout, indent=2
+    )
+    print()
 
-    data = {
+
+def state_data(results, stats, state, year, office_stats=None):
+    """The state file contents written by --json."""
+    separated = _compute_separated_stats(results)
+    return {
         "state": state,
         "state_name": STATE_NAMES.get(state, state),
         "year": year,
@@ -75,11 +82,33 @@ def _json_output(results, stats, state, year):
             "total_unopposed": separated["primary"]["total_unopposed"],
             "unopposed_by_party": separated["primary"]["unopposed_by_party"],
         },
+        "office_stats": office_stats or {},
         "scraped_at": datetime.now(timezone.utc).isoformat(),
         "unopposed_candidates": [r.to_dict() for r in results],
     }
-    json.dump(data, sys.stdout, indent=2)
-    print()
+
+
+def error_data(state, year, message, **extra):
+    """The error file contents written by --json when a scrape is rejected."""
+    return {
+        "error": True,
+        "message": message,
+        "state": state,
+        "state_name": STATE_NAMES.get(state, state),
+        "year": year,
+        **extra,
+        "scraped_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def result_data(result):
+    """state_data for a StateResult, or error_data if it was rejected."""
+    if result.ok:
+        return state_data(
+            result.races, result.stats, result.state, result.year, result.office_stats
+        )
+    extra = {"anomalies": result.anomalies} if result.anomalies else {}
+    return error_data(result.state, result.year, result.error, **extra)
 
 
 def _text_output(results, stats, state, year):
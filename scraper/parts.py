@@ -0,0 +1,132 @@
+"""
+Per-office scrape results.
+Each (state, year, office) is stored as its own part under election_data/parts/
+so that a failed office keeps its last good data and single offices can be
+rescraped without refetching the whole state.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from data import STATE_NAMES, Race, RaceStats, state_filename
+from output import OFFICES
+
+PARTS_DIRNAME = "parts"
+
+
+def part_dir(parts_dir: Path, state_code: str, year: int) -> Path:
+    return parts_dir / f"{state_filename(state_code)}_{year}"
+
+
+def part_path(parts_dir: Path, state_code: str, year: int, office: str) -> Path:
+    slug = office.lower().replace(" ", "_")
+    return part_dir(parts_dir, state_code, year) / f"{slug}.json"
+
+
+def save_part(
+    parts_dir: Path,
+    state_code: str,
+    year: int,
+    office: str,
+    part,
+    scraped_at=None,
+    contests: list | None = None,
+):
+    """Write one office's (results, stats) pair, replacing any previous part.
+
+    scraped_at defaults to now; pass the fetch time when the page came from elsewhere.
+    contests, when collected (see roster.py), are stored alongside.
+    """
+    results, stats = part
+    path = part_path(parts_dir, state_code, year, office)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "state": state_code,
+        "year": year,
+        "office": office,
+        "scraped_at": scraped_at or datetime.now(timezone.utc).isoformat(),
+        "stats": stats.to_dict(),
+        "races": [r.to_dict() for r in results],
+    }
+    if contests is not None:
+        data["contests"] = contests
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    tmp.replace(path)
+
+
+def load_parts(parts_dir: Path, state_code: str, year: int) -> dict:
+    """Load every stored part for a state-year, keyed by office."""
+    by_office = {}
+    directory = part_dir(parts_dir, state_code, year)
+    if not directory.is_dir():
+        return by_office
+    for filepath in sorted(directory.glob("*.json")):
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        results = [Race(**r) for r in data["races"]]
+        by_office[data["office"]] = (results, RaceStats(**_counters(data["stats"])))
+    return by_office
+
+
+def load_contests(parts_dir: Path, state_code: str, year: int) -> dict[str, list]:
+    """Stored contests per office, for the parts that carry them."""
+    by_office = {}
+    for filepath in sorted(part_dir(parts_dir, state_code, year).glob("*.json")):
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        # Some parts stored contests inside stats, as "roster"
+        contests = data.get("contests", data["stats"].get("roster"))
+        if contests is not None:
+            by_office[data["office"]] = contests
+    return by_office
+
+
+def _counters(stats: dict) -> dict:
+    return {k: v for k, v in stats.items() if k != "roster"}
+
+
+def scraped_times(parts_dir: Path, state_code: str, year: int) -> dict[str, str]:
+    """When each stored part of a state-year was scraped, keyed by office."""
+    times = {}
+    for filepath in sorted(part_dir(parts_dir, state_code, year).glob("*.json")):
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        times[data["office"]] = data["scraped_at"]
+    return times
+
+
+def stored_state_years(parts_dir: Path) -> list[tuple[str, int]]:
+    """Every (state, year) with a part directory, sorted."""
+    codes = {state_filename(code): code for code in STATE_NAMES}
+    found = []
+    for directory in parts_dir.glob("*_*"):
+        name, _, year = directory.name.rpartition("_")
+        if directory.is_dir() and name in codes and year.isdigit():
+            found.append((codes[name], int(year)))
+    return sorted(found)
+
+
+def assemble(stored: dict, fresh: dict) -> dict:
+    """Overlay freshly scraped offices on stored parts, in page order."""
+    by_office = {**stored, **fresh}
+    return {
+        office: by_office[office] for office in sorted(by_office, key=_office_order)
+    }
+
+
+def _office_order(office):
+    if office in OFFICES:
+        return (OFFICES.index(office), office)
+    return (len(OFFICES), office)
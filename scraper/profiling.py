@@ -0,0 +1,127 @@
+"""
+Per-page profiling.
+Each office's fetch and parse runs under cProfile and a stack sampler. Every
+page gets a .prof file and a collapsed-stack .folded file under DIR/pages/, and
+write_report merges all of them into DIR/hotspots.txt (slowest pages plus
+functions ranked by own and cumulative time) and DIR/stacks.folded (for
+flamegraph.pl or speedscope).
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+PAGES_DIRNAME = "pages"
+REPORT_FILENAME = "hotspots.txt"
+STACKS_FILENAME = "stacks.folded"
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.002
+TOP_FUNCTIONS = 40
+
+
+class Profiler:
+    """Profiles each office of one state-year run."""
+
+    def __init__(self, profile_dir: Path, label: str, interval=SAMPLE_INTERVAL):
+        self.pages_dir = profile_dir / PAGES_DIRNAME
+        self.label = label
+        self.interval = interval
+
+    @contextmanager
+    def office(self, office: str):
+        self.pages_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.label}_{office.lower().replace(' ', '_')}"
+        sampler = _Sampler(threading.get_ident(), self.interval)
+        profile = cProfile.Profile()
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            profile.dump_stats(self.pages_dir / f"{stem}.prof")
+            _write_folded(self.pages_dir / f"{stem}.folded", sampler.counts)
+
+
+class _Sampler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+
+def write_report(profile_dir: Path, top=TOP_FUNCTIONS) -> Path | None:
+    """Merge every page profile under profile_dir; returns the report path."""
+    pages_dir = profile_dir / PAGES_DIRNAME
+    prof_files = sorted(pages_dir.glob("*.prof"))
+    if not prof_files:
+        return None
+
+    page_times = []
+    merged = None
+    for path in prof_files:
+        stats = pstats.Stats(str(path))
+        page_times.append((stats.total_tt, path.stem))
+        if merged is None:
+            merged = pstats.Stats(str(path), stream=io.StringIO())
+        else:
+            merged.add(str(path))
+
+    # Skip pstats' per-file header; the slowest-pages table names every page
+    merged.files = []
+    out = io.StringIO()
+    out.write(f"{len(prof_files)} pages, {merged.total_tt:.2f}s profiled\n\n")
+    out.write("Slowest pages\n")
+    for seconds, stem in sorted(page_times, reverse=True)[:top]:
+        out.write(f"  {seconds:8.3f}s  {stem}\n")
+    for title, key in (("own time", "tottime"), ("cumulative time", "cumulative")):
+        out.write(f"\nTop functions by {title}\n")
+        merged.stream = out
+        merged.sort_stats(key).print_stats(top)
+
+    report_path = profile_dir / REPORT_FILENAME
+    report_path.write_text(out.getvalue())
+
+    stacks = Counter()
+    for path in sorted(pages_dir.glob("*.folded")):
+        for line in path.read_text().splitlines():
+            stack, _, count = line.rpartition(" ")
+            stacks[stack] += int(count)
+    _write_folded(profile_dir / STACKS_FILENAME, stacks)
+    return report_path
+
+
+def _write_folded(path: Path, counts: Counter):
+    with open(path, "w") as f:
+        for stack, count in sorted(counts.items()):
+            f.write(f"{stack} {count}\n")
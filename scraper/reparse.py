@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Rebuild election_data/ from the page archive.
+Parses the latest archived copy of every page with the current parser, in
+parallel across cores and without network access, then merges the results like
+a sharded scrape (see batch.py): validated against history, parts and state
+files rewritten, manifest rebuilt once.
+
+    python reparse.py [--archive DIR] [--states TX,CA] [--years 2024 2026] [--jobs N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import archive
+import parts
+from api import ELECTION_DATA_DIR
+from batch import merge
+from data import STATE_NAMES
+from sources.ballotpedia import PARSER_VERSION, _urls
+
+_YEAR_RE = re.compile(r"_(\d{4})$")
+
+
+def plan(archive_dir: Path, states=None, years=None) -> list[tuple]:
+    """(state, year, office, index entry) for the latest copy of each known page."""
+    latest = archive.latest_pages(archive_dir)
+    found_years = {
+        int(m.group(1)) for url in latest if (m := _YEAR_RE.search(_title(url)))
+    }
+    pages = {}
+    for year in sorted(found_years):
+        if years and year not in years:
+            continue
+        for state in states or STATE_NAMES:
+            for office, url in _urls(STATE_NAMES[state], state, year).items():
+                pages[_title(url)] = (state, year, office)
+    # Matched on the page title, so archives fetched from another base URL still work
+    tasks = []
+    for url, entry in latest.items():
+        page = pages.get(_title(url))
+        if page:
+            tasks.append((*page, entry))
+    return sorted(tasks, key=lambda t: t[:3])
+
+
+def reparse(
+    archive_dir: Path,
+    data_dir: Path,
+    states=None,
+    years=None,
+    jobs=None,
+    allow_anomalies=False,
+) -> dict[str, list]:
+    """Reparse archived pages into data_dir; returns merge's report."""
+    tasks = plan(archive_dir, states, years)
+    stale = sum(1 for *_, e in tasks if e.get("parser_version") != PARSER_VERSION)
+    print(
+        f"Reparsing {len(tasks)} pages with parser version {PARSER_VERSION} "
+        f"({stale} were archived with another version)",
+        file=sys.stderr,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        parts_dir = Path(tmp) / parts.PARTS_DIRNAME
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            work = [
+                (archive_dir, state, year, office, entry["sha256"])
+                for state, year, office, entry in tasks
+            ]
+            for (state, year, office, entry), (part, contests) in zip(
+                tasks, pool.map(_parse_page, work, chunksize=4)
+            ):
+                parts.save_part(
+                    parts_dir,
+                    state,
+                    year,
+                    office,
+                    part,
+                    entry["fetched_at"],
+                    contests,
+                )
+        return merge([Path(tmp)], data_dir, allow_anomalies)
+
+
+def _parse_page(task):
+    archive_dir, state, year, office, sha256 = task
+    from sources.ballotpedia import _parse
+
+    # merge writes rosters, so keep the contests
+    contests = []
+    part = _parse(
+        archive.read_page(archive_dir, sha256), office, state, False, contests
+    )
+    return part, contests
+
+
+def _title(url: str) -> str:
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Rebuild election data from archived pages")
+    p.add_argument("--archive", type=Path, default=archive.ARCHIVE_DIR)
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument(
+        "--states",
+        type=lambda s: [c.strip().upper() for c in s.split(",") if c.strip()],
+        help="Comma-separated state codes (default: all)",
+    )
+    p.add_argument("--years", type=int, nargs="+")
+    p.add_argument("--jobs", type=int, default=os.cpu_count())
+    p.add_argument(
+        "--allow-anomalies",
+        action="store_true",
+        help="Write results even if they deviate from the current files",
+    )
+    args = p.parse_args()
+
+    unknown = [s for s in args.states or [] if s not in STATE_NAMES]
+    if unknown:
+        sys.exit(f"Unknown state codes: {', '.join(unknown)}")
+    report = reparse(
+        args.archive,
+        args.data_dir,
+        args.states,
+        args.years,
+        args.jobs,
+        args.allow_anomalies,
+    )
+    print(
+        f"Rebuilt {len(report['written'])} state-years, "
+        f"rejected {len(report['rejected'])}",
+        file=sys.stderr,
+    )
+    for label in report["rejected"]:
+        print(f"  Rejected {label}", file=sys.stderr)
+    return 1 if report["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Per-state-year race roster.
+Every contest the parser saw (office, district, and candidates per party for
+each stage) is stored as election_data/roster/{state}_{year}.json, so state
+files and new metrics can be recomputed offline instead of rescraping.
+
+    python roster.py sizes [--years 2026]    candidates per race, by year
+    python roster.py check                   rebuild state files and compare
+    python roster.py rebuild [--states TX]   rewrite state files from rosters
+
+Contests are only collected when a roster is wanted (--roster, batch merge,
+reparse) and kept in parts alongside the counts. A roster assembled from parts
+without them lacks those offices' contests; it is marked incomplete and never
+used to rebuild.
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from data import (
+    STATE_NAMES,
+    RaceStats,
+    deduplicate,
+    merge_offices,
+    office_stats,
+    state_filename,
+)
+from output import state_data
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+ROSTER_DIRNAME = "roster"
+# Races with at least this many candidates are bucketed together by sizes
+CROWDED = 3
+
+
+def roster_path(roster_dir: Path, state_code: str, year: int) -> Path:
+    return roster_dir / f"{state_filename(state_code)}_{year}.json"
+
+
+def save_roster(
+    roster_dir: Path,
+    state_code: str,
+    year: int,
+    contests: list,
+    scraped_at=None,
+    incomplete: list[str] | None = None,
+):
+    """Write a state-year's contests, replacing any previous roster.
+
+    incomplete lists offices with races whose contests are missing.
+    """
+    path = roster_path(roster_dir, state_code, year)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    head = {
+        "state": state_code,
+        "year": year,
+        "scraped_at": scraped_at or datetime.now(timezone.utc).isoformat(),
+    }
+    if incomplete:
+        head["incomplete"] = incomplete
+    head = json.dumps(head)
+    # One contest per line keeps the file compact and its diffs readable
+    body = ",\n".join(json.dumps(c) for c in contests)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(f'{head[:-1]}, "contests": [\n{body}\n]}}\n')
+    tmp.replace(path)
+
+
+def save_assembled(
+    roster_dir: Path, state_code: str, year: int, by_office: dict, contests: dict
+):
+    """Write the roster of assembled (results, stats) offices, marking any gaps.
+
+    contests maps each office to its contests, as collected by the parser.
+    """
+    incomplete = [
+        office
+        for office, (_, stats) in by_office.items()
+        if stats.total_races and not contests.get(office)
+    ]
+    if incomplete:
+        print(
+            f"  Roster incomplete, no contests stored for {', '.join(incomplete)}",
+            file=sys.stderr,
+        )
+    save_roster(
+        roster_dir,
+        state_code,
+        year,
+        [c for office in by_office for c in contests.get(office, [])],
+        incomplete=incomplete,
+    )
+
+
+def load_roster(roster_dir: Path, state_code: str, year: int) -> dict | None:
+    """A state-year's roster (state, year, scraped_at, contests and, if set,
+    incomplete), or None."""
+    try:
+        with open(roster_path(roster_dir, state_code, year)) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    return data if data.get("contests") else None
+
+
+def stored_rosters(roster_dir: Path) -> list[tuple[str, int]]:
+    """Every (state, year) with a roster, sorted."""
+    codes = {state_filename(code): code for code in STATE_NAMES}
+    found = []
+    for path in roster_dir.glob("*_*.json"):
+        name, _, year = path.stem.rpartition("_")
+        if name in codes and year.isdigit():
+            found.append((codes[name], int(year)))
+    return sorted(found)
+
+
+def derive(state_code: str, contests: list[dict]) -> dict:
+    """Per-office (unopposed races, stats) pairs, as the scraper returns them."""
+    # Imported here so sizes never loads the parser module
+    from sources.ballotpedia import contest_results
+
+    by_office = {}
+    for contest in contests:
+        results, stats = contest_results(state_code, contest)
+        office_results, office_race_stats = by_office.setdefault(
+            contest["office"], ([], RaceStats())
+        )
+        office_results.extend(results)
+        office_race_stats.merge(stats)
+    return by_office
+
+
+def rebuild(roster: dict) -> dict:
+    """The state file contents derived from a roster, as of its scrape."""
+    state, year = roster["state"], roster["year"]
+    by_office = derive(state, roster["contests"])
+    results, stats = merge_offices(by_office)
+    data = state_data(deduplicate(results), stats, state, year, office_stats(by_office))
+    data["scraped_at"] = roster["scraped_at"]
+    return data
+
+
+def contest_sizes(contests: list[dict]) -> dict[str, Counter]:
+    """Races by candidate count per stage; each party primary is its own race.
+
+    A general race with 0 candidates is a seat on the page nobody filed for.
+    """
+    sizes = {"general": Counter(), "primary": Counter()}
+    for contest in contests:
+        general = contest.get("general")
+        if general is not None:
+            count = sum(len(names) for names in general.values())
+            sizes["general"][min(count, CROWDED)] += 1
+        for names in (contest.get("primary") or {}).values():
+            sizes["primary"][min(len(names), CROWDED)] += 1
+    return sizes
+
+
+def missing_offices(roster: dict, stored: dict) -> list[str]:
+    """Offices the roster lacks: marked incomplete, or with races in the state file."""
+    have = {c["office"] for c in roster["contests"]}
+    missing = set(roster.get("incomplete", []))
+    missing.update(
+        office
+        for office, stats in stored.get("office_stats", {}).items()
+        if stats.get("total_races") and office not in have
+    )
+    return sorted(missing)
+
+
+def check(data_dir: Path, rosters) -> list[str]:
+    """State files that differ from what their roster rebuilds to."""
+    roster_dir = data_dir / ROSTER_DIRNAME
+    mismatched = []
+    for state, year in rosters:
+        path = data_dir / f"{state_filename(state)}_{year}.json"
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            mismatched.append(f"{path.name}: unreadable")
+            continue
+        roster = load_roster(roster_dir, state, year)
+        if roster is None:
+            mismatched.append(
+                f"{roster_path(roster_dir, state, year).name}: unreadable"
+            )
+            continue
+        missing = missing_offices(roster, stored)
+        if missing:
+            mismatched.append(f"{path.name}: roster lacks {', '.join(missing)}")
+            continue
+        derived = rebuild(roster)
+        keys = sorted(k for k in derived.keys() | stored.keys() if k != "scraped_at")
+        differing = [k for k in keys if derived.get(k) != stored.get(k)]
+        if differing:
+            mismatched.append(f"{path.name}: {', '.join(differing)} differ")
+    return mismatched
+
+
+def _print_sizes(rosters, roster_dir):
+    by_year = {}
+    for state, year in rosters:
+        sizes = by_year.setdefault(year, {"general": Counter(), "primary": Counter()})
+        roster = load_roster(roster_dir, state, year)
+        for stage, counts in contest_sizes(
+            roster["contests"] if roster else []
+        ).items():
+            sizes[stage].update(counts)
+    labels = [str(n) for n in range(CROWDED)] + [f"{CROWDED}+"]
+    print(f"{'year':<6}{'stage':<9}" + "".join(f"{label:>8}" for label in labels))
+    for year, sizes in sorted(by_year.items()):
+        for stage, counts in sizes.items():
+            row = "".join(f"{counts[n]:>8}" for n in range(CROWDED + 1))
+            print(f"{year:<6}{stage:<9}{row}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Recompute stats from stored rosters")
+    p.add_argument("command", choices=("sizes", "check", "rebuild"))
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument(
+        "--states",
+        type=lambda s: [c.strip().upper() for c in s.split(",") if c.strip()],
+        help="Comma-separated state codes (default: all)",
+    )
+    p.add_argument("--years", type=int, nargs="+")
+    args = p.parse_args()
+
+    roster_dir = args.data_dir / ROSTER_DIRNAME
+    rosters = [
+        (state, year)
+        for state, year in stored_rosters(roster_dir)
+        if (not args.states or state in args.states)
+        and (not args.years or year in args.years)
+    ]
+    if not rosters:
+        print(f"No rosters in {roster_dir}", file=sys.stderr)
+        return 0
+
+    if args.command == "sizes":
+        _print_sizes(rosters, roster_dir)
+        return 0
+    if args.command == "check":
+        mismatched = check(args.data_dir, rosters)
+        for line in mismatched:
+            print(line)
+        print(
+            f"{len(rosters)} rosters, {len(mismatched)} state files differ",
+            file=sys.stderr,
+        )
+        return 1 if mismatched else 0
+
+    import nationwide_stats
+
+    rebuilt = 0
+    for state, year in rosters:
+        roster = load_roster(roster_dir, state, year)
+        if roster is None:
+            print(f"  Skipping unreadable roster for {state} {year}", file=sys.stderr)
+            continue
+        path = args.data_dir / f"{state_filename(state)}_{year}.json"
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            stored = {}
+        missing = missing_offices(roster, stored)
+        if missing:
+            # Rebuilding would silently drop these offices from the state file
+            print(
+                f"  Skipping {state} {year}: roster lacks {', '.join(missing)}",
+                file=sys.stderr,
+            )
+            continue
+        data = rebuild(roster)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        tmp.replace(path)
+        rebuilt += 1
+    if rebuilt:
+        nationwide_stats.update(args.data_dir)
+    print(f"Rebuilt {rebuilt} state files", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
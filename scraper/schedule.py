@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Adaptive rescrape scheduler.
+Decides which (state, office) pages are worth fetching now, from how long ago
+each part was scraped, how often its candidates have changed recently and how
+close the state is to a filing deadline, primary or the general election. Work
+is capped by a daily page budget; every page fetched in the last 24 hours (from
+the fetch log, failures included) counts against it, and pages whose recent
+fetches all failed are backed off. Prints one line per state: STATE<TAB>Office,Office.
+
+    python schedule.py [YEAR] [--budget 300] [--calendar FILE] [--data-dir DIR]
+
+The optional calendar maps year and state to key dates:
+
+    {"2026": {"TX": {"filing_deadline": "2025-12-08", "primary": "2026-03-03"}}}
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import fetch_log
+import parts
+from changes import CHANGES_DIRNAME
+from data import STATE_NAMES
+from sources.ballotpedia import office_names
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+CALENDAR_FILENAME = "calendar.json"
+
+# Pages fetched per rolling 24 hours, across all states and offices
+DAILY_BUDGET = 300
+# Rescrape interval for an office with no recent changes and no nearby dates
+QUIET_INTERVAL = timedelta(days=7)
+# Interval inside a calendar window; the workflow runs hourly
+HOT_INTERVAL = timedelta(hours=3)
+# Changes within this window shorten the interval
+CHANGE_WINDOW = timedelta(days=30)
+# A calendar date is hot from this long before it until DAYS_AFTER after it
+DAYS_BEFORE = timedelta(days=14)
+DAYS_AFTER = timedelta(days=3)
+# Wait after a failed fetch, doubled for each further consecutive failure
+RETRY_AFTER = timedelta(hours=6)
+
+
+@dataclass
+class WorkItem:
+    state: str
+    office: str
+    score: float  # age / interval: due at 1.0, infinite if never scraped
+    reason: str
+
+
+def general_election_day(year: int) -> date:
+    """The Tuesday after the first Monday in November."""
+    first = date(year, 11, 1)
+    first_monday = first + timedelta(days=(7 - first.weekday()) % 7)
+    return first_monday + timedelta(days=1)
+
+
+def load_calendar(path: Path, year: int) -> dict[str, dict[str, date]]:
+    """Key dates per state for a year, or {} if there is no calendar."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    return {
+        state: {name: date.fromisoformat(d) for name, d in dates.items()}
+        for state, dates in data.get(str(year), {}).items()
+    }
+
+
+def last_scraped(parts_dir: Path, year: int) -> dict[tuple[str, str], datetime]:
+    """When each stored (state, office) part was written."""
+    scraped = {}
+    for filepath in parts_dir.glob(f"*_{year}/*.json"):
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        scraped[(data["state"], data["office"])] = datetime.fromisoformat(
+            data["scraped_at"]
+        )
+    return scraped
+
+
+def change_history(changes_dir: Path, year: int) -> dict[tuple[str, str], list]:
+    """Timestamps of change events per (state, office), oldest first."""
+    history = {}
+    try:
+        with open(changes_dir / f"{year}.jsonl") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (event["state"], event["office"])
+                history.setdefault(key, []).append(datetime.fromisoformat(event["at"]))
+    except IOError:
+        pass
+    return history
+
+
+def failures(entries: list[dict]) -> dict[tuple[str, str], tuple[int, datetime]]:
+    """Consecutive failed fetches since the last success, and the latest one's time."""
+    failed = {}
+    for entry in entries:
+        key = (entry["state"], entry["office"])
+        if entry["status"] == fetch_log.OK:
+            failed.pop(key, None)
+        else:
+            count = failed.get(key, (0, None))[0]
+            failed[key] = (count + 1, datetime.fromisoformat(entry["at"]))
+    return failed
+
+
+def retry_at(count: int, last: datetime) -> datetime:
+    """When a page that failed count times in a row may be fetched again."""
+    return last + min(QUIET_INTERVAL, RETRY_AFTER * 2 ** (count - 1))
+
+
+def interval(
+    now: datetime, dates: dict[str, date], changed_at: list[datetime]
+) -> tuple[timedelta, str]:
+    """How often a page should be rescraped right now, and why."""
+    today = now.date()
+    for name, day in sorted(dates.items(), key=lambda kv: kv[1]):
+        if day - DAYS_BEFORE <= today <= day + DAYS_AFTER:
+            return HOT_INTERVAL, f"{name.replace('_', ' ')} {day.isoformat()}"
+    days = len({at.date() for at in changed_at if now - at <= CHANGE_WINDOW})
+    if days:
+        # Each recent day with changes halves the interval, down to the hot interval
+        return max(HOT_INTERVAL, QUIET_INTERVAL / 2**days), f"{days} days with changes"
+    return QUIET_INTERVAL, "quiet"
+
+
+def plan(
+    data_dir: Path,
+    year: int,
+    now: datetime,
+    budget: int = DAILY_BUDGET,
+    calendar: dict[str, dict[str, date]] | None = None,
+) -> tuple[list[WorkItem], int]:
+    """Due pages, most overdue first, capped by what is left of the budget.
+
+    A state with no stored parts is scheduled whole or not at all, since the
+    state file is assembled from parts; it waits while any of its pages is in
+    failure backoff. Other pages in backoff are skipped.
+    Returns the work items and the number of pages already fetched in the last
+    day.
+    """
+    calendar = calendar or {}
+    scraped = last_scraped(data_dir / parts.PARTS_DIRNAME, year)
+    history = change_history(data_dir / CHANGES_DIRNAME, year)
+    fetches = fetch_log.load(data_dir / fetch_log.FETCH_LOG_DIRNAME, year)
+    spent = sum(
+        1
+        for entry in fetches
+        if now - datetime.fromisoformat(entry["at"]) < timedelta(days=1)
+    )
+    backed_off = {
+        key
+        for key, (count, last) in failures(fetches).items()
+        if now < retry_at(count, last)
+    }
+    election_day = general_election_day(year)
+    states_with_parts = {state for state, _ in scraped}
+
+    units = []
+    for state in STATE_NAMES:
+        offices = office_names(state, year)
+        if state not in states_with_parts:
+            # A subset would become the whole state file, so wait for every office
+            if not any((state, o) in backed_off for o in offices):
+                units.append(
+                    [WorkItem(state, o, math.inf, "never scraped") for o in offices]
+                )
+            continue
+        dates = {"general": election_day, **calendar.get(state, {})}
+        for office in offices:
+            key = (state, office)
+            if key in backed_off:
+                continue
+            if key not in scraped:
+                units.append([WorkItem(state, office, math.inf, "never scraped")])
+                continue
+            every, reason = interval(now, dates, history.get(key, []))
+            score = (now - scraped[key]) / every
+            if score >= 1:
+                units.append([WorkItem(state, office, score, reason)])
+    units.sort(key=lambda u: (-u[0].score, u[0].state, u[0].office))
+
+    remaining = budget - spent
+    items = []
+    for unit in units:
+        if len(unit) <= remaining:
+            items.extend(unit)
+            remaining -= len(unit)
+    return items, spent
+
+
+def by_state(items: list[WorkItem]) -> dict[str, list[str]]:
+    """Group work items into one offices list per state, in STATE_NAMES order."""
+    grouped = {}
+    for item in items:
+        grouped.setdefault(item.state, []).append(item.office)
+    return {s: grouped[s] for s in STATE_NAMES if s in grouped}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Choose which pages to rescrape now")
+    p.add_argument("year", nargs="?", type=int, default=datetime.now().year)
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument(
+        "--calendar",
+        type=Path,
+        help=f"Key dates per state (default: DATA_DIR/{CALENDAR_FILENAME})",
+    )
+    p.add_argument("--budget", type=int, default=DAILY_BUDGET)
+    args = p.parse_args()
+
+    calendar = load_calendar(
+        args.calendar or args.data_dir / CALENDAR_FILENAME, args.year
+    )
+    items, spent = plan(
+        args.data_dir, args.year, datetime.now(timezone.utc), args.budget, calendar
+    )
+    for item in items:
+        overdue = "" if math.isinf(item.score) else f"{item.score:.1f}x overdue, "
+        print(f"  {item.state} {item.office}: {overdue}{item.reason}", file=sys.stderr)
+    print(
+        f"Scheduled {len(items)} pages, {spent} already fetched today "
+        f"(budget {args.budget})",
+        file=sys.stderr,
+    )
+    for state, offices in by_state(items).items():
+        print(f"{state}\t{','.join(offices)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-year type-ahead search index over candidate names and districts.
+Tokens are normalized (accents stripped, lowercased, split on anything that is
+not a letter or digit) and grouped into shards by their first SHARD_PREFIX
+characters, so a client fetches only the shard for what has been typed:
+
+    search/{year}/index.json   {"year": 2026, "shards": {"ja": "3f2a9c0d1e4b5a67", ...}}
+    search/{year}/ja.json      {"tokens": ["jane", "janet"],
+                                "postings": [[0, 2], [1]],
+                                "ngrams": {"jan": [0, 1], "ane": [0], ...},
+                                "docs": [[state, office, district, candidate,
+                                          party, unopposed_in], ...]}
+
+`tokens` is sorted, so a typed prefix is a binary search. `postings[i]` lists
+the docs containing `tokens[i]`. `ngrams` maps each trigram to the tokens that
+contain it, for matching misspelt words within the shard when a prefix finds
+nothing (see search(), the reference lookup).
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+SEARCH_DIRNAME = "search"
+SHARD_PREFIX = 2
+NGRAM = 3
+# Share of a misspelt token's trigrams another token must contain to match it
+FUZZY_SHARE = 0.5
+HASH_LENGTH = 16
+DOC_FIELDS = ("state", "office", "district", "candidate", "party", "unopposed_in")
+# Words that would put most of a year's docs under one token
+STOP_TOKENS = {"district", "jr", "sr", "ii", "iii", "iv", "at", "large", "of", "the"}
+_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+
+def tokens(text: str) -> list[str]:
+    """Normalized search tokens of a name or district, in order."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    # O'Rourke and Smith-Jones should match "orourke" and "smithjones" too
+    words = _SPLIT_RE.split(text.lower())
+    joined = _SPLIT_RE.split(re.sub(r"['’-]", "", text.lower()))
+    seen = []
+    for token in words + joined:
+        if token and token not in STOP_TOKENS and token not in seen:
+            seen.append(token)
+    return seen
+
+
+def shard_key(token: str) -> str:
+    return token[:SHARD_PREFIX]
+
+
+def ngrams(token: str) -> set[str]:
+    return {token[i : i + NGRAM] for i in range(len(token) - NGRAM + 1)}
+
+
+def build_year_index(states_data: list[dict]) -> dict[str, dict]:
+    """Shard key -> shard for one year's state files."""
+    docs = []
+    for state_data in sorted(states_data, key=lambda d: d["state"]):
+        for c in state_data.get("unopposed_candidates", []):
+            docs.append([c.get(field, "") for field in DOC_FIELDS])
+
+    by_shard: dict[str, dict[str, set[int]]] = {}
+    for doc_id, doc in enumerate(docs):
+        district, candidate = doc[2], doc[3]
+        for token in tokens(candidate) + tokens(district):
+            by_shard.setdefault(shard_key(token), {}).setdefault(token, set()).add(
+                doc_id
+            )
+    return {key: _shard(postings, docs) for key, postings in by_shard.items()}
+
+
+def _shard(postings: dict[str, set[int]], docs: list[list[str]]) -> dict:
+    """Renumber the docs a shard references so it carries only those."""
+    token_list = sorted(postings)
+    used = sorted(set().union(*postings.values()))
+    local = {doc_id: i for i, doc_id in enumerate(used)}
+    grams: dict[str, list[int]] = {}
+    for i, token in enumerate(token_list):
+        for gram in sorted(ngrams(token)):
+            grams.setdefault(gram, []).append(i)
+    return {
+        "tokens": token_list,
+        "postings": [sorted(local[d] for d in postings[t]) for t in token_list],
+        "ngrams": dict(sorted(grams.items())),
+        "docs": [docs[d] for d in used],
+    }
+
+
+def write_search_index(election_data_dir: Path, data_by_year: dict) -> list[Path]:
+    """Write search/{year}/ shards and index.json; returns the index paths.
+
+    Shards whose key no longer occurs are removed.
+    """
+    paths = []
+    for year, states_data in data_by_year.items():
+        year_dir = election_data_dir / SEARCH_DIRNAME / str(year)
+        year_dir.mkdir(parents=True, exist_ok=True)
+        hashes = {}
+        for key, shard in sorted(build_year_index(states_data).items()):
+            body = json.dumps(shard, separators=(",", ":")).encode()
+            (year_dir / f"{key}.json").write_bytes(body)
+            hashes[key] = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        for stale in year_dir.glob("*.json"):
+            if stale.stem not in hashes and stale.name != "index.json":
+                stale.unlink()
+        index_path = year_dir / "index.json"
+        index_path.write_text(
+            json.dumps({"year": int(year), "shards": hashes}, separators=(",", ":"))
+        )
+        paths.append(index_path)
+    return paths
+
+
+def search(shards: dict[str, dict], query: str) -> list[list[str]]:
+    """Docs matching every query token (reference for the frontend).
+
+    A token matches by prefix; one that prefixes nothing falls back to the
+    tokens of its shard sharing more than FUZZY_SHARE of its trigrams.
+    """
+    results = None
+    for token in tokens(query):
+        # A token shorter than the shard key can match in several shards
+        keys = [k for k in shards if k.startswith(token)]
+        if len(token) >= SHARD_PREFIX:
+            keys = [shard_key(token)] if shard_key(token) in shards else []
+        hits = [(shards[k], _prefixed(shards[k]["tokens"], token)) for k in keys]
+        if not any(found for _, found in hits):
+            hits = [(shards[k], _similar(shards[k], token)) for k in keys]
+        matched = {
+            tuple(shard["docs"][d])
+            for shard, found in hits
+            for i in found
+            for d in shard["postings"][i]
+        }
+        results = matched if results is None else results & matched
+    return sorted(list(doc) for doc in results or ())
+
+
+def _prefixed(token_list: list[str], prefix: str) -> range:
+    """Indexes of the sorted tokens starting with prefix."""
+    start = bisect_left(token_list, prefix)
+    # Tokens are [a-z0-9], so "{" sorts after every continuation of prefix
+    return range(start, bisect_left(token_list, prefix + "{", start))
+
+
+def _similar(shard: dict, token: str) -> list[int]:
+    grams = ngrams(token)
+    shared: dict[int, int] = {}
+    for gram in grams:
+        for i in shard["ngrams"].get(gram, []):
+            shared[i] = shared.get(i, 0) + 1
+    return sorted(i for i, n in shared.items() if n > FUZZY_SHARE * len(grams))
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Read-only query service over election_data/.
+Loads every state-year file once into an indexed in-memory store and answers
+filtered queries over HTTP, with gzip and ETag support. Files are re-read only
+when their mtime changes.
+
+    python serve.py [--host 127.0.0.1] [--port 8000] [--data-dir DIR]
+
+    GET /candidates?state=TX&year=2026&office=US+House&party=Democrat&stage=Primary
+    GET /states?state=TX&year=2026
+    GET /health
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from data import STATE_NAMES
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+# Minimum seconds between mtime scans of the data directory
+RELOAD_INTERVAL = 1.0
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+FILTERS = ("state", "year", "office", "party", "stage")
+# State summaries are per state-year, so only those two filters apply to them
+FILTERS_BY_PATH = {"/candidates": FILTERS, "/states": ("state", "year")}
+STAGES = ("Primary", "General")
+_FILENAME_RE = re.compile(r"^([a-z_]+)_(\d{4})\.json$")
+_CODES_BY_FILENAME = {
+    name.lower().replace(" ", "_"): code for code, name in STATE_NAMES.items()
+}
+
+
+@dataclass
+class _StateFile:
+    mtime_ns: int
+    year: int
+    state: str
+    summary: dict
+    candidates: list[dict]
+
+
+@dataclass
+class _Snapshot:
+    """Immutable view of the store; replaced wholesale when files change."""
+
+    generation: int = 0
+    candidates: list[dict] = field(default_factory=list)
+    states: list[dict] = field(default_factory=list)
+    # (filter name, value) -> ascending candidate ids
+    index: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+
+
+class Store:
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self._files: dict[Path, _StateFile] = {}
+        self._snapshot = _Snapshot()
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._responses: dict[tuple, tuple[bytes, str]] = {}
+        self.refresh(force=True)
+
+    def refresh(self, force=False) -> bool:
+        """Re-read files whose mtime changed; returns True if anything changed."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_INTERVAL:
+            return False
+        with self._lock:
+            self._checked_at = now
+            seen = set()
+            changed = False
+            for path in self.data_dir.glob("*.json"):
+                match = _FILENAME_RE.match(path.name)
+                if not match or match.group(1) not in _CODES_BY_FILENAME:
+                    continue
+                seen.add(path)
+                mtime_ns = path.stat().st_mtime_ns
+                cached = self._files.get(path)
+                if cached and cached.mtime_ns == mtime_ns:
+                    continue
+                loaded = _load(path, mtime_ns, match)
+                if loaded is None:
+                    changed |= self._files.pop(path, None) is not None
+                else:
+                    self._files[path] = loaded
+                    changed = True
+            for path in set(self._files) - seen:
+                del self._files[path]
+                changed = True
+            if changed:
+                self._rebuild()
+            return changed
+
+    def snapshot(self) -> _Snapshot:
+        self.refresh()
+        return self._snapshot
+
+    def query(self, params: dict[str, str]) -> tuple[bytes, str]:
+        """JSON body and ETag for a query, cached until the data changes."""
+        snapshot = self.snapshot()
+        path = params.pop("_path")
+        key = (snapshot.generation, path, tuple(sorted(params.items())))
+        cached = self._responses.get(key)
+        if cached:
+            return cached
+        if path == "/states":
+            result = [
+                s for s in snapshot.states if _matches(s, params, FILTERS_BY_PATH[path])
+            ]
+        else:
+            result = [snapshot.candidates[i] for i in _select(snapshot, params)]
+        body = json.dumps(result, separators=(",", ":")).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if len(self._responses) > 1024:
+            self._responses.clear()
+        self._responses[key] = (body, etag)
+        return body, etag
+
+    def _rebuild(self):
+        candidates = []
+        states = []
+        index: dict[tuple[str, str], list[int]] = {}
+        for state_file in sorted(self._files.values(), key=lambda f: (f.year, f.state)):
+            states.append(state_file.summary)
+            for c in state_file.candidates:
+                i = len(candidates)
+                candidates.append(c)
+                keys = [
+                    ("state", state_file.state),
+                    ("year", str(state_file.year)),
+                    ("office", c.get("office", "")),
+                    ("party", c.get("party", "")),
+                ]
+                keys += [("stage", s) for s in STAGES if s in c.get("unopposed_in", "")]
+                for k in keys:
+                    index.setdefault((k[0], k[1].lower()), []).append(i)
+        self._snapshot = _Snapshot(
+            self._snapshot.generation + 1, candidates, states, index
+        )
+
+
+def _load(path: Path, mtime_ns: int, match) -> _StateFile | None:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    if "error" in data:
+        return None
+    candidates = data.get("unopposed_candidates", [])
+    summary = {k: v for k, v in data.items() if k != "unopposed_candidates"}
+    return _StateFile(
+        mtime_ns,
+        int(match.group(2)),
+        _CODES_BY_FILENAME[match.group(1)],
+        summary,
+        candidates,
+    )
+
+
+def _select(snapshot: _Snapshot, params: dict[str, str]) -> list[int]:
+    """Intersect the index postings of every filter, smallest first."""
+    postings = [
+        snapshot.index.get((name, params[name].lower()), [])
+        for name in FILTERS
+        if name in params
+    ]
+    if not postings:
+        return list(range(len(snapshot.candidates)))
+    postings.sort(key=len)
+    selected = set(postings[0])
+    for p in postings[1:]:
+        selected.intersection_update(p)
+    return sorted(selected)
+
+
+def _matches(summary: dict, params: dict[str, str], names) -> bool:
+    return all(
+        str(summary.get(name, "")).lower() == params[name].lower()
+        for name in names
+        if name in params
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    store: Store
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._send(200, b'{"ok":true}', None)
+            return
+        if url.path not in FILTERS_BY_PATH:
+            self._send(404, b'{"error":"not found"}', None)
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        unknown = set(params) - set(FILTERS_BY_PATH[url.path])
+        if unknown:
+            message = {
+                "error": f"unsupported filters for {url.path}: "
+                + ", ".join(sorted(unknown))
+            }
+            self._send(400, json.dumps(message).encode(), None)
+            return
+        body, etag = self.store.query({**params, "_path": url.path})
+        if etag in self.headers.get("If-None-Match", ""):
+            self._send(304, b"", etag)
+            return
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag):
+        gzipped = len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(data_dir: Path, host="127.0.0.1", port=8000) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"store": Store(data_dir)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Serve election_data/ queries over HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    args = p.parse_args()
+
+    server = make_server(args.data_dir, args.host, args.port)
+    snapshot = server.RequestHandlerClass.store.snapshot()
+    print(
+        f"Serving {len(snapshot.candidates)} candidates from {len(snapshot.states)} "
+        f"state files on http://{args.host}:{server.server_port}",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
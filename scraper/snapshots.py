@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Pre-render static HTML snapshots of the site from election_data/.
+Writes one page per year with the summary tables and state cards already filled
+in, and with --states one page per state-year listing its candidates. --inject
+puts the default year's snapshot into the built index.html, so the first paint
+needs no data fetches; the app replaces it once its own data has loaded.
+
+    python snapshots.py [--out DIR] [--states] [--inject dist/index.html]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime
+from html import escape
+from pathlib import Path
+
+from data import STATE_NAMES, state_filename
+from nationwide_stats import build_summary_index, load_state_data, party_abbrev
+
+ELECTION_DATA_DIR = Path(__file__).parent.parent / "election_data"
+SNAPSHOT_DIRNAME = "snapshots"
+OFFICE_PRIORITY = ["US Senate", "US House", "Governor", "State Senate", "State House"]
+# Marks the element main.ts swaps out for the mounted app
+APP_PLACEHOLDER = '<div id="app"></div>'
+_ACTIVE = ' class="active"'
+
+# The app's styles are scoped to its components, so snapshots carry their own
+SNAPSHOT_CSS = """
+.snapshot{max-width:1200px;margin:0 auto;padding:2rem 1rem;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,'Helvetica Neue',Arial,sans-serif;color:#1a1a1a;line-height:1.5}
+.snapshot header{text-align:center;margin-bottom:2rem}
+.snapshot h1{font-size:2.5rem;margin:0 0 .5rem}
+.snapshot .subtitle,.snapshot .muted{color:#666}
+.snapshot nav{display:flex;justify-content:center;flex-wrap:wrap;gap:.5rem;margin-bottom:2rem}
+.snapshot nav a{padding:.5rem 1rem;border:2px solid #e0e0e0;border-radius:8px;color:inherit;font-weight:600;text-decoration:none}
+.snapshot nav a.active{background:#1a1a1a;color:#fff;border-color:#1a1a1a}
+.snapshot .summary{display:flex;flex-wrap:wrap;gap:2rem;background:#fff;border-radius:12px;padding:1.5rem;margin-bottom:2rem}
+.snapshot .summary section{flex:1;min-width:280px}
+.snapshot h2,.snapshot h3{font-size:.85rem;color:#666;text-transform:uppercase;letter-spacing:.05em;margin:0 0 .5rem}
+.snapshot .big{font-size:3rem;font-weight:700;line-height:1}
+.snapshot .of{color:#999;font-weight:400}
+.snapshot .states{display:grid;grid-template-columns:repeat(auto-fill,minmax(280px,1fr));gap:1rem}
+.snapshot .state{background:#fff;border-radius:8px;padding:1rem}
+.snapshot .state a{color:inherit;font-weight:700;text-decoration:none}
+.snapshot table{width:100%;border-collapse:collapse;font-size:.9rem;margin-bottom:1.5rem}
+.snapshot th,.snapshot td{padding:.5rem;text-align:left;border-bottom:1px solid #f0f0f0}
+"""
+
+
+def default_year(years: list[int], today: date | None = None) -> int:
+    """The year the app selects on load: the current one, else the latest."""
+    current = (today or date.today()).year
+    return current if current in years or not years else max(years)
+
+
+def render_year(
+    summary: dict, years: list[int], link_prefix: str = "", state_pages: bool = False
+) -> str:
+    """Fragment with the year's nationwide summary and one card per state.
+
+    Cards link to the state-year pages when state_pages is set.
+    """
+    year = summary["year"]
+    nav = "".join(
+        f'<a href="{link_prefix}{y}.html"{_ACTIVE if y == year else ""}>{y}</a>'
+        for y in sorted(years, reverse=True)
+    )
+    nationwide = summary["nationwide"]
+    cards = [
+        _state_card(
+            code,
+            s,
+            f"{link_prefix}{year}/{state_filename(code)}.html" if state_pages else None,
+        )
+        for code, s in _ordered(summary["states"])
+        if s["total_races"] > 0
+    ]
+    if not cards:
+        cards = [f'<p class="muted">No election data available for {year}.</p>']
+    return _fragment(
+        f"<nav>{nav}</nav>"
+        '<div class="summary">'
+        f"<section><h2>General Election</h2>{_general(nationwide['display'], 'big')}"
+        "</section>"
+        f"<section><h2>Primary Elections</h2>{_primary(nationwide['display'], 'big')}"
+        "</section></div>"
+        f'<div class="states">{"".join(cards)}</div>'
+    )
+
+
+def render_state(state_data: dict) -> str:
+    """Fragment listing a state-year's unopposed candidates by office."""
+    code = state_data["state"]
+    year = state_data["year"]
+    by_office: dict[str, list[dict]] = {}
+    for c in state_data.get("unopposed_candidates", []):
+        by_office.setdefault(c["office"], []).append(c)
+    tables = []
+    for office in sorted(by_office, key=_office_rank):
+        rows = "".join(
+            f"<tr><td>{escape(c['district'])}</td><td>{escape(c['candidate'])}</td>"
+            f"<td>{party_abbrev(c['party'])}</td><td>{escape(c['unopposed_in'])}</td>"
+            "</tr>"
+            for c in by_office[office]
+        )
+        tables.append(
+            f"<h3>{escape(office)}</h3><table><thead><tr><th>District</th>"
+            "<th>Candidate</th><th>Party</th><th>Unopposed In</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>"
+        )
+    scraped = _format_date(state_data.get("scraped_at"))
+    return _fragment(
+        f'<nav><a href="../{year}.html">All states, {year}</a></nav>'
+        f"<h2>{escape(STATE_NAMES[code])} ({code}), {year}</h2>"
+        + (f'<p class="muted">As of {scraped}</p>' if scraped else "")
+        + ("".join(tables) or '<p class="muted">No unopposed candidates.</p>')
+    )
+
+
+def page(title: str, fragment: str) -> str:
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="UTF-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">'
+        f"<title>{escape(title)}</title><style>{SNAPSHOT_CSS.strip()}</style></head>"
+        f'<body style="margin:0;background:#f8f9fa">{fragment}</body></html>\n'
+    )
+
+
+def write_snapshots(
+    election_data_dir: Path, out_dir: Path, states: bool = False
+) -> dict[int, dict]:
+    """Write {year}.html (and {year}/{state}.html) pages; returns year summaries."""
+    data_by_year = load_state_data(election_data_dir)
+    years = sorted(int(y) for y in data_by_year)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summaries = {}
+    for year_key, states_data in data_by_year.items():
+        year = int(year_key)
+        summaries[year] = build_summary_index(year_key, states_data)
+        title = f"Unopposed | {year} Elections"
+        (out_dir / f"{year}.html").write_text(
+            page(title, render_year(summaries[year], years, state_pages=states))
+        )
+        if not states:
+            continue
+        (out_dir / str(year)).mkdir(exist_ok=True)
+        for state_data in states_data:
+            name = f"{state_filename(state_data['state'])}.html"
+            title = f"Unopposed | {state_data['state_name']} {year}"
+            (out_dir / str(year) / name).write_text(
+                page(title, render_state(state_data))
+            )
+    return summaries
+
+
+def inject(index_path: Path, fragment: str):
+    """Fill the app container of a built index.html with a snapshot fragment."""
+    html = index_path.read_text()
+    if APP_PLACEHOLDER not in html:
+        raise ValueError(f"{index_path} has no empty {APP_PLACEHOLDER}")
+    index_path.write_text(
+        html.replace(
+            APP_PLACEHOLDER,
+            f'<div id="app"><style>{SNAPSHOT_CSS.strip()}</style>{fragment}</div>',
+            1,
+        )
+    )
+
+
+def _fragment(body: str) -> str:
+    return (
+        '<div class="snapshot" data-snapshot>'
+        "<header><h1>Unopposed</h1>"
+        '<p class="subtitle">Tracking elections where voters have no choice</p>'
+        f"</header>{body}</div>"
+    )
+
+
+def _general(display: dict, size: str) -> str:
+    general = display["general"]
+    return _tally(general["total_unopposed"], general["total_races"], size) + _parties(
+        general["by_party"], {}
+    )
+
+
+def _primary(display: dict, size: str) -> str:
+    primary = display["primary"]
+    return _tally(primary["total_unopposed"], primary["total_races"], size) + _parties(
+        primary["by_party"], primary["total_by_party"]
+    )
+
+
+def _tally(unopposed: int, races: int, size: str) -> str:
+    share = f" ({unopposed / races * 100:.1f}%)" if races else ""
+    cls = f' class="{size}"' if size else ""
+    return (
+        f'<div><span{cls}>{unopposed}<span class="of">/{races}</span></span>'
+        f'<span class="muted"> unopposed{share}</span></div>'
+    )
+
+
+def _parties(by_party: list[list], totals: dict[str, int]) -> str:
+    items = [
+        f"{abbrev}:{count}" + (f"/{totals[abbrev]}" if totals.get(abbrev) else "")
+        for abbrev, count in by_party
+    ]
+    return f'<p class="muted">{" ".join(items)}</p>' if items else ""
+
+
+def _state_card(code: str, summary: dict, href: str | None) -> str:
+    label = f'<a href="{href}">{code}</a>' if href else f"<b>{code}</b>"
+    return (
+        f'<article class="state">{label} '
+        f'<span class="muted">{escape(STATE_NAMES[code])}</span>'
+        f"<h3>General</h3>{_general(summary['display'], '')}"
+        f"<h3>Primary</h3>{_primary(summary['display'], '')}</article>"
+    )
+
+
+def _ordered(states: dict[str, dict]):
+    """States in the app's card order (the order of STATE_NAMES)."""
+    return [(code, states[code]) for code in STATE_NAMES if code in states]
+
+
+def _office_rank(office: str) -> int:
+    return (
+        OFFICE_PRIORITY.index(office)
+        if office in OFFICE_PRIORITY
+        else len(OFFICE_PRIORITY)
+    )
+
+
+def _format_date(iso: str | None) -> str:
+    if not iso:
+        return ""
+    try:
+        d = datetime.fromisoformat(iso)
+    except ValueError:
+        return ""
+    return f"{d:%b} {d.day}, {d.year}"
+
+
+def main():
+    p = argparse.ArgumentParser(description="Render static HTML snapshots")
+    p.add_argument("--data-dir", type=Path, default=ELECTION_DATA_DIR)
+    p.add_argument("--out", type=Path, help="Default: DATA_DIR/snapshots")
+    p.add_argument("--states", action="store_true", help="Also render state-years")
+    p.add_argument(
+        "--inject",
+        type=Path,
+        metavar="INDEX_HTML",
+        help="Put the default year's snapshot into this built index.html",
+    )
+    args = p.parse_args()
+
+    out_dir = args.out or args.data_dir / SNAPSHOT_DIRNAME
+    summaries = write_snapshots(args.data_dir, out_dir, args.states)
+    print(f"Snapshots for {sorted(summaries)} written to {out_dir}", file=sys.stderr)
+    if args.inject and summaries:
+        year = default_year(list(summaries))
+        # Links in the injected snapshot are relative to index.html
+        prefix = Path(os.path.relpath(out_dir, args.inject.parent)).as_posix() + "/"
+        fragment = render_year(summaries[year], list(summaries), prefix, args.states)
+        inject(args.inject, fragment)
+        print(f"Injected the {year} snapshot into {args.inject}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
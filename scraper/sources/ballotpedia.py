@@ -1,108 +1,310 @@
+import os
 import re
 import sys
-import requests
-from bs4 import BeautifulSoup
+import time
+import tracemalloc
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+
 from data import (
     Race,
     RaceStats,
     STATE_NAMES,
     LOWER_CHAMBERS,
     UPPER_CHAMBERS,
+    merge_offices,
     normalize_party,
 )
 
-BASE = "https://ballotpedia.org"
+BASE = os.environ.get("BALLOTPEDIA_BASE_URL", "https://ballotpedia.org").rstrip("/")
+# Bump whenever a change to the parsing code can change results for the same page
+PARSER_VERSION = 1
+API_PATH = "/wiki/api.php"
 UA = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
+TIMEOUT = 20
+# Attempts per page for throttling (429/503) and network errors
+MAX_ATTEMPTS = 3
+# Longest Retry-After we honor; longer waits count as a failed page
+MAX_RETRY_AFTER = 60
+RETRY_BACKOFF = 0.5
+
 _DISTRICT_RE = re.compile(r"District\s+(\d+)", re.I)
 _CANCELED_RE = re.compile(r"primary\s+was\s+canceled", re.I)
 _NAME_CLEAN_RE = re.compile(r"[\s*]+$|\s*\(i\)")
 _PARTY_IN_TEXT_RE = re.compile(r"\((\w+(?:\s+\w+)?)\s+Party\)")
+_PARSER_OUTPUT_RE = re.compile(
+    r'^\s*<div class="mw-parser-output">(.*)</div>\s*$', re.S
+)
+# Top-level sections whose heading contains one of these hold the candidate lists
+_API_SECTION_KEYWORDS = ("candidate", "result")
 
 
 def scrape(state_code, year):
+    return merge_offices(scrape_offices(state_code, year))
+
+
+def scrape_offices(
+    state_code,
+    year,
+    offices=None,
+    low_memory=False,
+    memory_report=False,
+    fetch=None,
+    base=None,
+    profiler=None,
+    contests=None,
+):
+    """Scrape each office page separately, keyed by office name.
+
+    Offices whose page could not be fetched are absent from the result. fetch,
+    if given, replaces the HTTP client: it takes a URL and returns HTML or None.
+    base overrides BASE, e.g. to point at mock_server.py. profiler, if given,
+    maps an office to a context manager wrapped around its fetch and parse.
+    contests, if given, is a dict that receives each parsed office's contests
+    (see roster.py); they are not kept otherwise.
+    """
     state = STATE_NAMES.get(state_code)
     if not state:
-        return [], RaceStats()
-    session = requests.Session()
-    session.headers["User-Agent"] = UA
-    results = []
-    stats = RaceStats()
-    for office, url in _urls(state, state_code, year).items():
+        return {}
+    if fetch is None:
+        fetch = session_fetcher()
+    by_office = {}
+    for office, url in _urls(state, state_code, year, base).items():
+        if offices is not None and office not in offices:
+            continue
         print(f"  Fetching {office} from Ballotpedia...", file=sys.stderr)
-        html = _fetch(session, url)
-        if html:
-            unopposed, office_stats = _parse(html, office, state_code)
-            results.extend(unopposed)
-            stats.merge(office_stats)
-    return results, stats
+        with profiler(office) if profiler else nullcontext():
+            html = fetch(url)
+            if not html:
+                continue
+            found = [] if contests is not None else None
+            if memory_report:
+                by_office[office] = _parse_measured(
+                    html, office, state_code, low_memory, found
+                )
+            else:
+                by_office[office] = _parse(html, office, state_code, low_memory, found)
+            if contests is not None:
+                contests[office] = found
+    return by_office
+
+
+def office_names(state_code, year):
+    """Offices that have a Ballotpedia page for this state, in page order."""
+    state = STATE_NAMES.get(state_code)
+    return list(_urls(state, state_code, year)) if state else []
 
 
-def _urls(state, sc, year):
+def _urls(state, sc, year, base=None):
+    root = (base or BASE).rstrip("/")
     s = state.replace(" ", "_")
     urls = {
-        "US Senate": f"{BASE}/United_States_Senate_election_in_{s},_{year}",
-        "US House": f"{BASE}/United_States_House_of_Representatives_elections_in_{s},_{year}",
-        "Governor": f"{BASE}/{s}_gubernatorial_election,_{year}",
+        "US Senate": f"{root}/United_States_Senate_election_in_{s},_{year}",
+        "US House": f"{root}/United_States_House_of_Representatives_elections_in_{s},_{year}",
+        "Governor": f"{root}/{s}_gubernatorial_election,_{year}",
     }
     if sc not in UPPER_CHAMBERS:
-        urls["State Senate"] = f"{BASE}/{s}_State_Senate_elections,_{year}"
+        urls["State Senate"] = f"{root}/{s}_State_Senate_elections,_{year}"
     lower = LOWER_CHAMBERS.get(sc, "House_of_Representatives")
     if lower:
-        urls["State House"] = f"{BASE}/{s}_{lower}_elections,_{year}"
+        urls["State House"] = f"{root}/{s}_{lower}_elections,_{year}"
     return urls
 
 
-def _fetch(session, url):
+def session_fetcher(session=None):
+    """A fetch function backed by one requests session (a new one by default)."""
+    if session is None:
+        import requests  # deferred so importing this module stays cheap
+
+        session = requests.Session()
+        session.headers["User-Agent"] = UA
+    return lambda url: _fetch(session, url)
+
+
+def api_fetcher(session=None):
+    """A fetch function that asks the MediaWiki parse API for candidate sections only.
+
+    Falls back to the full page when the API fails or finds no such sections.
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        session.headers["User-Agent"] = UA
+    return lambda url: _fetch_api(session, url)
+
+
+def _fetch_api(session, url):
+    import requests
+
+    parts = urlsplit(url)
+    api = f"{parts.scheme}://{parts.netloc}{API_PATH}"
+    title = unquote(parts.path.rsplit("/", 1)[-1])
     try:
-        r = session.get(url, timeout=20)
+        sections = _api_parse(session, api, title, prop="sections")["sections"]
+        wanted = [
+            s["index"]
+            for s in sections
+            if s.get("toclevel") == 1
+            and any(k in s["line"].lower() for k in _API_SECTION_KEYWORDS)
+        ]
+        if not wanted:
+            print("    No candidate sections, fetching full page", file=sys.stderr)
+            return _fetch(session, url)
+        texts = [
+            _api_parse(session, api, title, prop="text", section=i)["text"]
+            for i in wanted
+        ]
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        print(f"    Parse API unavailable ({e}), fetching full page", file=sys.stderr)
+        return _fetch(session, url)
+    # Each section comes wrapped in its own container; the parser expects one
+    body = "".join(
+        m.group(1) if (m := _PARSER_OUTPUT_RE.match(t)) else t for t in texts
+    )
+    return f'<html><body><div class="mw-parser-output">{body}</div></body></html>'
+
+
+def _api_parse(session, api, title, **params):
+    r = session.get(
+        api,
+        params={
+            "action": "parse",
+            "page": title,
+            "format": "json",
+            "formatversion": 2,
+            "redirects": 1,
+            "disableeditsection": 1,
+            "disablelimitreport": 1,
+            **params,
+        },
+        timeout=TIMEOUT,
+    )
+    r.raise_for_status()
+    data = r.json()
+    if "error" in data:
+        raise ValueError(data["error"].get("info", "API error"))
+    return data["parse"]
+
+
+def _fetch(session, url):
+    """GET a page, retrying throttled responses and network errors.
+
+    429 and 503 responses wait for their Retry-After (capped at MAX_RETRY_AFTER),
+    other failures back off exponentially. Returns None once attempts run out.
+    """
+    import requests
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        last = attempt == MAX_ATTEMPTS
+        try:
+            r = session.get(url, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            print(f"    Network error: {e}", file=sys.stderr)
+            if last:
+                return None
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            continue
         if r.status_code == 200:
             return r.text
+        if r.status_code in (429, 503):
+            delay = _retry_after(r.headers.get("Retry-After"), attempt)
+            if last or delay > MAX_RETRY_AFTER:
+                print(f"    {r.status_code}, giving up", file=sys.stderr)
+                return None
+            print(f"    {r.status_code}, retrying in {delay:g}s", file=sys.stderr)
+            time.sleep(delay)
+            continue
         print(
             f"    {r.status_code} (may not be an election year for this office)",
             file=sys.stderr,
         )
         return None
-    except requests.RequestException as e:
-        print(f"    Network error: {e}", file=sys.stderr)
-        return None
+    return None
 
 
-def _parse(html, office, state_code):
+def _retry_after(value, attempt):
+    """Seconds to wait from a Retry-After header (seconds or HTTP date)."""
+    if value:
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            pass
+        else:
+            return max(0.0, when.timestamp() - time.time())
+    return RETRY_BACKOFF * 2 ** (attempt - 1)
+
+
+def _parse(html, office, state_code, low_memory=False, contests=None):
+    """Parse one office page into (unopposed races, stats).
+
+    With low_memory, everything outside the article body is dropped up front and
+    each table and district section is freed as soon as it has been processed.
+    Each contest seen is appended to contests, if given.
+    """
+    from bs4 import BeautifulSoup  # deferred until there is a page to parse
+
     soup = BeautifulSoup(html, "lxml")
     for tag in soup(["script", "style"]):
         tag.decompose()
     content = soup.find("div", class_="mw-parser-output") or soup
-    results = []
-    stats = RaceStats()
-    table_results, table_stats = _parse_partisan_tables(content, office, state_code)
-    results.extend(table_results)
-    stats.merge(table_stats)
+    if low_memory and content is not soup:
+        content = content.extract()
+        soup.decompose()
+        soup = content
+    results, stats = _parse_partisan_tables(
+        content, office, state_code, low_memory, contests
+    )
     section_results, section_stats = _parse_district_sections(
-        content, office, state_code
+        content, office, state_code, low_memory, contests
     )
     results.extend(section_results)
     stats.merge(section_stats)
+    if low_memory:
+        # Soup trees are reference cycles; break them now instead of at the next GC
+        soup.decompose()
     return results, stats
 
 
+def _parse_measured(html, office, state_code, low_memory, contests=None):
+    """_parse, reporting the page size and peak memory allocated while parsing."""
+    tracemalloc.start()
+    try:
+        result = _parse(html, office, state_code, low_memory, contests)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(
+        f"    Parsed {len(html) / 2**20:.1f} MiB page, peak {peak / 2**20:.1f} MiB",
+        file=sys.stderr,
+    )
+    return result
+
+
 # --- Strategy 1: candidateListTablePartisan tables (state legislature pages) ---
 
 
-def _parse_partisan_tables(content, office, state_code):
+def _parse_partisan_tables(content, office, state_code, free=False, contests=None):
     results = []
     stats = RaceStats()
     for table in content.find_all("table", class_="candidateListTablePartisan"):
-        table_results, table_stats = _process_table(table, office, state_code)
+        table_results, table_stats = _process_table(table, office, state_code, contests)
         results.extend(table_results)
         stats.merge(table_stats)
+        if free:
+            table.decompose()
     return results, stats
 
 
-def _process_table(table, office, state_code):
+def _process_table(table, office, state_code, contests=None):
     rows = table.find_all("tr")
     header_idx, party_cols = _find_header_row(rows)
     if header_idx is None or not party_cols:
@@ -122,7 +324,14 @@ def _process_table(table, office, state_code):
         if not district:
             continue
         row_results, row_stats = _analyze_table_row(
-            cells, party_cols, district, office, state_code, is_general, is_primary
+            cells,
+            party_cols,
+            district,
+            office,
+            state_code,
+            is_general,
+            is_primary,
+            contests,
         )
         results.extend(row_results)
         stats.merge(row_stats)
@@ -151,10 +360,8 @@ def _find_header_row(rows):
 
 
 def _analyze_table_row(
-    cells, party_cols, district, office, state_code, is_general, is_primary
+    cells, party_cols, district, office, state_code, is_general, is_primary, contests
 ):
-    results = []
-    stats = RaceStats()
     candidates_by_party = {}
 
     for party, col_idx in party_cols.items():
@@ -168,27 +375,16 @@ def _analyze_table_row(
         if names:
             candidates_by_party[party] = names
 
-    all_candidates = [(n, p) for p, ns in candidates_by_party.items() for n in ns]
-
+    contest = {"office": office, "district": district, "layout": "table"}
     if is_general:
-        stats.add_race(list(candidates_by_party.keys()) if candidates_by_party else [])
-        stats.add_general_race()
-        if len(all_candidates) == 1:
-            name, party = all_candidates[0]
-            results.append(
-                _new_race(state_code, office, district, name, party, "General")
-            )
-
+        contest["general"] = candidates_by_party
     if is_primary:
-        stats.add_parties(list(candidates_by_party.keys()))
-        for party in candidates_by_party.keys():
-            stats.add_primary_race(party)
-        for party, names in candidates_by_party.items():
-            if len(names) == 1:
-                results.append(
-                    _new_race(state_code, office, district, names[0], party, "Primary")
-                )
-    return results, stats
+        contest["primary"] = candidates_by_party
+    if len(contest) == 3:
+        return [], RaceStats()
+    if contests is not None:
+        contests.append(contest)
+    return contest_results(state_code, contest)
 
 
 def _extract_names_from_cell(cell):
@@ -223,22 +419,18 @@ def _extract_names_from_cell(cell):
 # --- Strategy 2: heading-based district sections (US House/Senate/Gov pages) ---
 
 
-def _parse_district_sections(content, office, state_code):
+def _parse_district_sections(content, office, state_code, free=False, contests=None):
     results = []
     stats = RaceStats()
-    sections = _collect_district_sections(content, office)
 
-    for district, elements in sections:
+    for district, nodes in _indexed_sections(content, office, free):
         general_candidates = []
         primary_candidates_by_party = {}
         current_section = None
 
-        for elem in elements:
-            text = elem.get_text(" ", strip=True)
-            lower_text = text.lower()
-
-            if elem.name in ("h4", "p"):
-                new_section = _detect_section(elem, lower_text, text)
+        for node in nodes:
+            if node.tag in ("h4", "p"):
+                new_section = _detect_section(node.tag, node.text.lower(), node.text)
                 if new_section is not None:
                     current_section = new_section
                     continue
@@ -246,62 +438,42 @@ def _parse_district_sections(content, office, state_code):
             if current_section in ("skip", "minor", None):
                 continue
 
-            if elem.name == "ul":
+            if node.tag == "ul":
                 _collect_ul_candidates(
-                    elem,
+                    node,
                     current_section,
                     general_candidates,
                     primary_candidates_by_party,
                 )
-            elif elem.name == "div" and "votebox" in " ".join(elem.get("class", [])):
+            elif node.votebox:
                 _collect_votebox_candidates(
-                    elem,
+                    node,
                     current_section,
                     general_candidates,
                     primary_candidates_by_party,
                 )
 
-        all_primary = [
-            (n, p) for p, ns in primary_candidates_by_party.items() for n in ns
-        ]
-
-        all_parties = set()
-        for _, party in general_candidates:
-            all_parties.add(party)
-        for party in primary_candidates_by_party.keys():
-            all_parties.add(party)
-
-        if all_parties:
-            stats.add_race(list(all_parties))
-
-        if general_candidates:
-            stats.add_general_race()
-        for party in primary_candidates_by_party.keys():
-            stats.add_primary_race(party)
-
-        if len(general_candidates) == 1:
-            name, party = general_candidates[0]
-            results.append(
-                _new_race(state_code, office, district, name, party, "General")
-            )
-
-        for party, names in primary_candidates_by_party.items():
-            if len(names) == 1:
-                results.append(
-                    _new_race(state_code, office, district, names[0], party, "Primary")
-                )
-
-        if not general_candidates and len(all_primary) == 1:
-            name, party = all_primary[0]
-            results.append(
-                _new_race(state_code, office, district, name, party, "General")
-            )
+        general_by_party = {}
+        for name, party in general_candidates:
+            general_by_party.setdefault(party, []).append(name)
+        contest = {
+            "office": office,
+            "district": district,
+            "layout": "section",
+            "general": general_by_party,
+            "primary": primary_candidates_by_party,
+        }
+        if contests is not None:
+            contests.append(contest)
+        section_results, section_stats = contest_results(state_code, contest)
+        results.extend(section_results)
+        stats.merge(section_stats)
 
     return results, stats
 
 
-def _detect_section(elem, lower_text, text):
-    if elem.name == "h4":
+def _detect_section(tag, lower_text, text):
+    if tag == "h4":
         if "general election" in lower_text:
             return "general"
         if "primary" in lower_text and "withdrawn" not in lower_text:
@@ -320,12 +492,14 @@ def _detect_section(elem, lower_text, text):
     return None
 
 
-def _collect_ul_candidates(ul, section, general_candidates, primary_by_party):
-    for li in ul.find_all("li", recursive=False):
-        cand = _parse_candidate_li(li)
-        if not cand:
+def _collect_ul_candidates(node, section, general_candidates, primary_by_party):
+    for item in node.items:
+        if not item.href_found:
+            continue
+        name = _NAME_CLEAN_RE.sub("", item.link_text).strip()
+        if len(name) < 3 or " " not in name:
             continue
-        name, party = cand
+        party = item.party
         if section == "general":
             general_candidates.append((name, party))
         elif isinstance(section, tuple) and section[0] == "primary":
@@ -333,45 +507,142 @@ def _collect_ul_candidates(ul, section, general_candidates, primary_by_party):
             primary_by_party.setdefault(p, []).append(name)
 
 
-def _collect_votebox_candidates(div, section, general_candidates, primary_by_party):
-    for row in div.find_all("tr"):
-        row_text = row.get_text(" ", strip=True).lower()
+def _collect_votebox_candidates(node, section, general_candidates, primary_by_party):
+    for item in node.items:
+        row_text = item.text.lower()
         if "write-in" in row_text or "total" in row_text:
             continue
         if "incumbent" in row_text and "bolded" in row_text:
             continue
         if "candidate" in row_text and "%" in row_text and "votes" in row_text:
             continue
-        cells = row.find_all("td")
-        if len(cells) < 1:
-            continue
-        link = row.find("a")
-        if not link:
+        if not item.has_td or not item.href_found:
             continue
-        href = link.get("href", "")
+        href = item.href
         if href.startswith("mailto:"):
             continue
         if "ballotpedia.org" not in href and "/wiki/" not in href:
             continue
-        name = _NAME_CLEAN_RE.sub("", link.get_text(strip=True)).strip()
+        name = _NAME_CLEAN_RE.sub("", item.link_text).strip()
         if len(name) < 3 or " " not in name:
             continue
-        full_row_text = row.get_text(" ", strip=True)
-        m = _PARTY_IN_TEXT_RE.search(full_row_text)
-        party = m.group(1) if m else "Unknown"
         if section == "general":
-            general_candidates.append((name, normalize_party(party)))
+            general_candidates.append((name, normalize_party(item.party)))
         elif isinstance(section, tuple) and section[0] == "primary":
-            p = section[1] or normalize_party(party)
+            p = section[1] or normalize_party(item.party)
             primary_by_party.setdefault(p, []).append(name)
 
 
-def _collect_district_sections(content, office):
-    sections = []
+# --- Section index: one walk per element, text cached per heading and item ---
+
+
+class _Item:
+    """A votebox row or list entry: its text, first link and party annotation."""
+
+    __slots__ = ("parts", "link_parts", "href", "href_found", "has_td")
+
+    def __init__(self):
+        self.parts = []
+        self.link_parts = []
+        self.href = ""
+        self.href_found = False
+        self.has_td = False
+
+    @property
+    def text(self):
+        return " ".join(self.parts)
+
+    @property
+    def link_text(self):
+        return "".join(self.link_parts)
+
+    @property
+    def party(self):
+        m = _PARTY_IN_TEXT_RE.search(self.text)
+        return m.group(1) if m else "Unknown"
+
+
+class _Node:
+    """A section element reduced to what the collectors read."""
+
+    __slots__ = ("tag", "votebox", "text", "items")
+
+    def __init__(self, tag, votebox, text, items):
+        self.tag = tag
+        self.votebox = votebox
+        self.text = text
+        self.items = items
+
+
+def _indexed_sections(content, office, free=False):
+    """Yield (district, nodes), indexing each section before it may be freed."""
+    from bs4 import CData, NavigableString
+
+    text_types = (NavigableString, CData)
+    for district, elements in _district_sections(content, office):
+        nodes = [_index_element(elem, text_types) for elem in elements]
+        if free:
+            for elem in elements:
+                elem.decompose()
+        yield district, nodes
+
+
+def _index_element(elem, text_types):
+    """Walk elem once, collecting heading text or per-item text and first links.
+
+    Text matches get_text(" ", strip=True) and link text get_text(strip=True).
+    """
+    tag = elem.name
+    votebox = tag == "div" and "votebox" in " ".join(elem.get("class", []))
+    heading = [] if tag in ("h4", "p") else None
+    items = []
+    if not votebox and tag != "ul" and heading is None:
+        return _Node(tag, False, "", items)
+
+    def walk(parent, active, linking, depth):
+        for child in parent.contents:
+            name = child.name
+            if name is None:
+                if type(child) not in text_types:
+                    continue
+                text = child.strip()
+                if not text:
+                    continue
+                if heading is not None:
+                    heading.append(text)
+                for item in active:
+                    item.parts.append(text)
+                for item in linking:
+                    item.link_parts.append(text)
+                continue
+            child_active = active
+            child_linking = linking
+            if (votebox and name == "tr") or (name == "li" and depth == 0):
+                item = _Item()
+                items.append(item)
+                child_active = active + [item]
+            elif name == "td":
+                for item in active:
+                    item.has_td = True
+            if name == "a":
+                first = [item for item in child_active if not item.href_found]
+                for item in first:
+                    item.href_found = True
+                    item.href = child.get("href", "")
+                if first:
+                    child_linking = linking + first
+            walk(child, child_active, child_linking, depth + 1)
+
+    walk(elem, [], [], 0 if tag == "ul" else 1)
+    return _Node(tag, votebox, " ".join(heading or ()), items)
+
+
+def _district_sections(content, office):
+    """Yield (district, elements) pairs; a section may be freed once consumed."""
     if office in ("US Senate", "Governor"):
         in_candidates_section = False
         elements = []
-        for child in content.children:
+        for child in _children(content):
             tag = getattr(child, "name", None)
             if tag == "h2":
                 heading = child.get_text(strip=True).lower()
@@ -383,16 +654,16 @@ def _collect_district_sections(content, office):
             if in_candidates_section and tag in ("p", "ul", "div", "dl", "h4"):
                 elements.append(child)
         if elements:
-            sections.append(("Statewide", elements))
-        return sections
+            yield "Statewide", elements
+        return
 
     current_district = None
     current_elements = []
-    for child in content.children:
+    for child in _children(content):
         tag = getattr(child, "name", None)
         if tag in ("h3",):
             if current_district and current_elements:
-                sections.append((current_district, current_elements))
+                yield current_district, current_elements
             heading = child.get_text(strip=True)
             m = _DISTRICT_RE.search(heading)
             current_district = f"District {m.group(1)}" if m else None
@@ -402,21 +673,16 @@ def _collect_district_sections(content, office):
         elif current_district and tag in ("p", "ul", "div", "dl"):
             current_elements.append(child)
     if current_district and current_elements:
-        sections.append((current_district, current_elements))
-    return sections
+        yield current_district, current_elements
 
 
-def _parse_candidate_li(li):
-    link = li.find("a")
-    if not link:
-        return None
-    name = _NAME_CLEAN_RE.sub("", link.get_text(strip=True)).strip()
-    if len(name) < 3 or " " not in name:
-        return None
-    li_text = li.get_text(" ", strip=True)
-    m = _PARTY_IN_TEXT_RE.search(li_text)
-    party = m.group(1) if m else "Unknown"
-    return name, party
+def _children(content):
+    """Walk direct children by sibling links, so earlier ones can be decomposed."""
+    child = next(iter(content.children), None)
+    while child is not None:
+        next_child = child.next_sibling
+        yield child
+        child = next_child
 
 
 def _extract_party_from_header(text):
@@ -449,6 +715,51 @@ def _extract_district(text, office):
     return None
 
 
+def contest_results(state_code, contest):
+    """Unopposed races and stats for one roster contest.
+
+    A contest is one district's candidates per party for each stage seen on
+    the page. Table rows count a general race even with no candidates;
+    district sections count a race once for both stages, and a lone primary
+    candidate with no general field is also unopposed in the general.
+    """
+    office, district = contest["office"], contest["district"]
+    general = contest.get("general")
+    primary = contest.get("primary")
+    results = []
+    stats = RaceStats()
+    general_names = [(n, p) for p, ns in (general or {}).items() for n in ns]
+
+    if contest["layout"] == "table":
+        if general is not None:
+            stats.add_race(list(general))
+            stats.add_general_race()
+        if primary is not None:
+            stats.add_parties(list(primary))
+    else:
+        parties = set(general) | set(primary)
+        if parties:
+            stats.add_race(list(parties))
+        if general_names:
+            stats.add_general_race()
+
+    for party in primary or {}:
+        stats.add_primary_race(party)
+    if len(general_names) == 1:
+        name, party = general_names[0]
+        results.append(_new_race(state_code, office, district, name, party, "General"))
+    for party, names in (primary or {}).items():
+        if len(names) == 1:
+            results.append(
+                _new_race(state_code, office, district, names[0], party, "Primary")
+            )
+    all_primary = [(n, p) for p, ns in (primary or {}).items() for n in ns]
+    if contest["layout"] == "section" and not general_names and len(all_primary) == 1:
+        name, party = all_primary[0]
+        results.append(_new_race(state_code, office, district, name, party, "General"))
+    return results, stats
+
+
 def _new_race(state_code, office, district, candidate, party, unopposed_in):
     return Race(
         state=state_code,
@@ -0,0 +1,92 @@
+"""
+Synthetic Ballotpedia-shaped pages.
+Generates pages with N districts, M parties and K candidates per cell in either
+the candidateListTablePartisan layout (state legislature pages) or the
+h3 district section layout with votebox divs and candidate lists (US House).
+"""
+
+PARTIES = ("Democratic", "Republican", "Libertarian", "Green", "Independent")
+
+_PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title><style>body {{}}</style></head>
+<body><div class="navbox">Navigation</div>
+<div class="mw-parser-output">
+{body}
+</div></body></html>
+"""
+
+
+def candidate_name(district, party_idx, k):
+    # Letters only: names must start uppercase and contain a space to be parsed
+    return f"Nom{_letters(district)} {_letters(party_idx)}{_letters(k)}son"
+
+
+def table_page(districts, parties=2, candidates=1, title="Synthetic elections"):
+    """State legislature layout: one general and one primary partisan table."""
+    body = [
+        _partisan_table("general election", districts, parties, candidates, 1),
+        _partisan_table("primary election", districts, parties, candidates),
+    ]
+    return _PAGE.format(title=title, body="\n".join(body))
+
+
+def section_page(districts, parties=2, candidates=1, title="Synthetic elections"):
+    """US House layout: h3 per district with general votebox and primary lists."""
+    body = ["<h2>Candidates and election results</h2>"]
+    for d in range(1, districts + 1):
+        body.append(f'<h3><span class="mw-headline">District {d}</span></h3>')
+        body.append("<p><b>General election candidates</b></p>")
+        body.append('<div class="votebox"><table>')
+        body.append("<tr><th>Candidate</th><th>%</th><th>Votes</th></tr>")
+        for p in range(parties):
+            name = candidate_name(d, p, 0)
+            body.append(
+                f'<tr><td><a href="https://ballotpedia.org/{_slug(name)}">{name}</a>'
+                f" ({PARTIES[p % len(PARTIES)]} Party)</td><td>0</td><td>0</td></tr>"
+            )
+        body.append("</table></div>")
+        for p in range(parties):
+            party = PARTIES[p % len(PARTIES)]
+            body.append(f"<p><b>{party} primary candidates</b></p>")
+            items = "".join(
+                f'<li><a href="/{_slug(candidate_name(d, p, k))}">'
+                f"{candidate_name(d, p, k)}</a> ({party} Party)</li>"
+                for k in range(candidates)
+            )
+            body.append(f"<ul>{items}</ul>")
+    return _PAGE.format(title=title, body="\n".join(body))
+
+
+def _partisan_table(kind, districts, parties, candidates, max_candidates=None):
+    per_cell = candidates if max_candidates is None else max_candidates
+    header = "".join(f"<th>{PARTIES[p % len(PARTIES)]}</th>" for p in range(parties))
+    rows = [
+        '<table class="candidateListTablePartisan">',
+        f'<tr><th colspan="{parties + 1}">Synthetic {kind}</th></tr>',
+        f"<tr><th>Office</th>{header}</tr>",
+    ]
+    for d in range(1, districts + 1):
+        cells = []
+        for p in range(parties):
+            links = ", ".join(
+                f'<a href="/{_slug(candidate_name(d, p, k))}">'
+                f"{candidate_name(d, p, k)}</a>"
+                for k in range(per_cell)
+            )
+            cells.append(f"<td>{links}</td>")
+        rows.append(f"<tr><td>District {d}</td>{''.join(cells)}</tr>")
+    rows.append("</table>")
+    return "\n".join(rows)
+
+
+def _letters(n):
+    out = ""
+    n += 1
+    while n:
+        n, r = divmod(n - 1, 26)
+        out = chr(ord("a") + r) + out
+    return out
+
+
+def _slug(name):
+    return name.replace(" ", "_")
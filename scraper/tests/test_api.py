@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+import fetch_log
+import synthetic
+from api import scrape_state, scrape_state_async
+from data import StateResult
+from output import result_data
+from sources.ballotpedia import _urls
+
+URLS = _urls("Texas", "TX", 2026)
+
+
+def _fetch(pages):
+    by_url = {URLS[office]: html for office, html in pages.items()}
+    return by_url.get
+
+
+def test_scrape_state_returns_typed_result(tmp_path):
+    fetch = _fetch({"State House": synthetic.table_page(12)})
+    result = scrape_state("tx", 2026, fetch=fetch, data_dir=tmp_path)
+    assert isinstance(result, StateResult) and result.ok
+    assert result.state == "TX"
+    assert result.stats.total_races == 12
+    assert set(result.office_stats) == {"State House"}
+    # One unopposed primary candidate per party in each district
+    assert {r.unopposed_in for r in result.races} == {"Primary"}
+    data = result_data(result)
+    assert data["total"] == len(result.races) == 24
+    json.dumps(data)
+
+
+def test_rejected_scrape_carries_error_instead_of_exiting(tmp_path):
+    result = scrape_state("TX", 2026, fetch=_fetch({}), data_dir=tmp_path)
+    assert not result.ok
+    assert result.error == "Scraping failed: only found 0 races"
+    data = result_data(result)
+    assert data["error"] is True and data["state"] == "TX" and data["year"] == 2026
+
+
+def test_parts_and_changes_are_written_under_data_dir(tmp_path):
+    fetch = _fetch({"State House": synthetic.table_page(12)})
+    result = scrape_state(
+        "TX",
+        2026,
+        fetch=fetch,
+        data_dir=tmp_path,
+        use_parts=True,
+        record_changes=True,
+    )
+    assert result.ok
+    assert (tmp_path / "parts" / "texas_2026" / "state_house.json").exists()
+    assert len((tmp_path / "changes" / "2026.jsonl").read_text().splitlines()) == 24
+    # Every page requested is logged, including those that could not be fetched
+    log = fetch_log.load(tmp_path / fetch_log.FETCH_LOG_DIRNAME, 2026)
+    assert {e["office"]: e["status"] for e in log} == {
+        "US Senate": "missing",
+        "US House": "missing",
+        "Governor": "missing",
+        "State Senate": "missing",
+        "State House": "ok",
+    }
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError):
+        scrape_state("ZZ", 2026)
+    with pytest.raises(ValueError):
+        scrape_state("TX", 2026, offices=["State House"])
+
+
+def test_async_counterpart(tmp_path):
+    async def scrape_two():
+        return await asyncio.gather(
+            *(
+                scrape_state_async(
+                    state,
+                    2026,
+                    fetch=_fetch({"State House": synthetic.table_page(12)}),
+                    data_dir=tmp_path,
+                )
+                for state in ("TX", "TX")
+            )
+        )
+
+    results = asyncio.run(scrape_two())
+    assert [r.stats.total_races for r in results] == [12, 12]
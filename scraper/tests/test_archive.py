@@ -0,0 +1,72 @@
+import json
+
+import synthetic
+from archive import (
+    archiving_fetcher,
+    latest_pages,
+    load_index,
+    object_path,
+    read_page,
+    store_page,
+)
+from parts import PARTS_DIRNAME, scraped_times
+from reparse import plan, reparse
+from sources.ballotpedia import _urls
+
+URLS = _urls("Texas", "TX", 2026)
+
+
+def test_store_page_deduplicates_by_content(tmp_path):
+    first = store_page(tmp_path, "u1", "<html>a</html>", 1, "2026-01-01T00:00:00")
+    second = store_page(tmp_path, "u2", "<html>a</html>", 1, "2026-01-02T00:00:00")
+    assert first == second
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+    assert read_page(tmp_path, first) == "<html>a</html>"
+    assert [e["url"] for e in load_index(tmp_path)] == ["u1", "u2"]
+
+
+def test_latest_pages_picks_newest_fetch(tmp_path):
+    store_page(tmp_path, "u", "old", 1, "2026-01-01T00:00:00")
+    sha = store_page(tmp_path, "u", "new", 2, "2026-02-01T00:00:00")
+    store_page(tmp_path, "other", "x", 1, "2026-01-15T00:00:00")
+    latest = latest_pages(tmp_path)
+    assert latest["u"]["sha256"] == sha
+    assert latest["u"]["parser_version"] == 2
+
+
+def test_archiving_fetcher_skips_failed_fetches(tmp_path):
+    pages = {"ok": "<html>ok</html>"}
+    fetch = archiving_fetcher(pages.get, tmp_path, 1)
+    assert fetch("ok") == "<html>ok</html>"
+    assert fetch("missing") is None
+    entries = load_index(tmp_path)
+    assert [e["url"] for e in entries] == ["ok"]
+    assert object_path(tmp_path, entries[0]["sha256"]).exists()
+
+
+def test_reparse_rebuilds_state_files_offline(tmp_path):
+    archive_dir = tmp_path / "archive"
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    fetched_at = "2026-03-01T04:00:00+00:00"
+    store_page(
+        archive_dir, URLS["State House"], synthetic.table_page(30), 1, fetched_at
+    )
+    store_page(archive_dir, URLS["US House"], synthetic.section_page(4), 1, fetched_at)
+    store_page(archive_dir, "https://ballotpedia.org/Unrelated_page", "<p/>", 1)
+
+    assert [t[:3] for t in plan(archive_dir)] == [
+        ("TX", 2026, "State House"),
+        ("TX", 2026, "US House"),
+    ]
+    assert plan(archive_dir, states=["CA"]) == []
+
+    report = reparse(archive_dir, data_dir, jobs=2)
+    assert report == {"written": ["TX 2026"], "rejected": []}
+    data = json.loads((data_dir / "texas_2026.json").read_text())
+    assert data["total_races"] == 34
+    assert data["total"] == 68
+    # Parts keep the archived fetch time, not the time of the reparse
+    times = scraped_times(data_dir / PARTS_DIRNAME, "TX", 2026)
+    assert times == {"State House": fetched_at, "US House": fetched_at}
+    assert (data_dir / "manifest.json").exists()
@@ -1,8 +1,11 @@
 from bs4 import BeautifulSoup
 from sources.ballotpedia import (
+    _parse,
+    _parse_measured,
     _extract_district,
     _extract_party_from_header,
     _extract_names_from_cell,
+    _index_element,
     _urls,
 )
 
@@ -92,3 +95,106 @@ def test_urls_custom_lower_chamber():
 
     urls = _urls("Virginia", "VA", 2026)
     assert "House_of_Delegates" in urls["State House"]
+
+
+SAMPLE_PAGE = """
+<html><body><div class="navbox">navigation</div>
+<div class="mw-parser-output">
+<table class="candidateListTablePartisan">
+<tr><th colspan="3">Texas House of Representatives general election</th></tr>
+<tr><th>Office</th><th>Democrat</th><th>Republican</th></tr>
+<tr><td>District 1</td><td><a href="/Ann_Bee">Ann Bee</a></td><td></td></tr>
+<tr><td>District 2</td><td><a href="/Cal_Dee">Cal Dee</a></td>
+<td><a href="/Eve_Eff">Eve Eff</a></td></tr>
+</table>
+<h3>District 3</h3>
+<p><b>General election candidates</b></p>
+<div class="votebox"><table>
+<tr><td><a href="https://ballotpedia.org/Gus_Hay">Gus Hay</a> (Republican Party)</td></tr>
+</table></div>
+<p><b>Republican primary candidates</b></p>
+<ul><li><a href="/Gus_Hay">Gus Hay</a> (Republican Party)</li>
+<li><a href="/Ida_Jay">Ida Jay</a> (Republican Party)</li></ul>
+<h3>District 4</h3>
+<p><b>Democratic primary candidates</b></p>
+<ul><li><a href="/Kim_Lee">Kim Lee</a> (Democratic Party)</li></ul>
+</div></body></html>
+"""
+
+
+def test_parse_sample_page():
+    results, stats = _parse(SAMPLE_PAGE, "State House", "TX")
+    unopposed = {(r.district, r.candidate, r.unopposed_in) for r in results}
+    assert unopposed == {
+        ("District 1", "Ann Bee", "General"),
+        ("District 3", "Gus Hay", "General"),
+        ("District 4", "Kim Lee", "Primary"),
+        ("District 4", "Kim Lee", "General"),
+    }
+    assert stats.total_races == 4
+    assert stats.general_total_races == 3
+
+
+def test_parse_low_memory_matches_default():
+    results, stats = _parse(SAMPLE_PAGE, "State House", "TX")
+    low_results, low_stats = _parse(SAMPLE_PAGE, "State House", "TX", low_memory=True)
+    assert low_results == results
+    assert low_stats == stats
+
+
+def test_parse_measured_reports_peak_memory(capsys):
+    results, _ = _parse_measured(SAMPLE_PAGE, "State House", "TX", low_memory=True)
+    assert len(results) == 4
+    assert "peak" in capsys.readouterr().err
+
+
+VOTEBOX_SECTION = """<html><body><div class="mw-parser-output">
+<h3>District 1</h3>
+<p><b>General election candidates</b></p>
+<div class="votebox results"><table>
+<tr><th>Candidate</th><th>%</th><th>Votes</th></tr>
+<tr><td><b><a href="https://ballotpedia.org/Jane_Roe">Jane Roe (i)</a></b><!-- x -->
+ (Democratic Party)</td><td>100</td></tr>
+<tr><td><a href="mailto:a@b.org">Mail Link</a></td></tr>
+<tr><td>Other/Write-in votes</td></tr>
+</table></div>
+<p><b>Democratic primary candidates</b></p>
+<ul><li><a href="/Al_Bee"><i>Al Bee</i></a> (Democratic Party)
+<ul><li><a href="/Nested_Guy">Nested Guy</a></li></ul></li></ul>
+</div></body></html>"""
+
+
+def test_index_element_matches_get_text():
+    soup = BeautifulSoup(VOTEBOX_SECTION, "lxml")
+    from bs4 import CData, NavigableString
+
+    types = (NavigableString, CData)
+    votebox = _index_element(soup.find("div", class_="votebox"), types)
+    rows = soup.find("div", class_="votebox").find_all("tr")
+    assert [i.text for i in votebox.items] == [
+        r.get_text(" ", strip=True) for r in rows
+    ]
+    assert votebox.items[1].link_text == "Jane Roe (i)"
+    assert votebox.items[1].party == "Democratic"
+    assert not votebox.items[0].has_td
+
+    ul = soup.find("ul")
+    indexed = _index_element(ul, types)
+    # Only direct list entries are items; nested ones belong to their parent
+    assert [i.text for i in indexed.items] == [
+        li.get_text(" ", strip=True) for li in ul.find_all("li", recursive=False)
+    ]
+    assert indexed.items[0].link_text == "Al Bee"
+
+    heading = _index_element(soup.find("p"), types)
+    assert heading.text == "General election candidates"
+
+
+def test_parse_votebox_section():
+    results, stats = _parse(VOTEBOX_SECTION, "US House", "TX")
+    unopposed = {(r.candidate, r.party, r.unopposed_in) for r in results}
+    assert unopposed == {
+        ("Jane Roe", "Democrat", "General"),
+        ("Al Bee", "Democrat", "Primary"),
+    }
+    assert stats.general_total_races == 1
@@ -0,0 +1,117 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import synthetic
+from batch import _fixture_name, merge, parse_shard, shard_items, work_list
+from data import STATE_NAMES
+from sources.ballotpedia import _urls
+
+SCRAPER_DIR = Path(__file__).parent.parent
+STATES = ["NH", "TX", "VT"]
+
+
+def _fixtures(directory):
+    directory.mkdir()
+    for n, state in enumerate(STATES):
+        for office, url in _urls(STATE_NAMES[state], state, 2026).items():
+            if office == "State House":
+                html = synthetic.table_page(20 + n, parties=2, candidates=1)
+            elif office == "US House":
+                html = synthetic.section_page(2 + n, parties=2, candidates=1)
+            else:
+                # Governor has no page this year; replay treats it as a 404
+                continue
+            (directory / _fixture_name(url)).write_text(html)
+
+
+def _run_shards(fixtures, out, count):
+    procs = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "batch.py",
+                "run",
+                f"--shard={i}/{count}",
+                "--years=2026",
+                f"--states={','.join(STATES)}",
+                f"--out={out / str(i)}",
+                f"--replay={fixtures}",
+                "--delay=0",
+            ],
+            cwd=SCRAPER_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for i in range(1, count + 1)
+    ]
+    assert [p.wait() for p in procs] == [0] * count
+    return [out / str(i) for i in range(1, count + 1)]
+
+
+def _state_files(data_dir):
+    files = {}
+    for path in sorted(data_dir.glob("*_2026.json")):
+        if path.name.startswith("nationwide_"):
+            continue
+        data = json.loads(path.read_text())
+        data.pop("scraped_at")
+        files[path.name] = data
+    return files
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x/4", "3"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(bad)
+
+
+def test_shards_partition_the_work_list():
+    items = work_list(STATES, [2024, 2026])
+    shards = [shard_items(items, i, 3) for i in range(1, 4)]
+    assert sorted(x for s in shards for x in s) == items
+    assert sum(len(s) for s in shards) == len(items)
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+    assert shards == [
+        shard_items(work_list(STATES, [2024, 2026]), i, 3) for i in (1, 2, 3)
+    ]
+
+
+def test_sharded_run_merges_like_a_single_run(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    _fixtures(fixtures)
+
+    sharded = tmp_path / "sharded"
+    sharded.mkdir()
+    report = merge(_run_shards(fixtures, tmp_path / "shards", 3), sharded)
+    assert report == {"written": ["NH 2026", "TX 2026", "VT 2026"], "rejected": []}
+
+    single = tmp_path / "single"
+    single.mkdir()
+    merge(_run_shards(fixtures, tmp_path / "one", 1), single)
+
+    assert _state_files(sharded) == _state_files(single)
+    tx = _state_files(sharded)["texas_2026.json"]
+    assert tx["total_races"] == 21 + 3
+    assert set(tx["office_stats"]) == {"US House", "State House"}
+    manifest = json.loads((sharded / "manifest.json").read_text())
+    assert manifest["years"] == [2026]
+    assert (sharded / "summary" / "2026.json").exists()
+
+
+def test_merge_rejects_state_years_below_minimum(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    url = _urls("Texas", "TX", 2026)["US House"]
+    (fixtures / _fixture_name(url)).write_text(synthetic.section_page(2))
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shard_dirs = _run_shards(fixtures, tmp_path / "shards", 2)
+    # States without any fetched page are absent; TX has too few races to keep
+    assert merge(shard_dirs, data_dir) == {"written": [], "rejected": ["TX 2026"]}
+    assert list(data_dir.iterdir()) == []
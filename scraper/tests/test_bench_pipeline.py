@@ -0,0 +1,87 @@
+import json
+
+from bench_pipeline import (
+    compare,
+    load_corpus,
+    run,
+    scaled_copy,
+    scraped_races,
+)
+from data import deduplicate
+
+STATE = {
+    "state": "TX",
+    "state_name": "Texas",
+    "year": 2026,
+    "total": 2,
+    "total_races": 3,
+    "total_races_by_party": {"Republican": 3},
+    "general": {"total_races": 3, "total_unopposed": 1, "unopposed_by_party": {}},
+    "primary": {
+        "total_unopposed": 2,
+        "total_races_by_party": {"Republican": 3},
+        "unopposed_by_party": {"Republican": 2},
+    },
+    "scraped_at": "2026-01-01T00:00:00",
+    "unopposed_candidates": [
+        {
+            "state": "TX",
+            "office": "US House",
+            "district": f"District {d}",
+            "candidate": f"Jane Doe{d}",
+            "party": "Republican",
+            "unopposed_in": stage,
+            "source": "",
+        }
+        for d, stage in ((1, "Primary & General"), (2, "Primary"))
+    ],
+}
+
+
+def _write_corpus(tmp_path):
+    (tmp_path / "texas_2026.json").write_text(json.dumps(STATE))
+    (tmp_path / "ohio_2026.json").write_text(json.dumps({"error": True}))
+    (tmp_path / "manifest.json").write_text("{}")
+
+
+def test_scraped_races_round_trip_through_deduplicate():
+    races = scraped_races(STATE)
+    assert len(races) == 3
+    merged = deduplicate(races)
+    assert [r.to_dict() for r in merged] == STATE["unopposed_candidates"]
+
+
+def test_scaled_copy_shifts_years(tmp_path):
+    _write_corpus(tmp_path)
+    assert [d["state"] for d in load_corpus(tmp_path)] == ["TX"]
+    with scaled_copy(tmp_path, 3) as scaled:
+        names = sorted(p.name for p in scaled.iterdir())
+    assert names == [
+        "ohio_2026.json",
+        "ohio_2036.json",
+        "ohio_2046.json",
+        "texas_2026.json",
+        "texas_2036.json",
+        "texas_2046.json",
+    ]
+
+
+def test_run_reports_every_stage_and_scale(tmp_path):
+    _write_corpus(tmp_path)
+    results = run(tmp_path, [1, 2], ["deduplicate", "manifest"], repeat=1)
+    assert set(results) == {"1", "2"}
+    for stages in results.values():
+        assert set(stages) == {"deduplicate", "manifest"}
+        assert all(s["candidates_per_sec"] > 0 for s in stages.values())
+
+
+def test_compare_applies_tolerance():
+    baseline = {"1": {"json_output": {"candidates_per_sec": 1000, "peak_bytes": 100}}}
+    ok = {"1": {"json_output": {"candidates_per_sec": 600, "peak_bytes": 140}}}
+    slow = {"1": {"json_output": {"candidates_per_sec": 400, "peak_bytes": 160}}}
+    assert compare(ok, baseline, 0.5) == []
+    failures = compare(slow, baseline, 0.5)
+    assert len(failures) == 2
+    assert failures[0].startswith("x1 json_output: 400 candidates/s")
+    # Scales and stages missing from the baseline are not compared
+    assert compare({"10": ok["1"]}, baseline, 0.5) == []
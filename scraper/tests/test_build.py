@@ -0,0 +1,103 @@
+import json
+
+import build
+from nationwide_stats import content_hash
+
+
+def _write_state(data_dir, name, year, code, district="District 1"):
+    data = {
+        "state": code,
+        "state_name": name.title(),
+        "year": year,
+        "total": 1,
+        "total_races": 4,
+        "total_races_by_party": {"Democrat": 3, "Republican": 4},
+        "scraped_at": "2026-01-01T00:00:00+00:00",
+        "unopposed_candidates": [
+            {
+                "office": "State House",
+                "district": district,
+                "candidate": f"Ann {code}",
+                "party": "Democrat",
+                "unopposed_in": "General",
+            }
+        ],
+    }
+    (data_dir / f"{name}_{year}.json").write_text(json.dumps(data))
+
+
+def _corpus(tmp_path):
+    tmp_path.mkdir(exist_ok=True)
+    for year in (2024, 2026):
+        _write_state(tmp_path, "texas", year, "TX")
+        _write_state(tmp_path, "ohio", year, "OH")
+    return tmp_path
+
+
+def test_first_build_creates_every_target_then_nothing_is_stale(tmp_path):
+    data_dir = _corpus(tmp_path)
+    report = build.build(data_dir, jobs=1)
+    assert len(report["built"]) == 8 and report["fresh"] == []
+    assert report["built"][-1] == "manifest"
+    for path in (
+        "nationwide_2024.json",
+        "summary/2026.json",
+        "search/2026/index.json",
+        "aggregates/cube.json",
+        "manifest.json",
+    ):
+        assert (data_dir / path).exists()
+    assert build.build(data_dir, jobs=1)["built"] == []
+
+
+def test_changed_state_file_rebuilds_only_its_year(tmp_path):
+    data_dir = _corpus(tmp_path)
+    build.build(data_dir, jobs=1)
+    _write_state(data_dir, "texas", 2026, "TX", district="District 9")
+    assert build.build(data_dir, dry_run=True)["built"] == [
+        "nationwide/2026",
+        "summary/2026",
+        "search/2026",
+        "cube",
+        "manifest",
+    ]
+    report = build.build(data_dir, jobs=1)
+    assert sorted(report["built"]) == [
+        "cube",
+        "manifest",
+        "nationwide/2026",
+        "search/2026",
+        "summary/2026",
+    ]
+    # The manifest was rebuilt after, and hashes, the new search index
+    manifest = json.loads((data_dir / "manifest.json").read_text())
+    index = data_dir / "search" / "2026" / "index.json"
+    assert manifest["files"]["search/2026/index.json"] == content_hash(index)
+
+
+def test_deleted_or_edited_output_is_rebuilt(tmp_path):
+    data_dir = _corpus(tmp_path)
+    build.build(data_dir, jobs=1)
+    (data_dir / "summary" / "2024.json").unlink()
+    (data_dir / "search" / "2026" / "index.json").write_text("{}")
+    report = build.build(data_dir, jobs=1)
+    # The manifest hashes both, so it follows
+    assert report["built"] == ["summary/2024", "search/2026", "manifest"]
+    assert json.loads((data_dir / "summary" / "2024.json").read_text())["year"] == 2024
+
+
+def test_new_build_version_rebuilds_everything(tmp_path, monkeypatch):
+    data_dir = _corpus(tmp_path)
+    build.build(data_dir, jobs=1)
+    monkeypatch.setattr(build, "BUILD_VERSION", build.BUILD_VERSION + 1)
+    assert len(build.build(data_dir, jobs=1)["built"]) == 8
+    assert build.build(data_dir, jobs=1)["built"] == []
+
+
+def test_parallel_build_matches_serial(tmp_path):
+    serial = _corpus(tmp_path / "serial")
+    parallel = _corpus(tmp_path / "parallel")
+    build.build(serial, jobs=1)
+    build.build(parallel, jobs=2)
+    for path in ("nationwide_2026.json", "summary/2024.json", "aggregates/cube.json"):
+        assert (serial / path).read_text() == (parallel / path).read_text()
@@ -0,0 +1,56 @@
+import json
+
+from changes import append_changes, diff, load_previous
+from data import Race
+
+
+def _race(candidate, unopposed_in, district="District 1"):
+    return Race(
+        "TX", "US House", district, candidate, "Democrat", unopposed_in, "Ballotpedia"
+    )
+
+
+def test_diff_added_removed_changed():
+    previous = [
+        _race("Jane Doe", "Primary"),
+        _race("John Roe", "General", "District 2"),
+    ]
+    current = [
+        _race("Jane Doe", "Primary & General"),
+        _race("Ann Poe", "Primary", "District 3"),
+    ]
+    events = {e["candidate"]: e for e in diff(previous, current)}
+    assert events["Jane Doe"]["change"] == "changed"
+    assert events["Jane Doe"]["previous_unopposed_in"] == "Primary"
+    assert events["Jane Doe"]["unopposed_in"] == "Primary & General"
+    assert events["Ann Poe"]["change"] == "added"
+    assert events["John Roe"]["change"] == "removed"
+
+
+def test_diff_unchanged_is_empty():
+    races = [_race("Jane Doe", "Primary")]
+    assert diff(races, list(races)) == []
+
+
+def test_load_previous_ignores_error_and_missing_files(tmp_path):
+    assert load_previous(tmp_path, "TX", 2026) == []
+    (tmp_path / "texas_2026.json").write_text(json.dumps({"error": True}))
+    assert load_previous(tmp_path, "TX", 2026) == []
+
+
+def test_load_previous_reads_candidates(tmp_path):
+    data = {"unopposed_candidates": [_race("Jane Doe", "Primary").to_dict()]}
+    (tmp_path / "texas_2026.json").write_text(json.dumps(data))
+    assert load_previous(tmp_path, "TX", 2026) == [_race("Jane Doe", "Primary")]
+
+
+def test_append_changes_appends_lines(tmp_path):
+    events = diff([], [_race("Jane Doe", "Primary")])
+    append_changes(tmp_path, 2026, events, "2026-01-01T00:00:00+00:00")
+    append_changes(tmp_path, 2026, events, "2026-01-02T00:00:00+00:00")
+    append_changes(tmp_path, 2026, [], "2026-01-03T00:00:00+00:00")
+    lines = (tmp_path / "2026.jsonl").read_text().splitlines()
+    assert [json.loads(line)["at"][:10] for line in lines] == [
+        "2026-01-01",
+        "2026-01-02",
+    ]
@@ -0,0 +1,96 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import synthetic
+from sources.ballotpedia import _parse, api_fetcher
+
+TITLE = "United_States_House_of_Representatives_elections_in_Texas,_2026"
+PAGE = synthetic.section_page(20, parties=2, candidates=1).replace(
+    '<div class="navbox">Navigation</div>',
+    '<div class="navbox">' + "<a href='/x'>Navigation link</a>" * 2000 + "</div>",
+)
+SECTION = PAGE.split('<div class="mw-parser-output">')[1].rsplit("</div></body>", 1)[0]
+SECTIONS = [
+    {"toclevel": 1, "line": "Candidates and election results", "index": "1"},
+    {"toclevel": 2, "line": "District 1", "index": "2"},
+    {"toclevel": 1, "line": "See also", "index": "22"},
+]
+
+
+class StubWiki(BaseHTTPRequestHandler):
+    api_available = True
+    served = []
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/wiki/api.php":
+            if not self.api_available:
+                return self._send(404, b"Not Found", "text/plain")
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if params["page"] != TITLE:
+                body = {"error": {"code": "missingtitle", "info": "missing"}}
+            elif params["prop"] == "sections":
+                body = {"parse": {"sections": SECTIONS}}
+            elif params.get("section") == "1":
+                text = f'<div class="mw-parser-output">{SECTION}</div>'
+                body = {"parse": {"text": text}}
+            else:
+                body = {"parse": {"text": '<div class="mw-parser-output"></div>'}}
+            return self._send(200, json.dumps(body).encode(), "application/json")
+        if url.path == f"/{TITLE}":
+            return self._send(200, PAGE.encode(), "text/html")
+        self._send(404, b"Not Found", "text/plain")
+
+    def _send(self, status, body, content_type):
+        self.served.append((self.path, len(body)))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def wiki():
+    handler = type("Wiki", (StubWiki,), {"served": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_fetch_parses_like_full_page_with_fewer_bytes(wiki):
+    handler, base = wiki
+    html = api_fetcher()(f"{base}/{TITLE}")
+    api_bytes = sum(n for _, n in handler.served)
+    assert not any(path.startswith(f"/{TITLE}") for path, _ in handler.served)
+
+    results, stats = _parse(html, "US House", "TX")
+    page_results, page_stats = _parse(PAGE, "US House", "TX")
+    assert results == page_results
+    assert stats == page_stats
+    assert len(results) == 40
+    assert api_bytes * 3 < len(PAGE)
+    assert len(html) * 3 < len(PAGE)
+
+
+def test_api_fetch_falls_back_to_full_page(wiki, capsys):
+    handler, base = wiki
+    handler.api_available = False
+    html = api_fetcher()(f"{base}/{TITLE}")
+    assert html == PAGE
+    assert "fetching full page" in capsys.readouterr().err
+
+
+def test_api_fetch_missing_page(wiki):
+    _, base = wiki
+    assert api_fetcher()(f"{base}/No_such_page") is None
@@ -0,0 +1,106 @@
+import json
+
+import integrity
+from integrity import ELECTION_DATA_DIR, check_data, validate
+
+
+def _state_file(**overrides):
+    data = {
+        "state": "TX",
+        "state_name": "Texas",
+        "year": 2026,
+        "total": 1,
+        "total_races": 2,
+        "total_races_by_party": {"Republican": 2},
+        "general": {"total_races": 2, "total_unopposed": 1, "unopposed_by_party": {}},
+        "primary": {
+            "total_unopposed": 1,
+            "total_races_by_party": {"Republican": 2},
+            "unopposed_by_party": {"Republican": 1},
+        },
+        "scraped_at": "2026-01-01T00:00:00",
+        "unopposed_candidates": [
+            {
+                "state": "TX",
+                "office": "US House",
+                "district": "District 1",
+                "candidate": "Jane Doe",
+                "party": "Republican",
+                "unopposed_in": "Primary",
+                "source": "https://ballotpedia.org/x",
+            }
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+def test_valid_file_has_no_problems():
+    assert check_data(_state_file(), "texas_2026.json") == []
+
+
+def test_invariants_are_enforced():
+    data = _state_file(total=3)
+    data["general"]["total_unopposed"] = 5
+    data["primary"]["unopposed_by_party"]["Democratic"] = 1
+    problems = check_data(data, "texas_2026.json")
+    assert any("total (3)" in p for p in problems)
+    assert any("general.total_unopposed (5)" in p for p in problems)
+    assert any(p.startswith("Democratic primary") for p in problems)
+
+
+def test_schema_problems_are_reported():
+    data = _state_file(year="2026", total_races_by_party=[])
+    data["unopposed_candidates"][0]["unopposed_in"] = "Runoff"
+    problems = check_data(data, "texas_2026.json")
+    assert "year '2026' is not an integer" in problems
+    assert "total_races_by_party is not an object" in problems
+    assert "candidate 0 has unknown stage 'Runoff'" in problems
+    assert check_data(_state_file(), "texas_2024.json") == [
+        "state TX and year 2026 do not match the filename"
+    ]
+
+
+def test_error_and_nationwide_files():
+    error = {
+        "error": True,
+        "message": "boom",
+        "state": "TX",
+        "state_name": "Texas",
+        "year": 2026,
+        "scraped_at": "2026-01-01T00:00:00",
+    }
+    assert check_data(error, "texas_2026.json") == []
+    nationwide = {k: _state_file()[k] for k in ("general", "primary")}
+    assert check_data(nationwide, "nationwide_2026.json") == []
+    assert check_data({}, "nationwide_2026.json") != []
+
+
+def test_verdicts_are_cached_by_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(integrity, "MIN_PARALLEL", 2)
+    (tmp_path / "texas_2026.json").write_text(json.dumps(_state_file()))
+    (tmp_path / "ohio_2026.json").write_text(json.dumps(_state_file()))
+    (tmp_path / "manifest.json").write_text("{}")
+    cache = tmp_path / "cache.json"
+
+    failed, total, hits = validate(tmp_path, cache)
+    assert total == 2 and hits == 0
+    assert failed == {
+        "ohio_2026.json": ["state TX and year 2026 do not match the filename"]
+    }
+
+    failed, total, hits = validate(tmp_path, cache)
+    assert hits == 2 and list(failed) == ["ohio_2026.json"]
+
+    (tmp_path / "ohio_2026.json").write_text(
+        json.dumps(_state_file(state="OH", state_name="Ohio"))
+    )
+    failed, total, hits = validate(tmp_path, cache)
+    assert hits == 1
+    assert failed == {"ohio_2026.json": ["candidate 0 is in TX, not OH"]}
+
+
+def test_full_corpus_is_valid():
+    failed, total, _ = validate(ELECTION_DATA_DIR, None, jobs=1)
+    assert total > 0
+    assert failed == {}
@@ -0,0 +1,87 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+import loadtest
+from mock_server import MockConfig, base_url, make_server, synthetic_page
+from sources import ballotpedia
+from sources.ballotpedia import _parse, _retry_after, _urls, scrape_offices
+
+YEAR = 2026
+
+
+@pytest.fixture
+def mock(monkeypatch):
+    monkeypatch.setattr(ballotpedia, "RETRY_BACKOFF", 0.01)
+    servers = []
+
+    def start(**options):
+        server = make_server(MockConfig(years=(YEAR,), **options))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, base_url(server)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_serves_synthetic_pages_at_scraper_urls(mock):
+    server, base = mock()
+    by_office = scrape_offices("VT", YEAR, base=base)
+    assert set(by_office) == set(_urls("Vermont", "VT", YEAR))
+    expected = _parse(synthetic_page("VT", "State House"), "State House", "VT")
+    assert by_office["State House"] == expected
+    assert server.RequestHandlerClass.stats.by_outcome == {"200": 5}
+
+
+def test_unknown_page_is_a_404(mock):
+    server, base = mock()
+    fetch = ballotpedia.session_fetcher()
+    assert fetch(f"{base}/No_such_page") is None
+    assert server.RequestHandlerClass.stats.requests == 1
+
+
+def test_throttled_requests_are_retried(mock):
+    server, base = mock(burst_every=2, burst_length=1, retry_after=0)
+    by_office = scrape_offices("VT", YEAR, base=base, offices=["US Senate", "US House"])
+    assert set(by_office) == {"US Senate", "US House"}
+    outcomes = server.RequestHandlerClass.stats.by_path
+    assert sorted(outcomes.values()) == [["200"], ["429", "200"]]
+
+
+def test_dropped_connections_give_up_after_max_attempts(mock):
+    server, base = mock(drop_rate=1.0)
+    fetch = ballotpedia.session_fetcher()
+    url = _urls("Vermont", "VT", YEAR, base)["US Senate"]
+    assert fetch(url) is None
+    stats = server.RequestHandlerClass.stats
+    assert stats.by_outcome == {"dropped": ballotpedia.MAX_ATTEMPTS}
+
+
+def test_bandwidth_cap_slows_responses(mock):
+    _, base = mock(bandwidth=200_000, latency=0.05)
+    url = _urls("Vermont", "VT", YEAR, base)["State House"]
+    size = len(synthetic_page("VT", "State House").encode())
+    start = time.perf_counter()
+    assert ballotpedia.session_fetcher()(url)
+    assert time.perf_counter() - start >= 0.05 + size / 200_000 * 0.9
+
+
+def test_retry_after_parsing():
+    assert _retry_after("3", 1) == 3
+    later = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= _retry_after(later, 1) <= 30
+    assert _retry_after(None, 2) == ballotpedia.RETRY_BACKOFF * 2
+    assert _retry_after("soon", 1) == ballotpedia.RETRY_BACKOFF
+
+
+def test_loadtest_reports_recovery(mock):
+    _, base = mock(burst_every=4, burst_length=1, retry_after=0, seed=1)
+    result = loadtest.run(base, ["VT", "NH"], [YEAR], workers=2)
+    assert result.pages == 10
+    assert result.failed == []
+    assert loadtest.recovered(result.server) == result.server["by_outcome"]["429"]
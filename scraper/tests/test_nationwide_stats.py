@@ -0,0 +1,173 @@
+import json
+
+from nationwide_stats import (
+    build_cube,
+    build_summary_index,
+    generate_manifest,
+    load_state_data,
+    rollup,
+    write_summary_indexes,
+)
+
+
+def _state(code, candidates, total_races=10):
+    return {
+        "state": code,
+        "state_name": code,
+        "year": 2026,
+        "total": len(candidates),
+        "total_races": total_races,
+        "total_races_by_party": {"Democrat": 8, "Republican": 9},
+        "scraped_at": "2026-01-01T00:00:00+00:00",
+        "unopposed_candidates": candidates,
+    }
+
+
+def _candidate(district, party, unopposed_in):
+    return {
+        "office": "State House",
+        "district": district,
+        "candidate": f"{party} {district}",
+        "party": party,
+        "unopposed_in": unopposed_in,
+    }
+
+
+def test_load_state_data_skips_errors_and_derived_files(tmp_path):
+    (tmp_path / "texas_2026.json").write_text(json.dumps(_state("TX", [])))
+    (tmp_path / "ohio_2026.json").write_text(json.dumps({"error": True}))
+    (tmp_path / "nationwide_2026.json").write_text(json.dumps({"general": {}}))
+    data = load_state_data(tmp_path)
+    assert [d["state"] for d in data["2026"]] == ["TX"]
+
+
+def test_build_summary_index_has_counts_but_no_candidates():
+    texas = _state(
+        "TX",
+        [
+            _candidate("District 1", "Democrat", "Primary & General"),
+            _candidate("District 2", "Republican", "Primary"),
+        ],
+    )
+    ohio = _state("OH", [_candidate("District 1", "Republican", "General")], 5)
+    index = build_summary_index("2026", [texas, ohio])
+
+    assert index["year"] == 2026
+    assert list(index["states"]) == ["OH", "TX"]
+    tx = index["states"]["TX"]
+    assert "unopposed_candidates" not in tx
+    assert tx["total"] == 2
+    assert tx["general"] == {
+        "total_unopposed": 1,
+        "total_races": 10,
+        "unopposed_by_party": {"Democrat": 1},
+    }
+    assert tx["primary"]["total_unopposed"] == 2
+    assert tx["primary"]["unopposed_by_party"] == {"Democrat": 1, "Republican": 1}
+    assert index["nationwide"]["general"]["total_unopposed"] == 2
+    assert index["nationwide"]["general"]["total_races"] == 15
+
+
+def test_build_summary_index_precomputes_display_stats():
+    texas = _state(
+        "TX",
+        [
+            _candidate("District 1", "Democratic", "Primary & General"),
+            _candidate("District 2", "Republican", "Primary"),
+            _candidate("District 3", "Republican", "Primary"),
+        ],
+    )
+    index = build_summary_index("2026", [texas])
+    display = index["states"]["TX"]["display"]
+    assert display["general"] == {
+        "total_unopposed": 1,
+        "total_races": 10,
+        "by_party": [["D", 1]],
+    }
+    assert display["primary"] == {
+        "total_unopposed": 3,
+        "total_races": 17,
+        "by_party": [["R", 2], ["D", 1]],
+        "total_by_party": {"D": 8, "R": 9},
+    }
+    assert index["nationwide"]["display"] == display
+
+
+def test_write_summary_indexes(tmp_path):
+    paths = write_summary_indexes(tmp_path, {"2026": [_state("TX", [])]})
+    assert paths == [tmp_path / "summary" / "2026.json"]
+    assert json.loads(paths[0].read_text())["states"]["TX"]["total_races"] == 10
+
+
+def test_generate_manifest_records_content_hashes(tmp_path):
+    (tmp_path / "texas_2026.json").write_text(json.dumps(_state("TX", [])))
+    (tmp_path / "ohio_2026.json").write_text(json.dumps({"error": True}))
+    write_summary_indexes(tmp_path, load_state_data(tmp_path))
+    files = generate_manifest(tmp_path)["files"]
+    assert sorted(files) == ["ohio_2026.json", "summary/2026.json", "texas_2026.json"]
+    assert all(len(h) == 16 for h in files.values())
+
+    before = files["texas_2026.json"]
+    (tmp_path / "texas_2026.json").write_text(json.dumps(_state("TX", [], 11)))
+    after = generate_manifest(tmp_path)["files"]
+    assert after["texas_2026.json"] != before
+    assert after["ohio_2026.json"] == files["ohio_2026.json"]
+
+
+def test_build_cube_uses_office_stats_denominators():
+    texas = _state(
+        "TX",
+        [
+            _candidate("District 1", "Democrat", "Primary & General"),
+            _candidate("District 2", "Republican", "Primary"),
+        ],
+    )
+    texas["office_stats"] = {
+        "State House": {
+            "total_races": 10,
+            "general_total_races": 10,
+            "primary_races_by_party": {"Democrat": 8, "Republican": 9},
+        }
+    }
+    cube = build_cube({"2026": [texas]})
+    by_stage = rollup(cube, by=("stage",))
+    assert by_stage[("General",)] == {"unopposed": 1, "races": 10}
+    assert by_stage[("Primary",)] == {"unopposed": 2, "races": 17}
+    by_party = rollup(cube, by=("party",), stage="Primary")
+    assert by_party[("Republican",)] == {"unopposed": 1, "races": 9}
+    assert cube["coarse"] == []
+    house = rollup(cube, office="State House", stage="Primary")
+    assert house[()] == {"unopposed": 2, "races": 17}
+    # General races are never split by party
+    general = rollup(cube, by=("party",), stage="General")
+    assert general[("Democrat",)] == {"unopposed": 1, "races": None}
+
+
+def test_build_cube_falls_back_to_state_totals():
+    ohio = _state("OH", [_candidate("District 1", "Republican", "General")], 5)
+    cube = build_cube({"2024": [ohio]})
+    general = rollup(cube, by=("year", "office"), stage="General", state="OH")
+    # The office's share of the state-wide total is unknown, not 0
+    assert general == {
+        (2024, "*"): {"unopposed": 0, "races": 5},
+        (2024, "State House"): {"unopposed": 1, "races": None},
+    }
+    assert cube["coarse"] == [[2024, "OH"]]
+    assert rollup(cube, stage="General")[()] == {"unopposed": 1, "races": 5}
+    primary = rollup(cube, by=("party",), stage="Primary", state="OH")
+    assert primary[("Republican",)] == {"unopposed": 0, "races": 9}
+
+
+def test_rollup_only_blanks_groups_touching_coarse_state_years():
+    texas = _state("TX", [_candidate("District 1", "Democrat", "General")])
+    texas["office_stats"] = {
+        "State House": {"general_total_races": 10, "primary_races_by_party": {}}
+    }
+    ohio = _state("OH", [_candidate("District 1", "Republican", "General")], 5)
+    cube = build_cube({"2026": [texas], "2024": [ohio]})
+    by_year = rollup(cube, by=("year",), office="State House", stage="General")
+    assert by_year == {
+        (2024,): {"unopposed": 1, "races": None},
+        (2026,): {"unopposed": 1, "races": 10},
+    }
+    assert rollup(cube, office="State House", stage="General")[()]["races"] is None
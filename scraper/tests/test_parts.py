@@ -0,0 +1,62 @@
+import json
+
+from data import Race, RaceStats
+from parts import assemble, load_contests, load_parts, part_path, save_part
+
+
+def _part(name, total):
+    stats = RaceStats()
+    stats.total_races = total
+    stats.races_by_party = {"Democrat": total}
+    race = Race("TX", "State House", "District 1", name, "Democrat", "General", "BP")
+    return [race], stats
+
+
+def test_part_path_is_per_state_year_office(tmp_path):
+    path = part_path(tmp_path, "NH", 2026, "State House")
+    assert path == tmp_path / "new_hampshire_2026" / "state_house.json"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    save_part(tmp_path, "TX", 2026, "State House", _part("Jane Doe", 150))
+    loaded = load_parts(tmp_path, "TX", 2026)
+    assert list(loaded) == ["State House"]
+    results, stats = loaded["State House"]
+    assert results[0].candidate == "Jane Doe"
+    assert stats.total_races == 150
+    assert stats.races_by_party == {"Democrat": 150}
+
+
+def test_save_replaces_previous_part(tmp_path):
+    save_part(tmp_path, "TX", 2026, "State House", _part("Jane Doe", 150))
+    save_part(tmp_path, "TX", 2026, "State House", _part("John Roe", 149))
+    results, _ = load_parts(tmp_path, "TX", 2026)["State House"]
+    assert [r.candidate for r in results] == ["John Roe"]
+
+
+def test_contests_are_stored_only_when_given(tmp_path):
+    contest = {"office": "State House", "district": "District 1", "layout": "table"}
+    save_part(
+        tmp_path, "TX", 2026, "State House", _part("Jane Doe", 1), None, [contest]
+    )
+    save_part(tmp_path, "TX", 2026, "US House", _part("John Roe", 1))
+    assert load_contests(tmp_path, "TX", 2026) == {"State House": [contest]}
+    # Parts that kept contests inside stats still load, their contests included
+    path = part_path(tmp_path, "TX", 2026, "US House")
+    data = json.loads(path.read_text())
+    data["stats"]["roster"] = [contest]
+    path.write_text(json.dumps(data))
+    assert load_parts(tmp_path, "TX", 2026)["US House"][1].total_races == 1
+    assert load_contests(tmp_path, "TX", 2026)["US House"] == [contest]
+
+
+def test_load_parts_missing_directory(tmp_path):
+    assert load_parts(tmp_path, "TX", 2026) == {}
+
+
+def test_assemble_prefers_fresh_and_keeps_page_order():
+    stored = {"State House": _part("Old", 1), "US Senate": _part("Senator", 1)}
+    fresh = {"State House": _part("New", 1), "US House": _part("Rep", 1)}
+    by_office = assemble(stored, fresh)
+    assert list(by_office) == ["US Senate", "US House", "State House"]
+    assert by_office["State House"][0][0].candidate == "New"
@@ -0,0 +1,45 @@
+import synthetic
+from profiling import PAGES_DIRNAME, Profiler, write_report
+from sources.ballotpedia import _urls, scrape_offices
+
+URLS = _urls("Texas", "TX", 2026)
+PAGES = {
+    URLS["US House"]: synthetic.section_page(30),
+    URLS["State House"]: synthetic.table_page(150),
+}
+
+
+def test_profiles_each_office_without_changing_results(tmp_path):
+    plain = scrape_offices("TX", 2026, fetch=PAGES.get)
+    profiler = Profiler(tmp_path, "texas_2026", interval=0.001)
+    profiled = scrape_offices("TX", 2026, fetch=PAGES.get, profiler=profiler.office)
+    assert profiled == plain
+
+    names = sorted(p.name for p in (tmp_path / PAGES_DIRNAME).iterdir())
+    # Offices whose page failed to load are still profiled
+    assert "texas_2026_state_house.prof" in names
+    assert "texas_2026_us_house.folded" in names
+    assert len(names) == 2 * len(URLS)
+
+
+def test_report_merges_pages(tmp_path):
+    for state, label in (("TX", "texas_2026"), ("VT", "vermont_2026")):
+        profiler = Profiler(tmp_path, label, interval=0.001)
+        scrape_offices(state, 2026, fetch=PAGES.get, profiler=profiler.office)
+    pages = len(URLS) + len(_urls("Vermont", "VT", 2026))
+
+    report = write_report(tmp_path).read_text()
+    assert report.startswith(f"{pages} pages")
+    assert "texas_2026_state_house" in report
+    assert "vermont_2026_us_senate" in report
+    assert "Top functions by own time" in report
+    assert "_parse" in report
+
+    stacks = (tmp_path / "stacks.folded").read_text().splitlines()
+    assert stacks
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert any("_parse" in line for line in stacks)
+
+
+def test_report_without_profiles(tmp_path):
+    assert write_report(tmp_path) is None
@@ -1,21 +1,12 @@
-import subprocess
-import sys
-import json
-import os
-
-SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+from api import scrape_state
+from output import result_data
 
 
 def run_scraper(state, year):
-    result = subprocess.run(
-        [sys.executable, "main.py", state, str(year), "--json"],
-        cwd=SCRAPER_DIR,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    result = scrape_state(state, year)
+    if not result.ok:
         return None
-    return json.loads(result.stdout)
+    return result_data(result)
 
 
 def count_unique_races_by_party(data):
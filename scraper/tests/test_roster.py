@@ -0,0 +1,145 @@
+import json
+import sys
+
+import roster
+import synthetic
+from api import scrape_state
+from output import result_data
+from roster import (
+    ROSTER_DIRNAME,
+    check,
+    contest_sizes,
+    derive,
+    load_roster,
+    rebuild,
+    save_roster,
+    stored_rosters,
+)
+from sources.ballotpedia import _parse, _urls
+
+
+def _parsed():
+    """(by_office, contests) for two synthetic pages, one of each layout."""
+    pages = {
+        "US House": synthetic.section_page(6, candidates=2),
+        "State House": synthetic.table_page(20, parties=3, candidates=2),
+    }
+    by_office, contests = {}, []
+    for office, html in pages.items():
+        by_office[office] = _parse(html, office, "TX", False, contests)
+    return by_office, contests
+
+
+def test_roster_round_trip_derives_identical_results(tmp_path):
+    by_office, contests = _parsed()
+    save_roster(tmp_path, "TX", 2026, contests, "2026-01-01T00:00:00")
+    assert stored_rosters(tmp_path) == [("TX", 2026)]
+    # One contest per line
+    assert (
+        len((tmp_path / "texas_2026.json").read_text().splitlines())
+        == len(contests) + 2
+    )
+
+    roster = load_roster(tmp_path, "TX", 2026)
+    assert roster["scraped_at"] == "2026-01-01T00:00:00"
+    assert derive("TX", roster["contests"]) == by_office
+    assert load_roster(tmp_path, "TX", 2024) is None
+
+
+def test_contest_sizes():
+    contests = [
+        {
+            "office": "State House",
+            "district": "District 1",
+            "layout": "table",
+            "general": {},
+            "primary": {},
+        },
+        {
+            "office": "State House",
+            "district": "District 2",
+            "layout": "table",
+            "general": {"Democrat": ["A b"], "Republican": ["C d"]},
+        },
+        {
+            "office": "US House",
+            "district": "District 1",
+            "layout": "section",
+            "general": {"Republican": ["E f"]},
+            "primary": {"Republican": ["E f", "G h", "I j"], "Democrat": []},
+        },
+    ]
+    sizes = contest_sizes(contests)
+    assert sizes["general"] == {0: 1, 2: 1, 1: 1}
+    assert sizes["primary"] == {3: 1, 0: 1}
+
+
+def test_scraped_roster_rebuilds_the_state_file(tmp_path):
+    urls = _urls("Texas", "TX", 2026)
+    fetch = {
+        urls["US House"]: synthetic.section_page(6, candidates=2),
+        urls["State House"]: synthetic.table_page(20, parties=3),
+    }.get
+    result = scrape_state(
+        "TX", 2026, fetch=fetch, data_dir=tmp_path, record_roster=True
+    )
+    assert result.ok
+    state_file = tmp_path / "texas_2026.json"
+    state_file.write_text(json.dumps(result_data(result)))
+
+    roster = load_roster(tmp_path / ROSTER_DIRNAME, "TX", 2026)
+    data = rebuild(roster)
+    assert data["unopposed_candidates"] == [r.to_dict() for r in result.races]
+    assert data["office_stats"] == result.office_stats
+    assert check(tmp_path, [("TX", 2026)]) == []
+
+    stored = json.loads(state_file.read_text())
+    stored["total_races"] += 1
+    state_file.write_text(json.dumps(stored))
+    assert check(tmp_path, [("TX", 2026)]) == ["texas_2026.json: total_races differ"]
+
+
+def _fetch():
+    urls = _urls("Texas", "TX", 2026)
+    return {
+        urls["US House"]: synthetic.section_page(6, candidates=2),
+        urls["State House"]: synthetic.table_page(20, parties=3),
+    }.get
+
+
+def test_parts_carry_contests_only_for_roster_runs(tmp_path):
+    options = dict(fetch=_fetch(), data_dir=tmp_path, use_parts=True)
+    assert scrape_state("TX", 2026, **options).ok
+    part = json.loads((tmp_path / "parts" / "texas_2026" / "us_house.json").read_text())
+    assert "contests" not in part and "roster" not in part["stats"]
+
+    assert scrape_state("TX", 2026, record_roster=True, **options).ok
+    assert scrape_state(
+        "TX", 2026, offices=["State House"], record_roster=True, **options
+    ).ok
+    # US House came from its stored part, contests included
+    stored = load_roster(tmp_path / ROSTER_DIRNAME, "TX", 2026)
+    assert "incomplete" not in stored
+    assert {c["office"] for c in stored["contests"]} == {"US House", "State House"}
+
+
+def test_roster_from_parts_without_contests_is_marked_incomplete(tmp_path, monkeypatch):
+    options = dict(fetch=_fetch(), data_dir=tmp_path, use_parts=True)
+    # Parts written without --roster carry no contests
+    result = scrape_state("TX", 2026, **options)
+    (tmp_path / "texas_2026.json").write_text(json.dumps(result_data(result)))
+
+    assert scrape_state(
+        "TX", 2026, offices=["State House"], record_roster=True, **options
+    ).ok
+    partial = load_roster(tmp_path / ROSTER_DIRNAME, "TX", 2026)
+    assert partial["incomplete"] == ["US House"]
+    assert {c["office"] for c in partial["contests"]} == {"State House"}
+    assert check(tmp_path, [("TX", 2026)]) == ["texas_2026.json: roster lacks US House"]
+    # rebuild leaves the state file alone rather than dropping US House
+    before = (tmp_path / "texas_2026.json").read_text()
+    monkeypatch.setattr(
+        sys, "argv", ["roster.py", "rebuild", "--data-dir", str(tmp_path)]
+    )
+    assert roster.main() == 0
+    assert (tmp_path / "texas_2026.json").read_text() == before
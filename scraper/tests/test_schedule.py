@@ -0,0 +1,141 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import fetch_log
+from data import STATE_NAMES
+from parts import PARTS_DIRNAME, part_path
+from schedule import (
+    HOT_INTERVAL,
+    QUIET_INTERVAL,
+    RETRY_AFTER,
+    by_state,
+    general_election_day,
+    interval,
+    load_calendar,
+    plan,
+)
+from sources.ballotpedia import office_names
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def _scraped(data_dir, state, office, at):
+    path = part_path(data_dir / PARTS_DIRNAME, state, 2026, office)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"state": state, "office": office, "scraped_at": at.isoformat()}
+    path.write_text(json.dumps(data))
+
+
+def _fetched(data_dir, state, office, at, status=fetch_log.OK):
+    log_dir = data_dir / fetch_log.FETCH_LOG_DIRNAME
+    fetch_log.record(log_dir, 2026, state, [(office, status)], at.isoformat())
+
+
+def _scrape_everything(data_dir, at):
+    for state in STATE_NAMES:
+        for office in office_names(state, 2026):
+            _scraped(data_dir, state, office, at)
+
+
+def test_general_election_day():
+    assert general_election_day(2024) == date(2024, 11, 5)
+    assert general_election_day(2025) == date(2025, 11, 4)
+    assert general_election_day(2026) == date(2026, 11, 3)
+
+
+def test_interval_is_short_near_calendar_dates():
+    dates = {"primary": date(2026, 6, 10), "general": date(2026, 11, 3)}
+    every, reason = interval(NOW, dates, [])
+    assert every == HOT_INTERVAL
+    assert reason == "primary 2026-06-10"
+    every, _ = interval(NOW, {"primary": date(2026, 5, 1)}, [])
+    assert every == QUIET_INTERVAL
+
+
+def test_interval_shrinks_with_recent_changes():
+    one_day = [NOW - timedelta(days=2)] * 3
+    assert interval(NOW, {}, one_day)[0] == QUIET_INTERVAL / 2
+    many_days = [NOW - timedelta(days=d) for d in range(1, 8)]
+    assert interval(NOW, {}, many_days)[0] == HOT_INTERVAL
+    stale = [NOW - timedelta(days=90)]
+    assert interval(NOW, {}, stale)[0] == QUIET_INTERVAL
+
+
+def test_plan_only_schedules_due_pages(tmp_path):
+    _scrape_everything(tmp_path, NOW - timedelta(days=2))
+    _scraped(tmp_path, "TX", "US House", NOW - timedelta(days=8))
+    _scraped(tmp_path, "CA", "US House", NOW - timedelta(days=5))
+    changes = tmp_path / "changes"
+    changes.mkdir()
+    event = {"at": (NOW - timedelta(days=1)).isoformat(), "state": "CA"}
+    (changes / "2026.jsonl").write_text(json.dumps({**event, "office": "US House"}))
+
+    items, spent = plan(tmp_path, 2026, NOW)
+    assert spent == 0
+    assert [(i.state, i.office) for i in items] == [
+        ("CA", "US House"),
+        ("TX", "US House"),
+    ]
+    assert items[0].reason == "1 days with changes"
+
+
+def test_plan_uses_calendar(tmp_path):
+    _scrape_everything(tmp_path, NOW - timedelta(days=1))
+    calendar = {"NJ": {"primary": date(2026, 6, 2)}}
+    items, _ = plan(tmp_path, 2026, NOW, calendar=calendar)
+    assert {i.state for i in items} == {"NJ"}
+    assert len(items) == len(office_names("NJ", 2026))
+
+
+def test_plan_respects_daily_budget(tmp_path):
+    _scrape_everything(tmp_path, NOW - timedelta(days=30))
+    for office in office_names("TX", 2026):
+        _scraped(tmp_path, "TX", office, NOW - timedelta(hours=2))
+        _fetched(tmp_path, "TX", office, NOW - timedelta(hours=2))
+    # Failed fetches leave no part but still count
+    _fetched(tmp_path, "OK", "Governor", NOW - timedelta(hours=3), fetch_log.MISSING)
+    _fetched(tmp_path, "OK", "Governor", NOW - timedelta(days=2), fetch_log.MISSING)
+    items, spent = plan(tmp_path, 2026, NOW, budget=8)
+    assert spent == 6
+    assert len(items) == 2
+
+
+def test_plan_backs_off_failing_pages(tmp_path):
+    _scrape_everything(tmp_path, NOW - timedelta(hours=1))
+    for office in office_names("AL", 2026):
+        part_path(tmp_path / PARTS_DIRNAME, "AL", 2026, office).unlink()
+    # A rejected state: every page fetched, none stored
+    _fetched(tmp_path, "AL", "Governor", NOW - RETRY_AFTER * 2, fetch_log.MISSING)
+    for office in office_names("AL", 2026):
+        _fetched(tmp_path, "AL", office, NOW - timedelta(hours=1), "rejected")
+    assert plan(tmp_path, 2026, NOW)[0] == []
+
+    # Governor failed twice, so it backs off twice as long; the state has no
+    # parts, so the other offices wait for it rather than go out alone
+    later = NOW - timedelta(hours=1) + RETRY_AFTER
+    assert plan(tmp_path, 2026, later)[0] == []
+    items, _ = plan(tmp_path, 2026, NOW + RETRY_AFTER * 2)
+    assert [i.office for i in items] == office_names("AL", 2026)
+
+
+def test_plan_skips_backed_off_pages_of_scraped_states(tmp_path):
+    _scrape_everything(tmp_path, NOW - timedelta(days=30))
+    _fetched(tmp_path, "TX", "US House", NOW - timedelta(hours=1), "missing")
+    items, _ = plan(tmp_path, 2026, NOW)
+    assert ("TX", "US House") not in {(i.state, i.office) for i in items}
+    assert ("TX", "State House") in {(i.state, i.office) for i in items}
+
+
+def test_unscraped_state_is_scheduled_whole(tmp_path):
+    items, _ = plan(tmp_path, 2026, NOW, budget=12)
+    grouped = by_state(items)
+    assert list(grouped) == ["AL", "AK"]
+    assert all(len(offices) == 5 for offices in grouped.values())
+
+
+def test_load_calendar(tmp_path):
+    path = tmp_path / "calendar.json"
+    path.write_text(json.dumps({"2026": {"TX": {"primary": "2026-03-03"}}}))
+    assert load_calendar(path, 2026) == {"TX": {"primary": date(2026, 3, 3)}}
+    assert load_calendar(path, 2024) == {}
+    assert load_calendar(tmp_path / "missing.json", 2026) == {}
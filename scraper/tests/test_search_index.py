@@ -0,0 +1,100 @@
+import json
+
+from nationwide_stats import update
+from search_index import build_year_index, search, tokens, write_search_index
+
+
+def _state(state, candidates):
+    return {
+        "state": state,
+        "state_name": state,
+        "year": 2026,
+        "total": len(candidates),
+        "total_races": 10,
+        "total_races_by_party": {},
+        "scraped_at": "2026-01-01T00:00:00",
+        "unopposed_candidates": [
+            {
+                "state": state,
+                "office": "State House",
+                "district": district,
+                "candidate": name,
+                "party": "Democratic",
+                "unopposed_in": "Primary",
+                "source": "",
+            }
+            for name, district in candidates
+        ],
+    }
+
+
+STATES = [
+    _state("TX", [("José O'Rourke Jr.", "District 12"), ("Jane Doe", "District 3")]),
+    _state("NH", [("Janet Smith-Jones", "Hillsborough 7")]),
+]
+
+
+def test_tokens_normalize_names_and_districts():
+    assert tokens("José O'Rourke Jr.") == ["jose", "o", "rourke", "orourke"]
+    assert tokens("Smith-Jones") == ["smith", "jones", "smithjones"]
+    assert tokens("District 12") == ["12"]
+
+
+def test_shards_carry_only_their_docs():
+    shards = build_year_index(STATES)
+    ja = shards["ja"]
+    assert ja["tokens"] == ["jane", "janet"]
+    assert [ja["docs"][d][3] for p in ja["postings"] for d in p] == [
+        "Jane Doe",
+        "Janet Smith-Jones",
+    ]
+    assert ja["ngrams"]["ane"] == [0, 1]
+    assert ja["ngrams"]["net"] == [1]
+    assert "jose" in shards["jo"]["tokens"] and "jones" in shards["jo"]["tokens"]
+
+
+def _names(shards, query):
+    return sorted(doc[3] for doc in search(shards, query))
+
+
+def test_search_matches_prefixes_of_every_token():
+    shards = build_year_index(STATES)
+    assert _names(shards, "ja") == ["Jane Doe", "Janet Smith-Jones"]
+    assert _names(shards, "jan smi") == ["Janet Smith-Jones"]
+    assert _names(shards, "Jose orou") == ["José O'Rourke Jr."]
+    assert [d[0] for d in search(shards, "hillsborough")] == ["NH"]
+    assert _names(shards, "j") == [
+        "Jane Doe",
+        "Janet Smith-Jones",
+        "José O'Rourke Jr.",
+    ]
+    assert search(shards, "zz") == []
+
+
+def test_write_removes_stale_shards(tmp_path):
+    write_search_index(tmp_path, {"2026": STATES})
+    year_dir = tmp_path / "search" / "2026"
+    index = json.loads((year_dir / "index.json").read_text())
+    assert set(index["shards"]) == {
+        p.stem for p in year_dir.glob("*.json") if p.name != "index.json"
+    }
+
+    write_search_index(tmp_path, {"2026": STATES[:1]})
+    assert not (year_dir / "hi.json").exists()
+    assert (year_dir / "ja.json").exists()
+
+
+def test_manifest_lists_search_indexes(tmp_path):
+    (tmp_path / "texas_2026.json").write_text(json.dumps(STATES[0]))
+    manifest = update(tmp_path)
+    assert "search/2026/index.json" in manifest["files"]
+    assert not any(p.startswith("search/2026/ja") for p in manifest["files"])
+
+
+def test_search_falls_back_to_trigrams_for_misspelt_words():
+    shards = build_year_index(STATES)
+    assert _names(shards, "jonez") == ["Janet Smith-Jones"]
+    assert [d[0] for d in search(shards, "hilsborough")] == ["NH"]
+    # A token that prefixes something is never matched loosely
+    assert _names(shards, "jose") == ["José O'Rourke Jr."]
+    assert search(shards, "jaxxx") == []
@@ -0,0 +1,127 @@
+import gzip
+import json
+import os
+import threading
+import urllib.request
+from urllib.error import HTTPError
+
+import pytest
+
+import serve
+from serve import make_server
+
+
+def _candidate(state, office, district, party, unopposed_in):
+    return {
+        "state": state,
+        "office": office,
+        "district": district,
+        "candidate": f"{party} {district}",
+        "party": party,
+        "unopposed_in": unopposed_in,
+        "source": "Ballotpedia",
+    }
+
+
+def _write(path, state, year, candidates):
+    data = {"state": state, "year": year, "total": len(candidates)}
+    data["unopposed_candidates"] = candidates
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(serve, "RELOAD_INTERVAL", 0)
+    _write(
+        tmp_path / "texas_2026.json",
+        "TX",
+        2026,
+        [
+            _candidate(
+                "TX", "US House", "District 1", "Republican", "Primary & General"
+            ),
+            _candidate("TX", "US House", "District 2", "Democrat", "Primary"),
+            _candidate("TX", "State House", "District 3", "Democrat", "General"),
+        ],
+    )
+    _write(
+        tmp_path / "ohio_2024.json",
+        "OH",
+        2024,
+        [_candidate("OH", "US House", "District 1", "Democrat", "Primary")],
+    )
+    (tmp_path / "ohio_2026.json").write_text(json.dumps({"error": True}))
+    httpd = make_server(tmp_path, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, tmp_path
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(httpd, path, headers=None):
+    url = f"http://127.0.0.1:{httpd.server_port}{path}"
+    request = urllib.request.Request(url, headers=headers or {})
+    with urllib.request.urlopen(request) as response:
+        return response.status, dict(response.headers), response.read()
+
+
+def test_filters_candidates(server):
+    httpd, _ = server
+    _, _, body = _get(httpd, "/candidates?state=tx&stage=primary")
+    assert [c["district"] for c in json.loads(body)] == ["District 1", "District 2"]
+    _, _, body = _get(httpd, "/candidates?office=US+House&party=Democrat")
+    assert {c["state"] for c in json.loads(body)} == {"TX", "OH"}
+    _, _, body = _get(httpd, "/candidates?year=2024")
+    assert len(json.loads(body)) == 1
+
+
+def test_states_skip_error_files(server):
+    httpd, _ = server
+    _, _, body = _get(httpd, "/states")
+    states = json.loads(body)
+    assert sorted((s["state"], s["year"]) for s in states) == [
+        ("OH", 2024),
+        ("TX", 2026),
+    ]
+    assert all("unopposed_candidates" not in s for s in states)
+
+
+def test_unknown_filter_is_rejected(server):
+    httpd, _ = server
+    with pytest.raises(HTTPError) as e:
+        _get(httpd, "/candidates?county=Travis")
+    assert e.value.code == 400
+
+
+def test_states_reject_candidate_filters(server):
+    httpd, _ = server
+    with pytest.raises(HTTPError) as e:
+        _get(httpd, "/states?office=Governor&party=Republican")
+    assert e.value.code == 400
+    assert b"office, party" in e.value.read()
+    _, _, body = _get(httpd, "/states?state=tx&year=2026")
+    assert [s["state"] for s in json.loads(body)] == ["TX"]
+
+
+def test_etag_and_gzip(server, monkeypatch):
+    httpd, _ = server
+    monkeypatch.setattr(serve, "GZIP_MIN_BYTES", 0)
+    _, headers, body = _get(httpd, "/candidates", {"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(body))) == 4
+    with pytest.raises(HTTPError) as e:
+        _get(httpd, "/candidates", {"If-None-Match": headers["ETag"]})
+    assert e.value.code == 304
+
+
+def test_reloads_changed_files_only(server):
+    httpd, data_dir = server
+    path = data_dir / "texas_2026.json"
+    _write(path, "TX", 2026, [])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _, _, body = _get(httpd, "/candidates?state=TX")
+    assert json.loads(body) == []
+    _, _, body = _get(httpd, "/candidates?state=OH")
+    assert len(json.loads(body)) == 1
@@ -0,0 +1,96 @@
+import json
+from datetime import date
+
+import pytest
+
+from snapshots import default_year, inject, party_abbrev, write_snapshots
+
+
+def _state_file(state, name, year, candidates):
+    return {
+        "state": state,
+        "state_name": name,
+        "year": year,
+        "total": len(candidates),
+        "total_races": 4,
+        "total_races_by_party": {"Democratic": 2, "Republican": 2},
+        "scraped_at": "2026-03-02T04:10:11+00:00",
+        "unopposed_candidates": [
+            {
+                "state": state,
+                "office": office,
+                "district": "District 1",
+                "candidate": candidate,
+                "party": party,
+                "unopposed_in": stage,
+                "source": "https://ballotpedia.org/x",
+            }
+            for office, candidate, party, stage in candidates
+        ],
+    }
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    files = {
+        "texas_2026.json": _state_file(
+            "TX",
+            "Texas",
+            2026,
+            [
+                ("State House", "Jo <Ann> Smith", "Republican", "Primary"),
+                ("US House", "Jane Doe", "Democratic", "Primary & General"),
+            ],
+        ),
+        "ohio_2024.json": _state_file("OH", "Ohio", 2024, []),
+        "ohio_2026.json": {"error": True, "message": "boom", "state": "OH"},
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+    return tmp_path
+
+
+def test_year_pages_have_summary_and_state_cards(data_dir, tmp_path):
+    out = tmp_path / "snapshots"
+    summaries = write_snapshots(data_dir, out, states=True)
+    assert sorted(summaries) == [2024, 2026]
+    html = (out / "2026.html").read_text()
+    assert "data-snapshot" in html
+    assert '<a href="2026/texas.html">TX</a>' in html
+    assert '<a href="2024.html">2024</a>' in html
+    # One general-unopposed race out of 4, with the party abbreviated
+    assert '1<span class="of">/4</span>' in html and "D:1" in html
+    assert "OH" not in html
+
+
+def test_state_pages_list_candidates_in_office_order(data_dir, tmp_path):
+    out = tmp_path / "snapshots"
+    write_snapshots(data_dir, out, states=True)
+    html = (out / "2026" / "texas.html").read_text()
+    assert html.index("US House") < html.index("State House")
+    assert "Jo &lt;Ann&gt; Smith" in html
+    assert "As of Mar 2, 2026" in html
+    assert not (tmp_path / "snapshots" / "2026" / "ohio.html").exists()
+
+
+def test_year_pages_without_state_pages_do_not_link(data_dir, tmp_path):
+    out = tmp_path / "snapshots"
+    write_snapshots(data_dir, out)
+    assert "texas.html" not in (out / "2026.html").read_text()
+    assert not (out / "2026").exists()
+
+
+def test_inject_fills_app_container(tmp_path):
+    index = tmp_path / "index.html"
+    index.write_text('<body><div id="app"></div><script></script></body>')
+    inject(index, "<div data-snapshot>x</div>")
+    assert "<div data-snapshot>x</div></div><script>" in index.read_text()
+    with pytest.raises(ValueError):
+        inject(index, "again")
+
+
+def test_default_year_and_party_abbrev_match_the_app():
+    assert default_year([2024, 2026], date(2026, 5, 1)) == 2026
+    assert default_year([2024, 2025], date(2026, 5, 1)) == 2025
+    assert party_abbrev("Democratic Party") == "D"
+    assert party_abbrev("Constitution") == "O"
@@ -0,0 +1,23 @@
+from bench_startup import (
+    FORBIDDEN_MODULES,
+    SCENARIOS,
+    forbidden,
+    import_times,
+    imported_modules,
+)
+
+
+def test_cli_fast_paths_skip_network_and_parser_stack():
+    for args in SCENARIOS.values():
+        assert import_times(["main.py", *args]), "no -X importtime output captured"
+        heavy = forbidden(imported_modules(["main.py", *args]))
+        assert heavy == [], f"main.py {' '.join(args)} imported {heavy}"
+
+
+def test_forbidden_modules_are_found_when_imported_transitively(tmp_path):
+    (tmp_path / "helper.py").write_text(f"import {FORBIDDEN_MODULES[0]}\n")
+    (tmp_path / "entry.py").write_text("import helper\n")
+    script = [str(tmp_path / "entry.py")]
+    assert "helper" in import_times(script)
+    assert FORBIDDEN_MODULES[0] not in import_times(script)
+    assert FORBIDDEN_MODULES[0] in forbidden(imported_modules(script))
@@ -0,0 +1,50 @@
+from bench_parse import growth_exponent, measure
+from data import office_stats
+from sources.ballotpedia import _parse
+from synthetic import section_page, table_page
+
+
+def _counts(results, stats, office):
+    return len(results), office_stats({office: (results, stats)})[office]
+
+
+def test_contested_table_page_counts_races_without_unopposed():
+    results, stats = _parse(
+        table_page(30, parties=3, candidates=2), "State House", "TX"
+    )
+    assert results == []
+    assert stats.total_races == 30
+    assert stats.general_total_races == 30
+    assert stats.primary_races_by_party == {
+        "Democrat": 30,
+        "Republican": 30,
+        "Libertarian": 30,
+    }
+
+
+def test_single_candidate_pages_are_all_unopposed_in_primary():
+    for page, office in ((table_page, "State House"), (section_page, "US House")):
+        results, stats = _parse(page(25, parties=2, candidates=1), office, "TX")
+        count, summary = _counts(results, stats, office)
+        assert count == 50
+        assert {r.unopposed_in for r in results} == {"Primary"}
+        assert summary["general_total_races"] == 25
+        assert summary["primary_races_by_party"] == {"Democrat": 25, "Republican": 25}
+
+
+def test_contested_primaries_are_not_unopposed():
+    results, _ = _parse(section_page(10, parties=2, candidates=2), "US House", "TX")
+    assert results == []
+
+
+def test_growth_exponent():
+    assert abs(growth_exponent([10, 20, 40], [1, 2, 4]) - 1.0) < 1e-9
+    assert abs(growth_exponent([10, 20, 40], [1, 4, 16]) - 2.0) < 1e-9
+
+
+def test_parse_memory_scales_linearly():
+    # Parse time is too noisy to bound at this size; bench_parse.py checks it
+    sizes = [40, 80, 160]
+    for layout in ("table", "sections"):
+        runs = [measure(layout, n, 2, 2, repeat=1) for n in sizes]
+        assert growth_exponent(sizes, [peak for _, peak in runs]) < 1.3
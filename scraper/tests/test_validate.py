@@ -0,0 +1,105 @@
+import json
+
+from data import RaceStats
+from validate import (
+    Anomaly,
+    baseline_years,
+    check,
+    load_history,
+    offices_to_refetch,
+)
+
+
+def _stats(total, by_party):
+    stats = RaceStats()
+    stats.total_races = total
+    stats.races_by_party = dict(by_party)
+    return stats
+
+
+def _state_file(total, by_party, office_stats=None):
+    data = {"total_races": total, "total_races_by_party": by_party}
+    if office_stats is not None:
+        data["office_stats"] = office_stats
+    return data
+
+
+def _office(total, by_party):
+    return {"total_races": total, "races_by_party": by_party}
+
+
+def test_load_history_skips_errors_and_other_states(tmp_path):
+    (tmp_path / "virginia_2024.json").write_text(json.dumps(_state_file(100, {})))
+    (tmp_path / "virginia_2025.json").write_text(json.dumps({"error": True}))
+    (tmp_path / "west_virginia_2024.json").write_text(json.dumps(_state_file(5, {})))
+    history = load_history(tmp_path, "VA")
+    assert list(history) == [2024]
+    assert history[2024]["total_races"] == 100
+
+
+def test_baseline_prefers_previous_scrape_of_same_year():
+    history = {2022: {}, 2023: {}, 2024: {}, 2026: {}}
+    assert baseline_years(history, 2026) == [2026]
+    assert sorted(baseline_years(history, 2028)) == [2022, 2024, 2026]
+    assert baseline_years(history, 2025) == [2023]
+
+
+def test_check_flags_low_state_total_without_office_history():
+    history = {2024: _state_file(200, {"Democrat": 150, "Republican": 150})}
+    by_office = {"State House": ([], _stats(40, {"Democrat": 30, "Republican": 30}))}
+    anomalies = check(by_office, history, 2026)
+    assert len(anomalies) == 1
+    assert anomalies[0].office is None
+    assert offices_to_refetch(anomalies) is None
+
+
+def test_check_accepts_normal_result():
+    history = {2024: _state_file(200, {"Democrat": 150, "Republican": 150})}
+    by_office = {"State House": ([], _stats(190, {"Democrat": 140, "Republican": 150}))}
+    assert check(by_office, history, 2026) == []
+
+
+def test_check_flags_single_office_from_office_history():
+    parties = {"Democrat": 100, "Republican": 100}
+    history = {
+        2026: _state_file(
+            210,
+            parties,
+            {
+                "US House": _office(10, {"Democrat": 10, "Republican": 10}),
+                "State House": _office(200, parties),
+            },
+        )
+    }
+    by_office = {
+        "US House": ([], _stats(10, {"Democrat": 10, "Republican": 9})),
+        "State House": ([], _stats(40, {"Democrat": 20, "Republican": 20})),
+    }
+    anomalies = check(by_office, history, 2026)
+    assert [a.office for a in anomalies] == ["State House"]
+    assert offices_to_refetch(anomalies) == ["State House"]
+
+
+def test_check_flags_party_shift():
+    parties = {"Democrat": 100, "Republican": 100}
+    history = {2026: _state_file(100, parties, {"State House": _office(100, parties)})}
+    by_office = {"State House": ([], _stats(100, {"Democrat": 100, "Republican": 5}))}
+    anomalies = check(by_office, history, 2026)
+    assert len(anomalies) == 1
+    assert "party distribution" in anomalies[0].message
+
+
+def test_check_flags_office_missing_since_previous_scrape():
+    parties = {"Democrat": 10}
+    history = {
+        2026: _state_file(
+            20,
+            parties,
+            {"US House": _office(10, parties), "State House": _office(10, parties)},
+        )
+    }
+    by_office = {"US House": ([], _stats(10, parties))}
+    anomalies = check(by_office, history, 2026)
+    assert anomalies == [
+        Anomaly("State House", "page missing but present in previous scrape")
+    ]
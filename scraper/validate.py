@@ -0,0 +1,186 @@
+"""
+Anomaly detection for fresh scrapes.
+Compares per-office race counts and party distributions against the
+historical state files in election_data/ before a result is written.
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import parts
+from data import state_filename
+
+# A count below this fraction of the historical median is treated as a broken page
+MIN_RACE_RATIO = 0.5
+# Total variation distance between party shares that counts as an outlier
+MAX_PARTY_SHIFT = 0.35
+# Party distributions over fewer races than this are too noisy to compare
+MIN_RACES_FOR_PARTY_CHECK = 10
+
+
+@dataclass
+class Anomaly:
+    office: str | None  # None when only state-level totals could be compared
+    message: str
+
+
+def load_history(election_data_dir: Path, state_code: str) -> dict[int, dict]:
+    """Load every successful historical state file for a state, keyed by year."""
+    pattern = re.compile(rf"^{state_filename(state_code)}_(\d{{4}})\.json$")
+    history = {}
+    for filepath in election_data_dir.glob("*.json"):
+        match = pattern.match(filepath.name)
+        if not match:
+            continue
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        if "error" in data:
+            continue
+        history[int(match.group(1))] = data
+    return history
+
+
+def baseline_years(history: dict[int, dict], year: int) -> list[int]:
+    """Pick comparable years: the previous scrape of this year, else same parity."""
+    if year in history:
+        return [year]
+    return [y for y in history if y % 2 == year % 2]
+
+
+def check(by_office, history: dict[int, dict], year: int) -> list[Anomaly]:
+    """Flag offices whose race counts or party mix fall outside the baseline."""
+    years = baseline_years(history, year)
+    if not years:
+        return []
+    baseline = [history[y] for y in years]
+    anomalies = []
+
+    has_office_history = any(d.get("office_stats") for d in baseline)
+    if has_office_history:
+        for office in _offices(baseline):
+            past = [
+                d["office_stats"][office]
+                for d in baseline
+                if office in d.get("office_stats", {})
+            ]
+            if office not in by_office:
+                if year in years and past[0]["total_races"] > 0:
+                    anomalies.append(
+                        Anomaly(office, "page missing but present in previous scrape")
+                    )
+                continue
+            stats = by_office[office][1]
+            anomalies.extend(
+                _check_counts(
+                    office,
+                    stats.total_races,
+                    stats.races_by_party,
+                    [p["total_races"] for p in past],
+                    [p["races_by_party"] for p in past],
+                )
+            )
+        return anomalies
+
+    total_races = sum(stats.total_races for _, stats in by_office.values())
+    races_by_party = {}
+    for _, stats in by_office.values():
+        for party, count in stats.races_by_party.items():
+            races_by_party[party] = races_by_party.get(party, 0) + count
+    return _check_counts(
+        None,
+        total_races,
+        races_by_party,
+        [d.get("total_races", 0) for d in baseline],
+        [d.get("total_races_by_party", {}) for d in baseline],
+    )
+
+
+def check_fresh(fresh, stored, history: dict[int, dict], year: int) -> list[Anomaly]:
+    """check() on fresh offices overlaid on stored parts."""
+    anomalies = check(parts.assemble(stored, fresh), history, year)
+    # Stored parts were already validated when they were written
+    return [
+        a
+        for a in anomalies
+        if a.office is None or a.office in fresh or a.office not in stored
+    ]
+
+
+def keep_good_parts(fresh, stored, anomalies: list[Anomaly]):
+    """Drop anomalous fresh offices in favor of their last good stored part."""
+    fresh = dict(fresh)
+    remaining = []
+    for a in anomalies:
+        if a.office in stored:
+            print(f"  Keeping last good {a.office} data", file=sys.stderr)
+            fresh.pop(a.office, None)
+        else:
+            remaining.append(a)
+    return fresh, remaining
+
+
+def offices_to_refetch(anomalies: list[Anomaly]) -> list[str] | None:
+    """Offices worth fetching again, or None when the whole state is implicated."""
+    if any(a.office is None for a in anomalies):
+        return None
+    return sorted({a.office for a in anomalies})
+
+
+def _offices(baseline: list[dict]) -> list[str]:
+    offices = set()
+    for d in baseline:
+        offices.update(d.get("office_stats", {}))
+    return sorted(offices)
+
+
+def _check_counts(office, total_races, races_by_party, past_totals, past_parties):
+    label = office or "all offices"
+    past_totals = sorted(t for t in past_totals if t > 0)
+    if not past_totals:
+        return []
+    anomalies = []
+    mid = len(past_totals) // 2
+    median = (past_totals[mid] + past_totals[~mid]) / 2
+    if total_races < median * MIN_RACE_RATIO:
+        anomalies.append(
+            Anomaly(
+                office,
+                f"{label}: {total_races} races, historical median is {median:g}",
+            )
+        )
+    if total_races >= MIN_RACES_FOR_PARTY_CHECK:
+        shift = _party_shift(races_by_party, past_parties)
+        if shift > MAX_PARTY_SHIFT:
+            anomalies.append(
+                Anomaly(office, f"{label}: party distribution shifted by {shift:.2f}")
+            )
+    return anomalies
+
+
+def _party_shift(races_by_party: dict, past_parties: list[dict]) -> float:
+    """Total variation distance between current and mean historical party shares."""
+    current = _shares(races_by_party)
+    past = [_shares(p) for p in past_parties if sum(p.values()) > 0]
+    if not current or not past:
+        return 0.0
+    parties = set(current)
+    for shares in past:
+        parties.update(shares)
+    distance = 0.0
+    for party in parties:
+        mean = sum(shares.get(party, 0.0) for shares in past) / len(past)
+        distance += abs(current.get(party, 0.0) - mean)
+    return distance / 2
+
+
+def _shares(races_by_party: dict) -> dict[str, float]:
+    total = sum(races_by_party.values())
+    if not total:
+        return {}
+    return {party: count / total for party, count in races_by_party.items()}
@@ -80,7 +80,7 @@ for YEAR in $YEARS; do
         fi
 
         TEMP_FILE=$(mktemp)
-        if (cd scraper && uv run python main.py "$STATE" "$YEAR" --json) > "$TEMP_FILE" 2>/dev/null; then
+        if (cd scraper && uv run python main.py "$STATE" "$YEAR" --json --parts --changes --roster --archive ../page_archive) > "$TEMP_FILE" 2>/dev/null; then
             if grep -q '"error"' "$TEMP_FILE" 2>/dev/null; then
                 echo "  -> Scrape error, keeping existing data"
                 mkdir -p election_data/errors
@@ -99,8 +99,12 @@ for YEAR in $YEARS; do
 done
 
 echo ""
-echo "Generating manifest with nationwide stats..."
-(cd scraper && uv run python nationwide_stats.py)
+echo "Rebuilding derived files..."
+(cd scraper && uv run python build.py)
+
+echo ""
+echo "Validating election_data/..."
+(cd scraper && uv run python integrity.py)
 
 echo ""
 echo "=========================================="
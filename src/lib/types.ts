@@ -44,9 +44,59 @@ export interface NationwideStats {
 	primary: PrimaryStats;
 }
 
+/** [party abbreviation, count], largest first */
+export type PartyCount = [string, number];
+
+/** Summary numbers as shown, precomputed by nationwide_stats.display_stats */
+export interface DisplayStats {
+	general: {
+		total_unopposed: number;
+		total_races: number;
+		by_party: PartyCount[];
+	};
+	primary: {
+		total_unopposed: number;
+		total_races: number;
+		by_party: PartyCount[];
+		total_by_party: Record<string, number>;
+	};
+}
+
+export interface StateSummary {
+	state_name: string;
+	total: number;
+	total_races: number;
+	scraped_at: string | null;
+	general: GeneralStats;
+	primary: PrimaryStats;
+	display: DisplayStats;
+}
+
+export interface YearSummary {
+	year: number;
+	nationwide: NationwideStats & { display: DisplayStats };
+	states: Record<string, StateSummary>;
+}
+
 export interface Manifest {
 	years: number[];
 	updated_at: string;
+	files?: Record<string, string>;
+}
+
+export interface SearchIndex {
+	year: number;
+	shards: Record<string, string>;
+}
+
+/** [state, office, district, candidate, party, unopposed_in] */
+export type SearchDoc = [string, string, string, string, string, string];
+
+export interface SearchShard {
+	tokens: string[];
+	postings: number[][];
+	ngrams: Record<string, number[]>;
+	docs: SearchDoc[];
 }
 
 export const STATE_NAMES: Record<string, string> = {
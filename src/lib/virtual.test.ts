@@ -0,0 +1,22 @@
+import { describe, it, expect } from 'vitest';
+import { visibleRange } from './virtual';
+
+describe('visibleRange', () => {
+	it('covers the rows in view plus overscan', () => {
+		// 400 rows of 40px, list top scrolled 2000px above the viewport
+		expect(visibleRange(2000, 800, 40, 400, 10)).toEqual({ start: 40, end: 80 });
+	});
+
+	it('starts at the first row while the list is below the fold', () => {
+		expect(visibleRange(-300, 800, 40, 400, 10)).toEqual({ start: 0, end: 23 });
+	});
+
+	it('renders nothing for a list entirely out of view', () => {
+		expect(visibleRange(-5000, 800, 40, 400, 10)).toEqual({ start: 0, end: 0 });
+		expect(visibleRange(50000, 800, 40, 400, 10)).toEqual({ start: 400, end: 400 });
+	});
+
+	it('never runs past the end of the list', () => {
+		expect(visibleRange(15500, 800, 40, 400, 10)).toEqual({ start: 377, end: 400 });
+	});
+});
@@ -0,0 +1,30 @@
+/** Lists shorter than this are rendered in full */
+export const VIRTUALIZE_MIN = 60;
+
+/** Rows rendered beyond each edge of the viewport, so fast scrolls never show gaps */
+export const OVERSCAN = 10;
+
+export interface RowRange {
+	start: number;
+	end: number;
+}
+
+/**
+ * The slice of a fixed-height row list that intersects the viewport.
+ *
+ * offset is how far the list's top edge sits above the viewport's top edge
+ * (negative while the list starts further down the page).
+ */
+export function visibleRange(
+	offset: number,
+	viewportHeight: number,
+	rowHeight: number,
+	count: number,
+	overscan = OVERSCAN
+): RowRange {
+	const first = Math.floor(Math.max(0, offset) / rowHeight);
+	const last = Math.ceil((offset + viewportHeight) / rowHeight);
+	const start = Math.min(count, Math.max(0, first - overscan));
+	const end = Math.min(count, Math.max(start, last + overscan));
+	return { start, end };
+}
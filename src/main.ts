@@ -1,4 +1,24 @@
 import { mount } from 'svelte';
 import App from './App.svelte';
 
-mount(App, { target: document.getElementById('app')! });
+const target = document.getElementById('app')!;
+// The deploy pre-renders a static snapshot into #app; keep it on screen until the
+// app has loaded its data, then swap
+const snapshot = [...target.children];
+
+if (snapshot.length > 0) {
+	const root = document.createElement('div');
+	root.hidden = true;
+	target.append(root);
+	mount(App, {
+		target: root,
+		props: {
+			onready: () => {
+				for (const el of snapshot) el.remove();
+				root.hidden = false;
+			}
+		}
+	});
+} else {
+	mount(App, { target });
+}